@@ -1,21 +1,48 @@
 # Card Scanning Microservice using Tesseract OCR
 
+import time
+IMPORT_STARTED = time.perf_counter()
+
 from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
-import pytesseract
+from flask_sock import Sock
+try:
+    import tesserocr
+except ImportError:  # Fall back to running the tesseract binary through pytesseract
+    tesserocr = None
 from PIL import Image
 import io
 import jwt
 from functools import wraps
 import os
 import sys
+import abc
+import atexit
 from dotenv import load_dotenv
 import cv2
 import numpy as np
 import threading
-import time
+import queue
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import math
+from collections import OrderedDict, deque
 import base64
 import json
+import shutil
+import sqlite3
+import struct
+import tempfile
+import urllib.parse
+import difflib
+import hashlib
+import importlib.util
+import asyncio
+import contextvars
+import hmac
+import re
+import unicodedata
+import uuid
 import structlog
 from prometheus_flask_exporter import PrometheusMetrics
 from flask_limiter import Limiter
@@ -23,12 +50,30 @@ from flask_limiter.util import get_remote_address
 import traceback
 from prometheus_client import Counter, Histogram, Gauge
 from werkzeug.exceptions import HTTPException
+from werkzeug.serving import make_server
 import socket
+import click
 import platform
-import psutil
 import logging
 import backoff
-import requests
+
+def lazy_import(name):
+    """Import a module on first attribute access, so workers that never use it skip its import cost"""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+# Off the scan path: the fallback OCR engine, /health, Redis-backed features and backend calls
+pytesseract = lazy_import('pytesseract')
+psutil = lazy_import('psutil')
+redis = lazy_import('redis')
+requests = lazy_import('requests')
+LAZY_MODULES = ('pytesseract', 'psutil', 'redis', 'requests')
 
 # Initialize Flask
 app = Flask(__name__)
@@ -40,7 +85,7 @@ CORS(app, resources={
         "origins": CORS_ORIGINS,
         "methods": ["GET", "POST", "OPTIONS"],
         "allow_headers": ["Authorization", "Content-Type"],
-        "expose_headers": ["X-RateLimit-Limit", "X-RateLimit-Remaining"]
+        "expose_headers": ["X-RateLimit-Limit", "X-RateLimit-Remaining", "X-Request-ID"]
     }
 })
 
@@ -52,14 +97,39 @@ if not isinstance(numeric_level, int):
     raise ValueError(f'Invalid log level: {log_level}')
 logging.getLogger().setLevel(numeric_level)
 
+# Live streams may carry the JWT as a `token` query parameter; keep it out of access logs
+TOKEN_QUERY_PATTERN = re.compile(r'((?:^|[?&])token=)[^&\s"]*')  # also gunicorn's bare query atom
+
+def redact_token(text):
+    return TOKEN_QUERY_PATTERN.sub(r'\1[redacted]', text)
+
+class RedactTokenFilter(logging.Filter):
+    """Masks `token` query parameters in the request lines of server access logs"""
+
+    def filter(self, record):
+        if isinstance(record.args, dict):
+            # gunicorn's atoms; updated in place to keep their lookup of missing headers
+            for key, value in record.args.items():
+                if isinstance(value, str):
+                    record.args[key] = redact_token(value)
+        elif record.args:
+            record.args = tuple(redact_token(arg) if isinstance(arg, str) else arg for arg in record.args)
+        return True
+
+# uvicorn logs WebSocket handshakes, with their query, to uvicorn.error
+for _name in ('gunicorn.access', 'uvicorn.access', 'uvicorn.error', 'werkzeug'):
+    logging.getLogger(_name).addFilter(RedactTokenFilter())
+
 # Initialize structured logging
 structlog.configure(
     processors=[
+        structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_log_level,
         structlog.stdlib.add_logger_name,
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.JSONRenderer()
-    ]
+    ],
+    logger_factory=structlog.stdlib.LoggerFactory()
 )
 logger = structlog.get_logger()
 
@@ -72,7 +142,51 @@ metrics.info('card_scanner_app_info', 'Card Scanner Application Info',
 SCAN_DURATION = Histogram(
     'card_scan_duration_seconds',
     'Time spent processing card scans',
-    ['method']  # 'single' or 'live'
+    ['method']  # 'single', 'multi', 'batch', 'video' or 'live'
+)
+SCAN_STAGE_DURATION = Histogram(
+    'card_scan_stage_seconds',
+    'Time spent in each scan pipeline stage',
+    ['stage', 'endpoint', 'mode'],  # stage: 'decode', 'preprocess', 'ocr', 'postprocess', 'backend' or 'encode'
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+SCAN_DECODE_DURATION = Histogram(
+    'card_scan_decode_seconds',
+    'Time spent decoding uploaded images',
+    ['scale']  # JPEG decode reduction factor: '1', '2', '4' or '8'
+)
+SCAN_CACHE_EVENTS = Counter(
+    'card_scan_cache_events_total',
+    'OCR result cache hits, misses and evictions',
+    ['tier', 'event']  # tier: 'local' or 'redis'; event 'near_hit' is a local hit within SCAN_CACHE_MATCH_DISTANCE
+)
+WORKER_STARTUP_SECONDS = Gauge(
+    'worker_startup_seconds',
+    'Time this worker process spent in each startup phase (0 when inherited from a preloading master)',
+    ['phase']  # 'import', 'preload' or 'warmup'
+)
+WORKER_TIME_TO_READY = Gauge(
+    'worker_time_to_ready_seconds',
+    'Seconds from the start of the server process until this worker reported ready'
+)
+WORKER_READY = Gauge(
+    'worker_ready',
+    'Whether this worker has warmed up and reports ready'
+)
+ASGI_REQUESTS = Gauge(
+    'asgi_requests_in_progress',
+    'Requests and sockets held by the ASGI bridge',
+    ['pool', 'state']  # pool: 'request', 'stream', 'probe' or 'socket'; state: 'receiving' or 'running'
+)
+LIVE_STREAMS = Gauge(
+    'live_streams_open',
+    'Live streams open on this worker',
+    ['kind']  # 'preview' (MJPEG), 'events' (SSE) or 'socket' (WebSocket)
+)
+LIVE_STREAMS_REJECTED = Counter(
+    'live_streams_rejected_total',
+    'Live streams refused because LIVE_MAX_STREAMS were already open on the worker',
+    ['kind']
 )
 SCAN_ERRORS = Counter(
     'card_scan_errors_total',
@@ -81,13 +195,111 @@ SCAN_ERRORS = Counter(
 )
 ACTIVE_SESSIONS = Gauge(
     'active_scanning_sessions',
-    'Number of active scanning sessions'
+    'Number of active scanning sessions across all workers'
+)
+SESSION_FORWARDS = Counter(
+    'live_session_forwards_total',
+    'Live session calls forwarded to the worker that owns the session',
+    ['result']  # 'forwarded' or 'error'
 )
 RETRY_ATTEMPTS = Counter(
     'retry_attempts_total',
     'Number of retry attempts',
     ['operation']
 )
+OCR_ENGINES = Gauge(
+    'ocr_engines',
+    'Number of OCR engines in this process',
+    ['state']  # 'idle' or 'busy'
+)
+OCR_CHECKOUT_WAIT = Histogram(
+    'ocr_engine_checkout_wait_seconds',
+    'Time spent waiting to check out an OCR engine'
+)
+LIVE_GATE_DECISIONS = Counter(
+    'live_gate_decisions_total',
+    'Live frames seen by the stability gate, by decision',
+    ['decision']  # 'process', 'motion', 'settling', 'blurry' or 'suppressed'
+)
+LIVE_GATE_THRESHOLDS = Gauge(
+    'live_gate_threshold',
+    'Configured live stability gate thresholds',
+    ['name']
+)
+COLLECTION_ADDS = Counter(
+    'collection_adds_total',
+    'Collection adds handled by the write-behind queue',
+    ['result']  # 'queued', 'coalesced', 'flushed', 'rejected' or 'failed'
+)
+COLLECTION_QUEUE_DEPTH = Gauge(
+    'collection_queue_depth',
+    'Collection adds waiting in the local journal'
+)
+LIVE_PUSHED_FRAMES = Counter(
+    'live_pushed_frames_total',
+    'Frames pushed by clients into live sessions',
+    ['result']  # 'accepted', 'dropped' (superseded before processing) or 'rejected'
+)
+LIVE_STAGE_DURATION = Histogram(
+    'live_pipeline_stage_duration_seconds',
+    'Time spent in each live pipeline stage per frame',
+    ['stage']  # 'capture', 'analyze', 'ocr' or 'encode'
+)
+LIVE_QUEUE_DEPTH = Gauge(
+    'live_pipeline_queue_depth',
+    'Items waiting between live pipeline stages, summed over sessions',
+    ['stage']
+)
+LIVE_QUEUE_WAIT = Histogram(
+    'live_pipeline_queue_wait_seconds',
+    'Time items wait in a live pipeline queue before the stage picks them up',
+    ['stage']
+)
+LIVE_QUEUE_DROPS = Counter(
+    'live_pipeline_queue_drops_total',
+    'Items dropped from a full live pipeline queue in favour of newer ones',
+    ['stage']  # 'capture' (paced source fell behind), 'analyze' (frame superseded) or 'ocr' (displaced or shed)
+)
+OCR_QUEUE_DEPTH = Gauge(
+    'ocr_scheduler_queue_depth',
+    'OCR jobs waiting in the scheduler',
+    ['priority']  # 'interactive' or 'live'
+)
+OCR_QUEUE_WAIT = Histogram(
+    'ocr_scheduler_wait_seconds',
+    'Time OCR jobs wait in the scheduler before a worker starts them',
+    ['priority']
+)
+OCR_SCHEDULER_REJECTED = Counter(
+    'ocr_scheduler_rejected_total',
+    'OCR jobs shed by scheduler admission control',
+    ['priority', 'reason']  # reason: 'queue_full', 'session_limit' or 'preempted'
+)
+OCR_PASS_OUTCOMES = Counter(
+    'ocr_pass_outcomes_total',
+    'Preprocessing cascade passes by outcome',
+    ['ocr_pass', 'outcome']  # outcome: 'accepted', 'escalated' or 'exhausted'
+)
+CARD_LOOKUPS = Counter(
+    'card_name_lookups_total',
+    'Number of card name index lookups',
+    ['result']  # 'matched' or 'unmatched'
+)
+VIDEO_FRAMES = Counter(
+    'video_scan_frames_total',
+    'Frames read from video and burst uploads',
+    ['result']  # 'skipped' (not sampled), 'sampled' or 'selected' (OCR keyframe)
+)
+VISUAL_MATCHES = Counter(
+    'card_visual_matches_total',
+    'Number of visual index lookups',
+    ['result']  # 'matched' or 'unmatched'
+)
+COLLECTOR_LOOKUPS = Counter(
+    'card_collector_lookups_total',
+    'Number of set code and collector number lookups',
+    ['result']  # 'matched', 'unmatched' or 'unreadable'
+)
 
 # Initialize rate limiter with Redis backend for production
 REDIS_URL = os.getenv('REDIS_URL')
@@ -115,53 +327,645 @@ RETRY_MAX_DELAY = float(os.getenv('RETRY_MAX_DELAY', '10.0'))
 # Session timeout configuration
 SESSION_TIMEOUT = int(os.getenv('SESSION_TIMEOUT', '300'))  # 5 minutes default
 
-# Active scanning sessions with automatic cleanup
-class SessionManager:
+# Tracing and profiling: every scan stage is timed into card_scan_stage_seconds;
+# SCAN_TRACE_SPANS also logs each stage as a span carrying the request id
+SCAN_TRACE_SPANS = os.getenv('SCAN_TRACE_SPANS', 'false').lower() == 'true'
+DEBUG_PROFILE_ENABLED = os.getenv('DEBUG_PROFILE_ENABLED', 'false').lower() == 'true'
+PROFILE_MAX_SECONDS = float(os.getenv('PROFILE_MAX_SECONDS', '30'))
+PROFILE_SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL', '0.005'))
+
+# Live session registry: which worker owns each session ('redis' shares it across
+# workers and nodes, 'memory' only sees this process). Owners renew a lease on
+# their sessions; follow-up calls that land on another worker are forwarded to
+# the owner's internal listener.
+SESSION_REGISTRY = os.getenv('SESSION_REGISTRY', 'redis' if REDIS_URL else 'memory')
+SESSION_LEASE_TTL = float(os.getenv('SESSION_LEASE_TTL', '30'))
+SESSION_FORWARD_BIND = os.getenv('SESSION_FORWARD_BIND', '0.0.0.0')
+SESSION_FORWARD_HOST = os.getenv('SESSION_FORWARD_HOST')  # default: this host's address
+SESSION_FORWARD_TIMEOUT = float(os.getenv('SESSION_FORWARD_TIMEOUT', '30'))
+
+# Card localization configuration
+# Detected cards are warped to a canonical portrait size (MTG cards are 63x88mm)
+CARD_WIDTH = 630
+CARD_HEIGHT = 880
+CARD_DETECTION_MAX_SIDE = int(os.getenv('CARD_DETECTION_MAX_SIDE', '800'))
+CARD_MIN_AREA_RATIO = float(os.getenv('CARD_MIN_AREA_RATIO', '0.15'))
+CARD_RECT_FILL = float(os.getenv('CARD_RECT_FILL', '0.9'))  # of its bounding rectangle, for outlines that are not clean quads
+SCAN_MULTI_MAX_CARDS = int(os.getenv('SCAN_MULTI_MAX_CARDS', '18'))  # two 9-pocket binder pages
+
+# Card regions as (x0, y0, x1, y1) fractions of the canonical card, with the
+# Tesseract page segmentation mode used for each
+CARD_REGIONS = {
+    'name': (0.04, 0.035, 0.78, 0.095),
+    'type_line': (0.04, 0.555, 0.86, 0.612),
+    'collector': (0.03, 0.928, 0.50, 0.982),
+}
+REGION_PSM = {
+    'name': 7,
+    'type_line': 7,
+    'collector': 6,
+    'full': 3,
+}
+OCR_REGIONS = [
+    region.strip() for region in os.getenv('OCR_REGIONS', 'name').split(',')
+    if region.strip() in CARD_REGIONS
+] or ['name']
+
+# Preprocessing cascade, cheapest pass first; a pass is accepted once its mean
+# Tesseract word confidence (0-100) reaches OCR_MIN_CONFIDENCE
+OCR_PASS_NAMES = ('otsu', 'adaptive', 'clahe', 'deskew')
+OCR_PASSES = [
+    name.strip() for name in os.getenv('OCR_PASSES', ','.join(OCR_PASS_NAMES)).split(',')
+    if name.strip() in OCR_PASS_NAMES
+] or ['otsu']
+OCR_MIN_CONFIDENCE = float(os.getenv('OCR_MIN_CONFIDENCE', '70'))
+
+# Card identification: 'name' reads the title line, 'collector' first tries an
+# exact (set code, collector number) lookup from the bottom-left strip, 'visual'
+# only matches the card image against the reference image index
+CARD_IDENTIFY_MODES = ('name', 'collector', 'visual')
+CARD_IDENTIFY_MODE = os.getenv('CARD_IDENTIFY_MODE', 'name')
+if CARD_IDENTIFY_MODE not in CARD_IDENTIFY_MODES:
+    CARD_IDENTIFY_MODE = 'name'
+COLLECTOR_STRIP_SCALE = float(os.getenv('COLLECTOR_STRIP_SCALE', '3'))
+COLLECTOR_WHITELIST = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789/'
+
+# Visual recognition against an index of reference card images; with
+# VISUAL_FIRST_PASS a confident match skips OCR in the other modes too
+VISUAL_INDEX_DIR = os.getenv('VISUAL_INDEX_DIR')
+VISUAL_FIRST_PASS = os.getenv('VISUAL_FIRST_PASS', 'false').lower() == 'true'
+VISUAL_MATCH_MIN_SCORE = float(os.getenv('VISUAL_MATCH_MIN_SCORE', '0.75'))
+VISUAL_MATCH_MIN_MARGIN = float(os.getenv('VISUAL_MATCH_MIN_MARGIN', '0.08'))
+
+# Live stability gate configuration; differences are mean absolute gray levels (0-255)
+# on a downscaled frame, sharpness is the variance of its Laplacian
+LIVE_GATE_WIDTH = int(os.getenv('LIVE_GATE_WIDTH', '160'))
+LIVE_GATE_CHANGE_THRESHOLD = float(os.getenv('LIVE_GATE_CHANGE_THRESHOLD', '12.0'))
+LIVE_GATE_STILL_THRESHOLD = float(os.getenv('LIVE_GATE_STILL_THRESHOLD', '3.0'))
+LIVE_GATE_STILL_FRAMES = int(os.getenv('LIVE_GATE_STILL_FRAMES', '3'))
+LIVE_GATE_MIN_SHARPNESS = float(os.getenv('LIVE_GATE_MIN_SHARPNESS', '60.0'))
+for _name, _value in (
+    ('change', LIVE_GATE_CHANGE_THRESHOLD),
+    ('still', LIVE_GATE_STILL_THRESHOLD),
+    ('still_frames', LIVE_GATE_STILL_FRAMES),
+    ('min_sharpness', LIVE_GATE_MIN_SHARPNESS),
+):
+    LIVE_GATE_THRESHOLDS.labels(name=_name).set(_value)
+
+# Client-pushed live frames
+LIVE_MAX_FRAME_BYTES = int(os.getenv('LIVE_MAX_FRAME_BYTES', str(2 * 1024 * 1024)))
+LIVE_SOCKET_POLL_INTERVAL = float(os.getenv('LIVE_SOCKET_POLL_INTERVAL', '0.1'))
+
+# Live pipeline: minimum seconds between frames handed to OCR, and OCR queue size
+LIVE_OCR_INTERVAL = float(os.getenv('LIVE_OCR_INTERVAL', '0.2'))
+LIVE_OCR_QUEUE_SIZE = int(os.getenv('LIVE_OCR_QUEUE_SIZE', '1'))
+
+# Live preview streaming
+LIVE_PREVIEW_MAX_WIDTH = int(os.getenv('LIVE_PREVIEW_MAX_WIDTH', '640'))
+LIVE_PREVIEW_JPEG_QUALITY = int(os.getenv('LIVE_PREVIEW_JPEG_QUALITY', '70'))
+LIVE_PREVIEW_MAX_FPS = float(os.getenv('LIVE_PREVIEW_MAX_FPS', '15'))
+
+# Frame source of camera-mode live sessions: device:<index or URL>, video:<file>,
+# images:<directory> or replay:<recording>. File sources are paced at LIVE_SOURCE_SPEED
+# times their original rate (0 = as fast as frames are read).
+LIVE_CAMERA_SOURCE = os.getenv('LIVE_CAMERA_SOURCE', 'device:0')
+LIVE_SOURCE_SPEED = float(os.getenv('LIVE_SOURCE_SPEED', '1.0'))
+LIVE_SOURCE_LOOP = os.getenv('LIVE_SOURCE_LOOP', 'true').lower() == 'true'
+LIVE_SOURCE_FPS = float(os.getenv('LIVE_SOURCE_FPS', '10'))  # pace of image directories
+
+# Live session recording (off unless a directory is set)
+LIVE_RECORD_DIR = os.getenv('LIVE_RECORD_DIR', '')
+LIVE_RECORD_JPEG_QUALITY = int(os.getenv('LIVE_RECORD_JPEG_QUALITY', '90'))
+LIVE_RECORD_MAX_BYTES = int(os.getenv('LIVE_RECORD_MAX_BYTES', str(256 * 1024 * 1024)))
+
+# OCR engine pool configuration
+OCR_LANGUAGE = os.getenv('OCR_LANGUAGE', 'eng')
+OCR_POOL_SIZE = int(os.getenv('OCR_POOL_SIZE', str(os.cpu_count() or 2)))
+OCR_CHECKOUT_TIMEOUT = float(os.getenv('OCR_CHECKOUT_TIMEOUT', '10'))
+
+# OCR scheduler: admission control in front of the engine pool
+OCR_QUEUE_LIMIT = int(os.getenv('OCR_QUEUE_LIMIT', str(OCR_POOL_SIZE * 8)))
+OCR_MAX_INFLIGHT_PER_SESSION = int(os.getenv('OCR_MAX_INFLIGHT_PER_SESSION', '2'))
+
+# OCR result cache configuration
+SCAN_CACHE_SIZE = int(os.getenv('SCAN_CACHE_SIZE', '2048'))
+SCAN_CACHE_TTL = int(os.getenv('SCAN_CACHE_TTL', '600'))  # seconds
+SCAN_CACHE_REDIS = os.getenv('SCAN_CACHE_REDIS', 'false').lower() == 'true'
+# Fraction of hash bits that may differ for a near-duplicate local hit (0 = exact only)
+SCAN_CACHE_MATCH_DISTANCE = float(os.getenv('SCAN_CACHE_MATCH_DISTANCE', '0.1'))
+
+# Batch scan configuration
+SCAN_BATCH_MAX_IMAGES = int(os.getenv('SCAN_BATCH_MAX_IMAGES', '50'))
+# Images per minute across a client's batches; never below one full batch
+SCAN_BATCH_IMAGES_PER_MINUTE = max(int(os.getenv('SCAN_BATCH_IMAGES_PER_MINUTE', '100')), SCAN_BATCH_MAX_IMAGES)
+# Threads per worker that decode and locate cards in batch images; their OCR goes through the scheduler
+SCAN_BATCH_WORKERS = int(os.getenv('SCAN_BATCH_WORKERS', str(OCR_POOL_SIZE)))
+
+# Upload ingest configuration
+SCAN_MAX_UPLOAD_BYTES = int(os.getenv('SCAN_MAX_UPLOAD_BYTES', str(16 * 1024 * 1024)))
+SCAN_MAX_REQUEST_BYTES = int(os.getenv('SCAN_MAX_REQUEST_BYTES', str(128 * 1024 * 1024)))
+SCAN_MAX_PIXELS = int(os.getenv('SCAN_MAX_PIXELS', str(50 * 1000 * 1000)))
+SCAN_DECODE_MIN_SIDE = int(os.getenv('SCAN_DECODE_MIN_SIDE', '1600'))  # decoded long side is at least this
+
+# Video and burst scan configuration
+SCAN_VIDEO_SAMPLE_FPS = float(os.getenv('SCAN_VIDEO_SAMPLE_FPS', '10'))
+SCAN_VIDEO_MAX_SECONDS = float(os.getenv('SCAN_VIDEO_MAX_SECONDS', '60'))
+SCAN_VIDEO_MAX_FRAMES = int(os.getenv('SCAN_VIDEO_MAX_FRAMES', '300'))  # burst uploads
+app.config['MAX_CONTENT_LENGTH'] = SCAN_MAX_REQUEST_BYTES
+
+# ASGI serving mode (`uvicorn app:asgi_app`): threads that run requests once their
+# body has arrived, for long-lived live streams, and for health/readiness/metrics probes
+ASGI_REQUEST_THREADS = int(os.getenv('ASGI_REQUEST_THREADS', str(max(8, OCR_POOL_SIZE * 4))))
+ASGI_STREAM_THREADS = int(os.getenv('ASGI_STREAM_THREADS', '64'))
+ASGI_PROBE_THREADS = int(os.getenv('ASGI_PROBE_THREADS', '2'))
+ASGI_SPOOL_BYTES = int(os.getenv('ASGI_SPOOL_BYTES', str(1024 * 1024)))  # larger bodies spool to disk
+
+# Open live streams per worker (MJPEG preview, SSE events and WebSockets); more get 503.
+# Under gunicorn each one holds one of the worker's --threads for as long as it is open,
+# so the default leaves the other thread of the Dockerfile's two for scans
+SERVER_MODE = os.getenv('SERVER_MODE', 'gunicorn')
+LIVE_MAX_STREAMS = int(os.getenv('LIVE_MAX_STREAMS', str(ASGI_STREAM_THREADS if SERVER_MODE == 'asgi' else 1)))
+
+# Startup: each worker runs a synthetic scan before /ready reports it ready
+STARTUP_WARMUP = os.getenv('STARTUP_WARMUP', 'true').lower() == 'true'
+
+# Collection write-behind configuration
+BACKEND_URL = os.getenv('BACKEND_URL')
+API_TOKEN = os.getenv('API_TOKEN')
+COLLECTION_JOURNAL_PATH = os.getenv('COLLECTION_JOURNAL_PATH', 'collection_journal.db')
+COLLECTION_BULK_PATH = os.getenv('COLLECTION_BULK_PATH', '/api/collection/add/bulk')
+COLLECTION_FLUSH_INTERVAL = float(os.getenv('COLLECTION_FLUSH_INTERVAL', '1.0'))
+COLLECTION_BATCH_SIZE = int(os.getenv('COLLECTION_BATCH_SIZE', '50'))
+COLLECTION_DEDUPE_WINDOW = float(os.getenv('COLLECTION_DEDUPE_WINDOW', '30'))
+COLLECTION_REQUEST_TIMEOUT = float(os.getenv('COLLECTION_REQUEST_TIMEOUT', '5'))
+COLLECTION_CLAIM_LEASE = float(os.getenv('COLLECTION_CLAIM_LEASE', '120'))
+
+# Local card catalog (Scryfall bulk-data JSON) used to resolve OCR text to cards
+CARD_CATALOG_PATH = os.getenv('CARD_CATALOG_PATH')
+CARD_INDEX_DIR = os.getenv('CARD_INDEX_DIR')
+CARD_MATCH_MIN_SCORE = float(os.getenv('CARD_MATCH_MIN_SCORE', '0.6'))
+
+# Endpoint and identify mode that scan stages are attributed to. Request handlers
+# set them; work handed to other threads runs in a copy of the caller's context.
+scan_labels = contextvars.ContextVar('scan_labels', default=('other', 'none'))
+# Set for warm-up scans, which must run OCR rather than be answered from the cache
+scan_cache_bypass = contextvars.ContextVar('scan_cache_bypass', default=False)
+REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+def set_scan_labels(endpoint, mode=None):
+    scan_labels.set((endpoint, mode or 'none'))
+
+def scan_context(endpoint=None, mode=None):
+    """Copy of the current context (request id, scan labels) to run work on another thread"""
+    context = contextvars.copy_context()
+    if endpoint is not None:
+        context.run(set_scan_labels, endpoint, mode)
+    return context
+
+def submit_in_context(executor, fn, *args, **kwargs):
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+@contextmanager
+def scan_stage(stage, endpoint=None):
+    """Time a scan stage into SCAN_STAGE_DURATION; also usable as a function decorator"""
+    labels = scan_labels.get()
+    endpoint = endpoint or labels[0]
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        SCAN_STAGE_DURATION.labels(stage=stage, endpoint=endpoint, mode=labels[1]).observe(elapsed)
+        if SCAN_TRACE_SPANS:
+            logger.info("span", stage=stage, endpoint=endpoint, mode=labels[1], duration_ms=round(elapsed * 1000, 3))
+
+@app.before_request
+def bind_request_context():
+    """Tag this request's log lines and spans with a request id (the caller's X-Request-ID if valid)"""
+    request_id = request.headers.get('X-Request-ID', '')
+    if not REQUEST_ID_PATTERN.match(request_id):
+        request_id = uuid.uuid4().hex
+    structlog.contextvars.clear_contextvars()
+    structlog.contextvars.bind_contextvars(request_id=request_id)
+    set_scan_labels('other')
+
+@app.after_request
+def add_request_id_header(response):
+    request_id = structlog.contextvars.get_contextvars().get('request_id')
+    if request_id:
+        response.headers['X-Request-ID'] = request_id
+    return response
+
+def sample_stacks(seconds, interval=PROFILE_SAMPLE_INTERVAL):
+    """Sample every other thread's Python stack for `seconds`.
+
+    Returns ({collapsed stack: samples}, number of sampling rounds). Stacks are
+    rooted at the thread name and frames are "function (file:first line)", the
+    collapsed format flamegraph.pl and speedscope read. Samples are wall-clock,
+    so threads blocked waiting show up too.
+    """
+    me = threading.get_ident()
+    names = {}
+    stacks = {}
+    rounds = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            if ident not in names:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            stack.append(names.get(ident, f'thread-{ident}'))
+            key = ';'.join(reversed(stack))
+            stacks[key] = stacks.get(key, 0) + 1
+        rounds += 1
+        time.sleep(interval)
+    return stacks, rounds
+
+_profile_lock = threading.Lock()
+
+class MemorySessionRegistry:
+    """Session ownership leases kept in this process (a single worker, or tests)"""
+
     def __init__(self):
+        self.leases = {}  # user_id -> (owner, expires)
+        self.lock = threading.Lock()
+
+    def claim(self, user_id, owner, ttl):
+        with self.lock:
+            self.leases[user_id] = (owner, time.time() + ttl)
+
+    def renew(self, user_id, owner, ttl):
+        """Extend the lease if owner still holds it (or nobody does); False once another worker took it"""
+        with self.lock:
+            current = self.lookup_locked(user_id)
+            if current is not None and current['worker'] != owner['worker']:
+                return False
+            self.leases[user_id] = (owner, time.time() + ttl)
+            return True
+
+    def release(self, user_id, worker):
+        with self.lock:
+            current = self.lookup_locked(user_id)
+            if current is None or current['worker'] == worker:
+                self.leases.pop(user_id, None)
+
+    def lookup(self, user_id):
+        with self.lock:
+            return self.lookup_locked(user_id)
+
+    def lookup_locked(self, user_id):
+        owner, expires = self.leases.get(user_id, (None, 0))
+        return owner if expires > time.time() else None
+
+    def count(self):
+        now = time.time()
+        with self.lock:
+            return sum(1 for _, expires in self.leases.values() if expires > now)
+
+class RedisSessionRegistry:
+    """Session ownership leases in Redis, shared by every worker and node.
+
+    Each session is a key holding its owner that expires with the lease; a sorted
+    set of lease expiry times makes the cluster-wide count cheap. Redis errors are
+    logged and leave local sessions running.
+    """
+
+    KEY_PREFIX = 'live_session:'
+    LEASES_KEY = 'live_session_leases'
+
+    def __init__(self, redis_url):
+        self.redis = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    def _error(self, e):
+        logger.warn("session_registry_error", error=str(e))
+        SCAN_ERRORS.labels(error_type='session_registry').inc()
+
+    def _write(self, pipe, user_id, owner, ttl):
+        pipe.set(self.KEY_PREFIX + user_id, json.dumps(owner), px=int(ttl * 1000))
+        pipe.zadd(self.LEASES_KEY, {user_id: time.time() + ttl})
+
+    def claim(self, user_id, owner, ttl):
+        try:
+            pipe = self.redis.pipeline()
+            self._write(pipe, user_id, owner, ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            self._error(e)
+
+    def renew(self, user_id, owner, ttl):
+        """Extend the lease if owner still holds it (or nobody does); False once another worker took it"""
+        key = self.KEY_PREFIX + user_id
+        try:
+            with self.redis.pipeline() as pipe:
+                pipe.watch(key)
+                raw = pipe.get(key)
+                if raw is not None and json.loads(raw)['worker'] != owner['worker']:
+                    return False
+                pipe.multi()
+                self._write(pipe, user_id, owner, ttl)
+                pipe.execute()
+            return True
+        except redis.WatchError:
+            return False  # claimed by another worker in the meantime
+        except redis.RedisError as e:
+            self._error(e)
+            return True
+
+    def release(self, user_id, worker):
+        key = self.KEY_PREFIX + user_id
+        try:
+            with self.redis.pipeline() as pipe:
+                pipe.watch(key)
+                raw = pipe.get(key)
+                if raw is not None and json.loads(raw)['worker'] != worker:
+                    return
+                pipe.multi()
+                pipe.delete(key)
+                pipe.zrem(self.LEASES_KEY, user_id)
+                pipe.execute()
+        except redis.WatchError:
+            pass
+        except redis.RedisError as e:
+            self._error(e)
+
+    def lookup(self, user_id):
+        try:
+            raw = self.redis.get(self.KEY_PREFIX + user_id)
+        except redis.RedisError as e:
+            self._error(e)
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    def count(self):
+        try:
+            pipe = self.redis.pipeline()
+            pipe.zremrangebyscore(self.LEASES_KEY, '-inf', time.time())
+            pipe.zcard(self.LEASES_KEY)
+            return pipe.execute()[1]
+        except redis.RedisError as e:
+            self._error(e)
+            return None
+
+def create_session_registry():
+    if SESSION_REGISTRY == 'redis' and REDIS_URL:
+        return RedisSessionRegistry(REDIS_URL)
+    if SESSION_REGISTRY == 'redis':
+        logger.warn("session_registry_fallback", reason="REDIS_URL is not set")
+    return MemorySessionRegistry()
+
+def worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+def forward_token(worker):
+    """Shared-secret token a worker expects on requests forwarded to it"""
+    return hmac.new(JWT_SECRET.encode('utf-8'), f'forward:{worker}'.encode('utf-8'), hashlib.sha256).hexdigest()
+
+class ForwardedOnly:
+    """WSGI wrapper for the internal listener: only accepts requests forwarded by another worker"""
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        token = environ.get('HTTP_X_SESSION_FORWARD', '')
+        if not hmac.compare_digest(token, forward_token(worker_id())):
+            start_response('403 Forbidden', [('Content-Type', 'application/json')])
+            return [b'{"error": "Forbidden"}']
+        environ['card_scanner.forwarded'] = True
+        return self.wsgi_app(environ, start_response)
+
+def is_forwarded_request():
+    return request.environ.get('card_scanner.forwarded', False)
+
+_forward_server = None
+_forward_pid = None
+_forward_address = None
+_forward_lock = threading.Lock()
+
+def get_forward_address():
+    """Start this worker's internal listener for forwarded session calls (again after a fork)"""
+    global _forward_server, _forward_pid, _forward_address
+    with _forward_lock:
+        if _forward_pid != os.getpid():
+            _forward_server = make_server(SESSION_FORWARD_BIND, 0, ForwardedOnly(app), threaded=True)
+            threading.Thread(target=_forward_server.serve_forever, daemon=True).start()
+            host = SESSION_FORWARD_HOST
+            if not host:
+                try:
+                    host = socket.gethostbyname(socket.gethostname())
+                except OSError:
+                    host = '127.0.0.1'
+            _forward_pid = os.getpid()
+            _forward_address = f'http://{host}:{_forward_server.server_port}'
+            logger.info("session_forward_listening", address=_forward_address)
+    return _forward_address
+
+_forward_http = None
+_forward_http_pid = None
+
+def get_forward_http():
+    global _forward_http, _forward_http_pid
+    if _forward_http_pid != os.getpid():
+        _forward_http = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        _forward_http.mount('http://', adapter)
+        _forward_http_pid = os.getpid()
+    return _forward_http
+
+# Active scanning sessions owned by this worker, with ownership shared through the registry
+class SessionManager:
+    """Live sessions run by this worker.
+
+    Each session is claimed in the session registry. While it is in use the owner
+    renews its lease every third of SESSION_LEASE_TTL; idle sessions are stopped,
+    and sessions of a worker that died expire with their lease. A session claimed
+    by another worker since (e.g. a new WebSocket) is stopped here.
+    """
+
+    def __init__(self, registry):
         self.sessions = {}
+        self.registry = registry
         self.lock = threading.RLock()
-        self.cleanup_thread = threading.Thread(target=self._cleanup_loop, daemon=True)
-        self.cleanup_thread.start()
-    
+        self.lease_thread = None
+        self._pid = None
+
+    def owner(self):
+        return {'worker': worker_id(), 'address': get_forward_address()}
+
+    def _ensure_lease_thread(self):
+        with self.lock:
+            if self._pid == os.getpid() and self.lease_thread and self.lease_thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self.lease_thread = threading.Thread(target=self._lease_loop, daemon=True)
+            self.lease_thread.start()
+
     def add_session(self, user_id: str, session: 'LiveScannerSession'):
         with self.lock:
             if user_id in self.sessions:
                 self.sessions[user_id].stop()
             self.sessions[user_id] = session
-            ACTIVE_SESSIONS.set(len(self.sessions))
-    
+        self.registry.claim(user_id, self.owner(), SESSION_LEASE_TTL)
+        self._ensure_lease_thread()
+        self.update_gauge()
+
     def remove_session(self, user_id: str):
+        """Stop the user's session, here or on the worker that owns it"""
         with self.lock:
-            if user_id in self.sessions:
-                self.sessions[user_id].stop()
-                del self.sessions[user_id]
-                ACTIVE_SESSIONS.set(len(self.sessions))
-    
+            session = self.sessions.pop(user_id, None)
+        if session is not None:
+            session.stop()
+            self.registry.release(user_id, worker_id())
+        else:
+            owner = self.registry.lookup(user_id)
+            if owner is not None and owner['worker'] != worker_id():
+                stop_remote_session(owner, user_id)
+        self.update_gauge()
+
     def get_session(self, user_id: str):
+        """The user's session if this worker runs it"""
         with self.lock:
             return self.sessions.get(user_id)
-    
-    def _cleanup_loop(self):
+
+    def get_owner(self, user_id: str):
+        """Registry entry of the worker running the user's session, or None"""
+        return self.registry.lookup(user_id)
+
+    def count(self):
+        """Active sessions across all workers (this worker's when the registry is unavailable)"""
+        count = self.registry.count()
+        return len(self.sessions) if count is None else count
+
+    def update_gauge(self):
+        ACTIVE_SESSIONS.set(self.count())
+
+    def _drop(self, user_id, session):
+        with self.lock:
+            if self.sessions.get(user_id) is session:
+                del self.sessions[user_id]
+        session.stop()
+
+    def renew_leases(self):
+        now = time.time()
+        owner = self.owner()
+        with self.lock:
+            sessions = list(self.sessions.items())
+        for user_id, session in sessions:
+            if now - session.last_activity > SESSION_TIMEOUT or not session.active:
+                logger.info("session_timeout", user_id=user_id)
+                self._drop(user_id, session)
+                self.registry.release(user_id, owner['worker'])
+            elif not self.registry.renew(user_id, owner, SESSION_LEASE_TTL):
+                logger.info("session_lease_lost", user_id=user_id)
+                self._drop(user_id, session)
+        self.update_gauge()
+
+    def _lease_loop(self):
         while True:
+            time.sleep(SESSION_LEASE_TTL / 3)
             try:
-                current_time = time.time()
-                to_remove = []
-                
-                with self.lock:
-                    for user_id, session in self.sessions.items():
-                        if current_time - session.last_activity > SESSION_TIMEOUT:
-                            to_remove.append(user_id)
-                
-                for user_id in to_remove:
-                    logger.info("session_timeout", user_id=user_id)
-                    self.remove_session(user_id)
-                
-                time.sleep(60)
+                self.renew_leases()
             except Exception as e:
-                logger.error("cleanup_loop_error", error=str(e), traceback=traceback.format_exc())
-                time.sleep(60)  # Keep trying even if there's an error
+                logger.error("session_lease_loop_error", error=str(e), traceback=traceback.format_exc())
+
+    def stop_all(self):
+        """Stop and release every session of this worker (at exit)"""
+        with self.lock:
+            sessions, self.sessions = self.sessions, {}
+        for user_id, session in sessions.items():
+            session.stop()
+            self.registry.release(user_id, worker_id())
+
+session_manager = SessionManager(create_session_registry())
+
+def forward_headers(owner):
+    headers = {
+        name: request.headers[name]
+        for name in ('Authorization', 'Content-Type', 'Accept', 'X-Request-ID')
+        if name in request.headers
+    }
+    if 'Authorization' not in headers and request.args.get('token'):
+        headers['Authorization'] = f"Bearer {request.args['token']}"
+    headers['X-Session-Forward'] = forward_token(owner['worker'])
+    return headers
+
+def forward_path():
+    """Path and query of the current request without its `token` (forward_headers sends it as a header)"""
+    query = [(name, value) for name, value in request.args.items(multi=True) if name != 'token']
+    return request.path + ('?' + urllib.parse.urlencode(query) if query else '')
+
+def stop_remote_session(owner, user_id):
+    """Ask the owning worker to stop a session; a dead owner's lease is dropped instead"""
+    try:
+        get_forward_http().post(
+            f"{owner['address']}/internal/live/{user_id}/stop",
+            headers={'X-Session-Forward': forward_token(owner['worker'])},
+            timeout=SESSION_FORWARD_TIMEOUT
+        ).raise_for_status()
+        SESSION_FORWARDS.labels(result='forwarded').inc()
+    except requests.RequestException as e:
+        logger.warn("session_forward_error", user_id=user_id, owner=owner['worker'], error=str(e))
+        SESSION_FORWARDS.labels(result='error').inc()
+        session_manager.registry.release(user_id, owner['worker'])
+
+def forward_to_owner(owner, user_id):
+    """Proxy the current request to the owning worker, streaming its response back"""
+    try:
+        upstream = get_forward_http().request(
+            request.method,
+            owner['address'] + forward_path(),
+            data=request.get_data(),
+            headers=forward_headers(owner),
+            stream=True,
+            timeout=SESSION_FORWARD_TIMEOUT
+        )
+    except requests.RequestException as e:
+        logger.warn("session_forward_error", user_id=user_id, owner=owner['worker'], error=str(e))
+        SESSION_FORWARDS.labels(result='error').inc()
+        session_manager.registry.release(user_id, owner['worker'])
+        return jsonify({'error': 'No active scanning session'}), 404
+
+    SESSION_FORWARDS.labels(result='forwarded').inc()
+    headers = {
+        name: upstream.headers[name]
+        for name in ('Cache-Control', 'X-Accel-Buffering')
+        if name in upstream.headers
+    }
+    response = Response(
+        upstream.iter_content(chunk_size=None),
+        status=upstream.status_code,
+        content_type=upstream.headers.get('Content-Type'),
+        headers=headers
+    )
+    response.call_on_close(upstream.close)
+    return response
+
+def route_to_session_owner(f):
+    """Forward live session calls to the worker that owns the user's session.
+
+    Requests already forwarded by another worker are always handled here, so a
+    stale registry entry cannot bounce a request between workers.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        user_id = request.user.get('id')
+        if session_manager.get_session(user_id) is None and not is_forwarded_request():
+            owner = session_manager.get_owner(user_id)
+            if owner is not None and owner['worker'] != worker_id():
+                return forward_to_owner(owner, user_id)
+        return f(*args, **kwargs)
+    return decorated
 
-session_manager = SessionManager()
+@limiter.request_filter
+def forwarded_request_filter():
+    """Forwarded calls were already rate limited by the worker that received them"""
+    return is_forwarded_request()
 
 # Authentication decorator with retry support
 def require_auth(f):
@@ -173,209 +977,2250 @@ def require_auth(f):
             return jsonify({'error': 'Missing authentication'}), 401
 
         token = auth_header.split(' ')[1]
-        try:
-            payload = jwt.decode(token, JWT_SECRET, algorithms=['HS256'])
-            request.user = payload
-        except jwt.ExpiredSignatureError:
-            logger.warn("expired_token")
-            return jsonify({'error': 'Token expired'}), 401
-        except jwt.InvalidTokenError as e:
-            logger.warn("invalid_token", error=str(e))
-            return jsonify({'error': 'Invalid token'}), 401
+        payload, error = authenticate_token(token)
+        if payload is None:
+            return jsonify({'error': error}), 401
+        request.user = payload
 
         return f(*args, **kwargs)
     return decorated
 
-class LiveScannerSession:
-    def __init__(self, user_id):
-        self.user_id = user_id
-        self.active = True
-        self.last_frame = None
-        self.last_scan_result = None
-        self.last_activity = time.time()
-        self.thread = None
-        self.cap = None
-        self.scan_count = 0
-        self.error_count = 0
-        self.lock = threading.RLock()
-        self.consecutive_frames_processed = 0
-        
-    def start(self):
-        try:
-            self.cap = cv2.VideoCapture(0)
-            if not self.cap.isOpened():
-                logger.error("camera_error", user_id=self.user_id)
-                SCAN_ERRORS.labels(error_type='camera_init').inc()
+def require_stream_auth(f):
+    """Like require_auth, but also accepts the JWT as a `token` query parameter.
+
+    For streams consumed by <img> tags and EventSource, which cannot set headers.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        token = get_request_token(allow_query=True)
+        if not token:
+            logger.warn("missing_auth_header")
+            return jsonify({'error': 'Missing authentication'}), 401
+
+        payload, error = authenticate_token(token)
+        if payload is None:
+            return jsonify({'error': error}), 401
+        request.user = payload
+
+        return f(*args, **kwargs)
+    return decorated
+
+class LiveStreamSlots:
+    """Count of the live streams open on this worker, capped at LIVE_MAX_STREAMS"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.open = 0
+        self.lock = threading.Lock()
+
+    def acquire(self, kind):
+        """Take a slot for a stream of this kind; False (and counted as rejected) when all are taken"""
+        with self.lock:
+            if self.open >= self.limit:
+                LIVE_STREAMS_REJECTED.labels(kind=kind).inc()
+                logger.warn("live_stream_rejected", kind=kind, limit=self.limit)
                 return False
-            
-            self.thread = threading.Thread(target=self._scan_loop)
-            self.thread.daemon = True
-            self.thread.start()
-            return True
-        except Exception as e:
-            logger.error("session_start_error", user_id=self.user_id, error=str(e), traceback=traceback.format_exc())
-            SCAN_ERRORS.labels(error_type='session_start').inc()
-            return False
+            self.open += 1
+        LIVE_STREAMS.labels(kind=kind).inc()
+        return True
 
-    @SCAN_DURATION.labels(method='live').time()
-    def _process_frame(self, frame):
+    def release(self, kind):
+        with self.lock:
+            self.open -= 1
+        LIVE_STREAMS.labels(kind=kind).dec()
+
+live_streams = LiveStreamSlots(LIVE_MAX_STREAMS)
+
+def limit_live_streams(kind):
+    """Hold a live stream slot until the streamed response is closed; 503 when the worker has none left"""
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if not live_streams.acquire(kind):
+                return jsonify({'error': 'Too many live streams, retry later'}), 503, {'Retry-After': '5'}
+            try:
+                response = app.make_response(f(*args, **kwargs))
+            except BaseException:
+                live_streams.release(kind)
+                raise
+            if response.is_streamed:
+                response.call_on_close(lambda: live_streams.release(kind))
+            else:
+                live_streams.release(kind)  # an error, not a stream
+            return response
+        return decorated
+    return decorator
+
+def get_request_token(allow_query=False):
+    auth_header = request.headers.get('Authorization', '')
+    if auth_header.startswith('Bearer '):
+        return auth_header.split(' ')[1]
+    if allow_query:
+        return request.args.get('token')
+    return None
+
+def authenticate_token(token):
+    """Decode a JWT, returning (payload, None) or (None, error message)"""
+    try:
+        return jwt.decode(token, JWT_SECRET, algorithms=['HS256']), None
+    except jwt.ExpiredSignatureError:
+        logger.warn("expired_token")
+        return None, 'Token expired'
+    except jwt.InvalidTokenError as e:
+        logger.warn("invalid_token", error=str(e))
+        return None, 'Invalid token'
+
+class TesserocrEngine:
+    """Long-lived Tesseract API handle; the language model is loaded once at creation"""
+
+    name = 'tesserocr'
+
+    def __init__(self, language=OCR_LANGUAGE):
+        self.api = tesserocr.PyTessBaseAPI(lang=language)
+
+    def image_to_data(self, image, psm=3, whitelist=None):
+        """Return the recognized text and its mean word confidence (0-100)"""
+        # Hand the pixel buffer over directly; SetImage would re-encode a PIL copy
+        image = np.ascontiguousarray(image)
+        height, width = image.shape[:2]
+        channels = 1 if image.ndim == 2 else image.shape[2]
+        self.api.SetPageSegMode(psm)
+        self.api.SetVariable('tessedit_char_whitelist', whitelist or '')
         try:
-            with self.lock:
-                # Apply preprocessing to improve OCR quality
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                _, thresh = cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY)
-
-                # Apply OCR
-                img = Image.fromarray(thresh)
-                text = pytesseract.image_to_string(img)
-
-                if text and text.strip():
-                    self.last_scan_result = text.strip()
-                    self.scan_count += 1
-                    self.error_count = 0  # Reset error count on success
-                    self.consecutive_frames_processed += 1
-
-                    # Send scanned card details to the backend
-                    card_details = {"name": self.last_scan_result}
-                    user_id = self.user_id
-                    response = requests.post(
-                        f"{os.getenv('BACKEND_URL')}/api/collection/add", 
-                        json={"userId": user_id, "card": card_details},
-                        headers={"Authorization": f"Bearer {os.getenv('API_TOKEN')}"}
-                    )
+            self.api.SetImageBytes(image.tobytes(), width, height, channels, width * channels)
+            text = self.api.GetUTF8Text()
+            return text, float(self.api.MeanTextConf())
+        finally:
+            # Engines are pooled; do not leak the whitelist into the next caller
+            if whitelist:
+                self.api.SetVariable('tessedit_char_whitelist', '')
 
-                    if response.status_code == 200:
-                        logger.info(
-                            "card_added_to_collection",
-                            user_id=self.user_id,
-                            card_name=self.last_scan_result
-                        )
-                    else:
-                        logger.error(
-                            "failed_to_add_card",
-                            user_id=self.user_id,
-                            card_name=self.last_scan_result,
-                            status_code=response.status_code,
-                            response=response.text
-                        )
+    def close(self):
+        self.api.End()
 
-                    logger.info(
-                        "live_scan_success",
-                        user_id=self.user_id,
-                        scan_count=self.scan_count,
-                        consecutive_frames=self.consecutive_frames_processed,
-                        text_preview=text[:30]
-                    )
-                else:
-                    self.consecutive_frames_processed = 0
-        except Exception as e:
-            self.error_count += 1
-            self.consecutive_frames_processed = 0
-            logger.error(
-                "frame_processing_error", 
-                user_id=self.user_id, 
-                error=str(e),
-                traceback=traceback.format_exc(),
-                error_count=self.error_count
-            )
-            SCAN_ERRORS.labels(error_type='frame_processing').inc()
+class PytesseractEngine:
+    """Fallback engine that runs the tesseract binary for every call"""
 
-            if self.error_count > 10:  # Stop session if too many errors
-                self.stop()
-                
-    def _scan_loop(self):
-        frame_interval = 0.2  # Process at most 5 frames per second
-        last_processed = time.time()
-        
-        while self.active:
+    name = 'pytesseract'
+
+    def __init__(self, language=OCR_LANGUAGE):
+        self.language = language
+
+    def image_to_data(self, image, psm=3, whitelist=None):
+        """Return the recognized text and its mean word confidence (0-100)"""
+        config = f'--psm {psm}'
+        if whitelist:
+            config += f' -c tessedit_char_whitelist={whitelist}'
+        data = pytesseract.image_to_data(
+            Image.fromarray(image),
+            lang=self.language,
+            config=config,
+            output_type=pytesseract.Output.DICT
+        )
+        lines = OrderedDict()
+        confidences = []
+        for i, word in enumerate(data['text']):
+            confidence = float(data['conf'][i])
+            if confidence < 0 or not word.strip():
+                continue
+            line = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            lines.setdefault(line, []).append(word)
+            confidences.append(confidence)
+        text = '\n'.join(' '.join(words) for words in lines.values())
+        return text, (sum(confidences) / len(confidences) if confidences else 0.0)
+
+    def close(self):
+        pass
+
+class OCREnginePool:
+    """Bounded pool of OCR engines shared by /scan requests and live sessions.
+
+    Engines are created lazily, up to `size` per process, so gunicorn workers
+    each build their own after forking. Callers borrow one with checkout().
+    Engines built with preload() in a gunicorn master are instead adopted by
+    every worker forked from it, sharing the loaded language model pages
+    copy-on-write.
+    """
+
+    def __init__(self, size=OCR_POOL_SIZE, timeout=OCR_CHECKOUT_TIMEOUT):
+        self.size = size
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._preload_pid = None
+        self._reset()
+
+    def _reset(self, engines=()):
+        self._pid = os.getpid()
+        self._idle = queue.LifoQueue()
+        for engine in engines:
+            self._idle.put(engine)
+        self._created = len(engines)
+        self._busy = 0
+
+    def preload(self):
+        """Create every engine now, for processes forked from this one to adopt"""
+        with self._lock:
+            engines = []
+            while self._created + len(engines) < self.size:
+                engines.append(self._create_engine())
+            for engine in engines:
+                self._idle.put(engine)
+            self._created += len(engines)
+            self._preload_pid = os.getpid()
+            self._update_gauges()
+
+    @property
+    def engine_name(self):
+        return TesserocrEngine.name if tesserocr is not None else PytesseractEngine.name
+
+    def _create_engine(self):
+        if tesserocr is not None:
             try:
-                with self.lock:
-                    if not self.cap or not self.cap.isOpened():
-                        logger.error("camera_closed", user_id=self.user_id)
-                        break
-                    
-                    ret, frame = self.cap.read()
-                    if not ret:
-                        # Try to reinitialize the camera on failure
-                        self._reinitialize_camera()
-                        continue
-                        
-                    self.last_frame = frame.copy()
-                    self.last_activity = time.time()
-                
-                # Process frame if enough time has passed
-                current_time = time.time()
-                if current_time - last_processed >= frame_interval:
-                    self._process_frame(frame)
-                    last_processed = current_time
-                    
-                time.sleep(0.05)
+                return TesserocrEngine()
             except Exception as e:
-                logger.error("scan_loop_error", user_id=self.user_id, error=str(e), traceback=traceback.format_exc())
-                SCAN_ERRORS.labels(error_type='scan_loop').inc()
-                time.sleep(1)  # Wait before retrying
-            
-        # Cleanup
+                logger.error("ocr_engine_init_error", error=str(e), traceback=traceback.format_exc())
+                SCAN_ERRORS.labels(error_type='ocr_engine_init').inc()
+        return PytesseractEngine()
+
+    def _acquire(self, timeout):
+        with self._lock:
+            if self._pid != os.getpid():
+                # Queue state is not inherited across a fork, and neither are
+                # engines, except the idle ones of a preloading master
+                adopt = self._pid == self._preload_pid
+                self._reset(list(self._idle.queue) if adopt else ())
+            create = self._idle.empty() and self._created < self.size
+            if create:
+                self._created += 1
+
+        if create:
+            try:
+                return self._create_engine()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError('No OCR engine available')
+
+    def _update_gauges(self):
+        OCR_ENGINES.labels(state='busy').set(self._busy)
+        OCR_ENGINES.labels(state='idle').set(self._created - self._busy)
+
+    @contextmanager
+    def checkout(self, timeout=None):
+        """Borrow an engine for the duration of the block, waiting up to `timeout` seconds"""
+        with OCR_CHECKOUT_WAIT.time():
+            engine = self._acquire(self.timeout if timeout is None else timeout)
+        pid = self._pid
+        with self._lock:
+            self._busy += 1
+            self._update_gauges()
+
+        healthy = True
+        try:
+            yield engine
+        except Exception:
+            # A failed call may leave the engine in a bad state; replace it
+            healthy = False
+            raise
+        finally:
+            with self._lock:
+                if pid == self._pid:
+                    self._busy -= 1
+                    if healthy:
+                        self._idle.put(engine)
+                    else:
+                        self._created -= 1
+                        engine.close()
+                    self._update_gauges()
+
+ocr_pool = OCREnginePool()
+
+class SchedulerOverloaded(Exception):
+    """Raised when the OCR scheduler sheds a job; carries a Retry-After hint in seconds"""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(f'OCR scheduler overloaded ({reason})')
+        self.reason = reason
+        self.retry_after = retry_after
+
+class FairQueue:
+    """Per-key FIFO queues served round-robin across keys"""
+
+    def __init__(self):
+        self.queues = OrderedDict()
+        self.size = 0
+
+    def push(self, key, item):
+        self.queues.setdefault(key, deque()).append(item)
+        self.size += 1
+
+    def pop(self):
+        key, items = self.queues.popitem(last=False)
+        item = items.popleft()
+        if items:
+            # Back of the rotation, behind every other waiting key
+            self.queues[key] = items
+        self.size -= 1
+        return item
+
+class SchedulerReservation:
+    """Admission of a request that fans out into several jobs of one session.
+
+    acquire() admits the request as a whole (or raises SchedulerOverloaded);
+    until release(), the session's jobs skip admission control. release() may
+    be called more than once, so every exit path can call it.
+    """
+
+    def __init__(self, scheduler, session, jobs, priority):
+        self.scheduler = scheduler
+        self.session = session
+        self.jobs = jobs
+        self.priority = priority
+        self.held = False
+
+    def acquire(self):
+        scheduler = self.scheduler
+        with scheduler.cond:
+            scheduler._ensure_started()
+            scheduler._admit(self.session, self.priority)
+            scheduler.reserved[self.session] = scheduler.reserved.get(self.session, 0) + self.jobs
+            self.held = True
+        return self
+
+    def release(self):
+        scheduler = self.scheduler
+        with scheduler.cond:
+            if not self.held:
+                return
+            self.held = False
+            scheduler.reserved[self.session] -= self.jobs
+            if not scheduler.reserved[self.session]:
+                del scheduler.reserved[self.session]
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+class OCRScheduler:
+    """Process-wide OCR scheduler with a fixed pool of worker threads.
+
+    Interactive jobs (/scan) are always served before live frames, and jobs of
+    each priority are taken round-robin across sessions. Each session may have
+    at most OCR_MAX_INFLIGHT_PER_SESSION jobs queued or running, and once
+    OCR_QUEUE_LIMIT jobs are waiting new ones are rejected instead of queued,
+    except that an interactive job first preempts a waiting live frame.
+    A request that fans out (multi-card scans) reserves its jobs up front so it
+    is admitted or rejected as a whole.
+    """
+
+    PRIORITIES = ('interactive', 'live')
+
+    def __init__(self, workers=OCR_POOL_SIZE, queue_limit=OCR_QUEUE_LIMIT,
+                 max_inflight_per_session=OCR_MAX_INFLIGHT_PER_SESSION):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.max_inflight_per_session = max_inflight_per_session
+        self.cond = threading.Condition()
+        self.job_seconds = 0.5  # moving average, used for Retry-After hints
+        self._pid = None
+
+    def _ensure_started(self):
+        # Called with self.cond held; worker threads do not survive a fork
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self.queues = {priority: FairQueue() for priority in self.PRIORITIES}
+        self.inflight = {}
+        self.reserved = {}
+        for _ in range(self.workers):
+            threading.Thread(target=self._worker_loop, daemon=True).start()
+
+    @property
+    def queued(self):
+        return sum(q.size for q in self.queues.values())
+
+    def _retry_after(self):
+        return max(1, int(math.ceil(self.queued * self.job_seconds / self.workers)))
+
+    def _preempt_below(self, priority):
+        # Called with self.cond held; fails the next waiting job of the lowest
+        # priority below `priority` to make room, and returns whether one was found
+        for lower in reversed(self.PRIORITIES[self.PRIORITIES.index(priority) + 1:]):
+            if self.queues[lower].size:
+                future, _, _, session, _, _ = self.queues[lower].pop()
+                OCR_QUEUE_DEPTH.labels(priority=lower).dec()
+                OCR_SCHEDULER_REJECTED.labels(priority=lower, reason='preempted').inc()
+                self.inflight[session] -= 1
+                if not self.inflight[session]:
+                    del self.inflight[session]
+                future.set_exception(SchedulerOverloaded('preempted', self._retry_after()))
+                return True
+        return False
+
+    def _admit(self, session, priority):
+        # Called with self.cond held
+        reason = None
+        if session is not None and self.inflight.get(session, 0) >= self.max_inflight_per_session:
+            reason = 'session_limit'
+        elif self.queued >= self.queue_limit and not self._preempt_below(priority):
+            reason = 'queue_full'
+        if reason:
+            OCR_SCHEDULER_REJECTED.labels(priority=priority, reason=reason).inc()
+            raise SchedulerOverloaded(reason, self._retry_after())
+
+    def reserve(self, session, jobs, priority='interactive'):
+        """A reservation admitting `jobs` concurrent jobs for a session as one request.
+
+        Use it as a context manager, or call acquire() and release() when the
+        jobs outlive the calling frame (streamed responses).
+        """
+        return SchedulerReservation(self, session, jobs, priority)
+
+    def submit(self, fn, session=None, priority='interactive'):
+        """Queue fn(engine) and return a Future, or raise SchedulerOverloaded"""
+        future = Future()
+        with self.cond:
+            self._ensure_started()
+            if not self.reserved.get(session):
+                self._admit(session, priority)
+
+            self.inflight[session] = self.inflight.get(session, 0) + 1
+            job = (future, fn, contextvars.copy_context(), session, priority, time.time())
+            self.queues[priority].push(session, job)
+            OCR_QUEUE_DEPTH.labels(priority=priority).inc()
+            self.cond.notify()
+        return future
+
+    def run(self, fn, session=None, priority='interactive'):
+        """Submit fn(engine) and wait for its result"""
+        return self.submit(fn, session=session, priority=priority).result()
+
+    def _next_job(self):
+        with self.cond:
+            while not self.queued:
+                self.cond.wait()
+            for priority in self.PRIORITIES:
+                if self.queues[priority].size:
+                    OCR_QUEUE_DEPTH.labels(priority=priority).dec()
+                    return self.queues[priority].pop()
+
+    def _worker_loop(self):
+        while True:
+            future, fn, context, session, priority, queued_at = self._next_job()
+            started = time.time()
+            OCR_QUEUE_WAIT.labels(priority=priority).observe(started - queued_at)
+            try:
+                if future.set_running_or_notify_cancel():
+                    with ocr_pool.checkout() as engine:
+                        future.set_result(context.run(fn, engine))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self.cond:
+                    self.job_seconds = 0.9 * self.job_seconds + 0.1 * (time.time() - started)
+                    self.inflight[session] -= 1
+                    if not self.inflight[session]:
+                        del self.inflight[session]
+
+ocr_scheduler = OCRScheduler()
+
+def _reset_ocr_after_fork():
+    # Locks may have been held by threads that do not exist in the child
+    ocr_pool._lock = threading.Lock()
+    ocr_scheduler.cond = threading.Condition()
+    ocr_scheduler._pid = None
+
+os.register_at_fork(after_in_child=_reset_ocr_after_fork)
+
+def perceptual_hash(image):
+    """DCT perceptual hash of a grayscale image, as a hex string.
+
+    The image is resized to 128px wide keeping its rough aspect ratio, so wide
+    name-line crops keep enough horizontal detail to tell names apart.
+    """
+    height, width = image.shape[:2]
+    hash_height = int(min(128, max(16, round(128.0 * height / max(width, 1) / 8) * 8)))
+    small = cv2.resize(image, (128, hash_height), interpolation=cv2.INTER_AREA)
+    dct = cv2.dct(np.float32(small))
+    low = dct[:hash_height // 4, :32].ravel()
+    bits = low > np.median(low[1:])
+    return np.packbits(bits).tobytes().hex()
+
+class ScanResultCache:
+    """OCR result cache keyed by perceptual hash of the card region image.
+
+    A bounded in-process LRU with TTL sits in front of an optional Redis tier
+    shared by all workers. An exact local miss falls back to the closest local
+    entry whose hash differs in at most SCAN_CACHE_MATCH_DISTANCE of its bits,
+    so re-shots of the same card hit; the Redis tier matches exactly.
+    """
+
+    def __init__(self, max_entries=SCAN_CACHE_SIZE, ttl=SCAN_CACHE_TTL, redis_url=None,
+                 match_distance=SCAN_CACHE_MATCH_DISTANCE):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.match_distance = match_distance
+        self.entries = OrderedDict()
+        self.buckets = {}  # hash band -> keys, for near-duplicate lookups
+        self.lock = threading.Lock()
+        self.redis = None
+        if redis_url:
+            self.redis = redis.Redis.from_url(redis_url, socket_timeout=0.1, socket_connect_timeout=0.1)
+
+    def get(self, key):
+        if scan_cache_bypass.get():
+            return None
+        now = time.time()
         with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self.entries.move_to_end(key)
+                    SCAN_CACHE_EVENTS.labels(tier='local', event='hit').inc()
+                    return value
+                self._remove_local(key)
+                SCAN_CACHE_EVENTS.labels(tier='local', event='expired').inc()
+            near = self._nearest(key, now)
+            if near is not None:
+                self.entries.move_to_end(near)
+                SCAN_CACHE_EVENTS.labels(tier='local', event='near_hit').inc()
+                return self.entries[near][0]
+        SCAN_CACHE_EVENTS.labels(tier='local', event='miss').inc()
+
+        if self.redis is None:
+            return None
+        try:
+            raw = self.redis.get(f'scan_cache:{key}')
+        except redis.RedisError as e:
+            logger.warn("scan_cache_redis_error", error=str(e))
+            SCAN_CACHE_EVENTS.labels(tier='redis', event='error').inc()
+            return None
+        if raw is None:
+            SCAN_CACHE_EVENTS.labels(tier='redis', event='miss').inc()
+            return None
+        SCAN_CACHE_EVENTS.labels(tier='redis', event='hit').inc()
+        value = json.loads(raw)
+        self._store_local(key, value)
+        return value
+
+    def set(self, key, value):
+        if scan_cache_bypass.get():
+            return
+        self._store_local(key, value)
+        if self.redis is None:
+            return
+        try:
+            self.redis.setex(f'scan_cache:{key}', self.ttl, json.dumps(value))
+        except redis.RedisError as e:
+            logger.warn("scan_cache_redis_error", error=str(e))
+            SCAN_CACHE_EVENTS.labels(tier='redis', event='error').inc()
+
+    def _bands(self, key):
+        """Split a key's hash into one more band than the allowed distance.
+
+        By pigeonhole, any hash within that distance equals it in at least one
+        band, so only keys sharing a band need their distance computed.
+        """
+        prefix, _, digest = key.rpartition(':')
+        bits = len(digest) * 4
+        distance = int(bits * self.match_distance)
+        value = int(digest, 16)
+        if not distance:
+            return value, 0, []
+        bounds = [bits * i // (distance + 1) for i in range(distance + 2)]
+        bands = [
+            (prefix, bits, i, (value >> low) & ((1 << (high - low)) - 1))
+            for i, (low, high) in enumerate(zip(bounds, bounds[1:]))
+        ]
+        return value, distance, bands
+
+    def _nearest(self, key, now):
+        # Called with self.lock held
+        value, distance, bands = self._bands(key)
+        best, best_distance = None, distance + 1
+        for band in bands:
+            for candidate in self.buckets.get(band, ()):
+                if self.entries[candidate][1] <= now:
+                    continue
+                candidate_distance = (value ^ int(candidate.rpartition(':')[2], 16)).bit_count()
+                if candidate_distance < best_distance:
+                    best, best_distance = candidate, candidate_distance
+        return best
+
+    def _remove_local(self, key):
+        # Called with self.lock held
+        del self.entries[key]
+        for band in self._bands(key)[2]:
+            keys = self.buckets[band]
+            keys.discard(key)
+            if not keys:
+                del self.buckets[band]
+
+    def _store_local(self, key, value):
+        with self.lock:
+            if key not in self.entries:
+                for band in self._bands(key)[2]:
+                    self.buckets.setdefault(band, set()).add(key)
+            self.entries[key] = (value, time.time() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self._remove_local(next(iter(self.entries)))
+                SCAN_CACHE_EVENTS.labels(tier='local', event='eviction').inc()
+
+scan_cache = ScanResultCache(redis_url=REDIS_URL if SCAN_CACHE_REDIS else None)
+
+def scan_cache_key(image, config):
+    """Cache key for OCR of an image crop under the given region/OCR config"""
+    return f'{OCR_LANGUAGE}:{config}:{perceptual_hash(image)}'
+
+def order_quad_points(points):
+    """Order four corner points as top-left, top-right, bottom-right, bottom-left"""
+    points = points.reshape(4, 2).astype(np.float32)
+    sums = points.sum(axis=1)
+    diffs = np.diff(points, axis=1).ravel()
+    return np.array([
+        points[np.argmin(sums)],
+        points[np.argmin(diffs)],
+        points[np.argmax(sums)],
+        points[np.argmax(diffs)]
+    ], dtype=np.float32)
+
+def card_outline(contour):
+    """The four corners of a rectangular contour, or None.
+
+    Contours whose polygon approximation is not a convex quadrilateral (rounded
+    or blurred corners, a neighbouring edge touching the border) fall back to
+    their minimum-area rectangle when their hull fills at least CARD_RECT_FILL of it.
+    """
+    approx = cv2.approxPolyDP(contour, 0.02 * cv2.arcLength(contour, True), True)
+    if len(approx) == 4 and cv2.isContourConvex(approx):
+        return approx.reshape(4, 2).astype(np.float32)
+    rect = cv2.minAreaRect(contour)
+    rect_area = rect[1][0] * rect[1][1]
+    if not rect_area or cv2.contourArea(cv2.convexHull(contour)) < CARD_RECT_FILL * rect_area:
+        return None
+    return cv2.boxPoints(rect).astype(np.float32)
+
+@scan_stage('preprocess')
+def find_card_quads(gray, max_cards=1):
+    """Find card-shaped quadrilaterals in a grayscale image, largest first"""
+    height, width = gray.shape[:2]
+    scale = min(1.0, CARD_DETECTION_MAX_SIDE / float(max(height, width)))
+    small = gray
+    if scale < 1.0:
+        small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+    # Edges of the card border against the background, closed into contours
+    blurred = cv2.GaussianBlur(small, (5, 5), 0)
+    edges = cv2.Canny(blurred, 50, 150)
+    edges = cv2.dilate(edges, None, iterations=1)
+    # One card is the outermost outline; several may sit inside a binder page or mat
+    retrieval = cv2.RETR_EXTERNAL if max_cards == 1 else cv2.RETR_LIST
+    contours, _ = cv2.findContours(edges, retrieval, cv2.CHAIN_APPROX_SIMPLE)
+
+    min_area = CARD_MIN_AREA_RATIO * small.shape[0] * small.shape[1] / max_cards
+    # Sized by their hull: an outline broken by glare or blur encloses little area itself
+    hulls = [(cv2.contourArea(cv2.convexHull(contour)), contour) for contour in contours]
+    quads = []
+    for area, contour in sorted(hulls, key=lambda hull: hull[0], reverse=True):
+        if area < min_area:
+            break
+        quad = card_outline(contour)
+        if quad is None:
+            continue
+
+        # Reject shapes that are clearly not card proportioned in either orientation
+        _, (rect_w, rect_h), _ = cv2.minAreaRect(quad)
+        if min(rect_w, rect_h) == 0:
+            continue
+        aspect = min(rect_w, rect_h) / max(rect_w, rect_h)
+        if not 0.55 <= aspect <= 0.9:
+            continue
+
+        quads.append(quad)
+        if max_cards == 1:
+            break
+
+    if max_cards > 1:
+        quads = select_card_outlines(quads)[:max_cards]
+    return [order_quad_points(quad / scale) for quad in quads]
+
+def quad_contains(outer, point):
+    return cv2.pointPolygonTest(outer, (float(point[0]), float(point[1])), False) > 0
+
+def select_card_outlines(candidates):
+    """Pick one outline per card from card-shaped candidates sorted largest first.
+
+    An outline around three or more similar sized, separate outlines is a
+    binder page or pocket sheet rather than a card (a card holds at most an art
+    and a text box). Outlines centred inside an already chosen card (inner
+    borders, art and text boxes) are dropped.
+    """
+    areas = [cv2.contourArea(quad) for quad in candidates]
+    centers = [quad.mean(axis=0) for quad in candidates]
+
+    def is_container(i):
+        children = [
+            j for j in range(len(candidates))
+            if j != i and areas[j] < 0.5 * areas[i] and quad_contains(candidates[i], centers[j])
+        ]
+        # Keep only the outermost outline of each child
+        children = [
+            j for j in children
+            if not any(k != j and areas[k] > areas[j] and quad_contains(candidates[k], centers[j]) for k in children)
+        ]
+        similar = [j for j in children if areas[j] >= 0.7 * max(areas[k] for k in children)]
+        return len(similar) >= 3
+
+    selected = []
+    for i, quad in enumerate(candidates):
+        if any(quad_contains(candidates[s], centers[i]) for s in selected):
+            continue
+        if is_container(i):
+            continue
+        selected.append(i)
+    return [candidates[i] for i in selected]
+
+def sort_reading_order(quads):
+    """Order card quads in rows top to bottom, left to right within a row"""
+    if not quads:
+        return quads
+    centers = [quad.mean(axis=0) for quad in quads]
+    heights = [np.linalg.norm(quad[3] - quad[0]) for quad in quads]
+    row_height = 0.5 * float(np.median(heights))
+    rows = []
+    for index in sorted(range(len(quads)), key=lambda i: centers[i][1]):
+        if rows and centers[index][1] - centers[rows[-1][0]][1] < row_height:
+            rows[-1].append(index)
+        else:
+            rows.append([index])
+    return [quads[i] for row in rows for i in sorted(row, key=lambda i: centers[i][0])]
+
+def card_warp_matrix(quad):
+    """Perspective transform from a card quadrilateral to the canonical portrait frame"""
+    top_left, top_right, bottom_right, bottom_left = quad
+    width = np.linalg.norm(top_right - top_left)
+    height = np.linalg.norm(bottom_left - top_left)
+    if width > height:
+        # Card is lying sideways; rotate the corner order to get a portrait warp
+        quad = np.array([bottom_left, top_left, top_right, bottom_right], dtype=np.float32)
+
+    target = np.array([
+        [0, 0],
+        [CARD_WIDTH - 1, 0],
+        [CARD_WIDTH - 1, CARD_HEIGHT - 1],
+        [0, CARD_HEIGHT - 1]
+    ], dtype=np.float32)
+    return cv2.getPerspectiveTransform(quad, target)
+
+@scan_stage('preprocess')
+def warp_card(gray, quad):
+    """Warp a card quadrilateral to the canonical portrait size"""
+    return cv2.warpPerspective(gray, card_warp_matrix(quad), (CARD_WIDTH, CARD_HEIGHT))
+
+@scan_stage('preprocess')
+def warp_card_region(gray, quad, region, scale):
+    """Warp only one card region, at `scale` times the canonical resolution"""
+    x0, y0, x1, y1 = CARD_REGIONS[region]
+    # Scale the canonical frame and shift the region's corner to the origin
+    shift = np.array([
+        [scale, 0, -x0 * CARD_WIDTH * scale],
+        [0, scale, -y0 * CARD_HEIGHT * scale],
+        [0, 0, 1]
+    ])
+    size = (int((x1 - x0) * CARD_WIDTH * scale), int((y1 - y0) * CARD_HEIGHT * scale))
+    return cv2.warpPerspective(gray, shift @ card_warp_matrix(quad), size, flags=cv2.INTER_CUBIC)
+
+def crop_card_regions(card, regions=None):
+    """Crop the named regions out of a canonical card image"""
+    crops = {}
+    for region in regions or OCR_REGIONS:
+        x0, y0, x1, y1 = CARD_REGIONS[region]
+        crops[region] = card[
+            int(y0 * CARD_HEIGHT):int(y1 * CARD_HEIGHT),
+            int(x0 * CARD_WIDTH):int(x1 * CARD_WIDTH)
+        ]
+    return crops
+
+def shrink_to(image, max_side):
+    """Downscale an image so its longer side is at most max_side"""
+    height, width = image.shape[:2]
+    scale = max_side / max(height, width)
+    if scale >= 1:
+        return image
+    return cv2.resize(image, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+
+def otsu_binarize(image):
+    _, binary = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return binary
+
+def adaptive_binarize(image):
+    return cv2.adaptiveThreshold(image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 15)
+
+def upscale(image, factor=2):
+    return cv2.resize(image, None, fx=factor, fy=factor, interpolation=cv2.INTER_CUBIC)
+
+def deskew(image, max_angle=15.0):
+    """Rotate a text crop so its dominant text line is horizontal"""
+    ink = cv2.findNonZero(255 - otsu_binarize(image))
+    if ink is None or len(ink) < 10:
+        return image
+    (_, _), (width, height), angle = cv2.minAreaRect(ink)
+    # Angle of the long side in (-90, 90], whichever convention OpenCV uses
+    if width < height:
+        angle += 90
+    angle = (angle + 90) % 180 - 90
+    if abs(angle) < 0.5 or abs(angle) > max_angle:
+        return image
+    rows, cols = image.shape[:2]
+    matrix = cv2.getRotationMatrix2D((cols / 2, rows / 2), angle, 1.0)
+    return cv2.warpAffine(image, matrix, (cols, rows), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
+
+def clahe_binarize(image):
+    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+    return otsu_binarize(clahe.apply(upscale(image)))
+
+# Preprocessing passes in cascade order, from cheapest to most expensive
+OCR_PASS_FUNCTIONS = {
+    'otsu': lambda crop: otsu_binarize(shrink_to(crop, CARD_DETECTION_MAX_SIDE)),
+    'adaptive': adaptive_binarize,
+    'clahe': clahe_binarize,
+    'deskew': lambda crop: adaptive_binarize(upscale(deskew(crop))),
+}
+
+def run_ocr_cascade(engine, crop, psm):
+    """OCR a crop with each configured pass until one is confident enough.
+
+    Returns text, confidence and pass name of the first accepted pass, or of
+    the most confident pass when none reaches OCR_MIN_CONFIDENCE.
+    """
+    best = None
+    for index, name in enumerate(OCR_PASSES):
+        with scan_stage('preprocess'):
+            prepared = OCR_PASS_FUNCTIONS[name](crop)
+        with scan_stage('ocr'):
+            text, confidence = engine.image_to_data(prepared, psm=psm)
+        outcome = {'text': text.strip(), 'confidence': round(confidence, 1), 'pass': name}
+        if best is None or outcome['confidence'] > best['confidence']:
+            best = outcome
+        if outcome['text'] and confidence >= OCR_MIN_CONFIDENCE:
+            OCR_PASS_OUTCOMES.labels(ocr_pass=name, outcome='accepted').inc()
+            return outcome
+        last = index == len(OCR_PASSES) - 1
+        OCR_PASS_OUTCOMES.labels(ocr_pass=name, outcome='exhausted' if last else 'escalated').inc()
+    return best
+
+def read_collector_strip(engine, strip):
+    """OCR the collector number and set code lines of a collector strip"""
+    half = strip.shape[0] // 2
+    lines = []
+    confidences = []
+    for line in (strip[:half], strip[half:]):
+        with scan_stage('preprocess'):
+            binary = otsu_binarize(line)
+            if np.mean(binary) < 127:
+                # Light text on a black border
+                binary = 255 - binary
+        with scan_stage('ocr'):
+            text, confidence = engine.image_to_data(binary, psm=7, whitelist=COLLECTOR_WHITELIST)
+        lines.append(text.strip())
+        confidences.append(confidence)
+    return {'text': '\n'.join(lines), 'confidence': round(min(confidences), 1), 'pass': 'collector'}
+
+def parse_collector_strip(text):
+    """Extract (set code, collector number) from collector strip text, or None.
+
+    The first line holds the collector number (e.g. "0123/280 R" or "R 0123"),
+    the second the set code and language (e.g. "MKM • EN").
+    """
+    lines = [line for line in (text or '').splitlines() if line.strip()]
+    if len(lines) < 2:
+        return None
+    number = re.search(r'\d{1,4}', lines[0])
+    set_code = re.search(r'\b[A-Z0-9]{3,5}\b', lines[1].upper())
+    if number is None or set_code is None:
+        return None
+    return set_code.group(0).lower(), number.group(0).lstrip('0') or '0'
+
+def recognize_collector_strip(gray, quad, session=None, priority='interactive'):
+    """Warp and OCR the collector strip of a detected card, using the result cache"""
+    strip = warp_card_region(gray, quad, 'collector', COLLECTOR_STRIP_SCALE)
+    key = scan_cache_key(strip, f'collector:psm7:x{COLLECTOR_STRIP_SCALE:g}')
+    outcome = scan_cache.get(key)
+    if outcome is None:
+        outcome = ocr_scheduler.run(
+            lambda engine: read_collector_strip(engine, strip),
+            session=session,
+            priority=priority
+        )
+        scan_cache.set(key, outcome)
+    return outcome
+
+def recognize_card(gray, quad, session=None, priority='interactive', mode=CARD_IDENTIFY_MODE):
+    """Identify the card outlined by quad, or OCR the whole image when quad is None.
+
+    In 'visual' mode (or first, with VISUAL_FIRST_PASS) the card is matched
+    against the reference image index and a confident match skips OCR. In
+    'collector' mode the collector strip is read first and name OCR only runs
+    when it does not resolve to a known printing. The primary region (the name
+    line, or the whole image) goes through the preprocessing cascade and the
+    pass it settles on is reused for the other regions. OCR runs on the shared
+    scheduler under the given session key and priority. Returns a dict of region
+    name to recognized text, the winning pass with its confidence, and the
+    resolved catalog card or None.
+    """
+    if quad is not None and (mode == 'visual' or VISUAL_FIRST_PASS):
+        visual_index = get_visual_index()
+        if visual_index is not None:
+            match, score = visual_index.match(warp_card(gray, quad))
+            ocr = {'pass': 'visual', 'confidence': round(score * 100, 1)}
+            if match is not None or mode == 'visual':
+                return {}, ocr, match
+    if mode == 'visual':
+        return {}, {'pass': 'visual', 'confidence': 0.0}, None
+
+    collector = None
+    if mode == 'collector' and quad is not None:
+        index = get_card_index()
+        if index is not None and index.has_printings:
+            collector = recognize_collector_strip(gray, quad, session=session, priority=priority)
+            printing = parse_collector_strip(collector['text'])
+            if printing is not None and index.lookup_printing(*printing) is not None:
+                ocr = {'pass': 'collector', 'confidence': collector['confidence']}
+                regions = {'collector': collector['text']}
+                return regions, ocr, resolve_card(regions)
+
+    card = warp_card(gray, quad) if quad is not None else None
+    if card is None:
+        crops = {'full': gray}
+    else:
+        crops = crop_card_regions(card)
+    primary = 'name' if 'name' in crops else next(iter(crops))
+
+    def region_key(region, config):
+        return scan_cache_key(crops[region], f'{region}:psm{REGION_PSM[region]}:{config}')
+
+    results = {}
+    primary_result = scan_cache.get(region_key(primary, 'cascade'))
+    if primary_result is not None:
+        results[primary] = primary_result
+        for region in crops:
+            if region != primary:
+                cached = scan_cache.get(region_key(region, primary_result['pass']))
+                if cached is not None:
+                    results[region] = cached
+
+    def ocr_pending(engine):
+        recognized = {}
+        outcome = results.get(primary)
+        if outcome is None:
+            outcome = recognized[primary] = run_ocr_cascade(engine, crops[primary], REGION_PSM[primary])
+        preprocess = OCR_PASS_FUNCTIONS[outcome['pass']]
+        for region, crop in crops.items():
+            if region in results or region in recognized:
+                continue
+            text, confidence = engine.image_to_data(preprocess(crop), psm=REGION_PSM[region])
+            recognized[region] = {'text': text.strip(), 'confidence': round(confidence, 1), 'pass': outcome['pass']}
+        return recognized
+
+    # Only schedule OCR when something actually missed the cache
+    if len(results) < len(crops):
+        recognized = ocr_scheduler.run(ocr_pending, session=session, priority=priority)
+        winning_pass = (results.get(primary) or recognized[primary])['pass']
+        for region, outcome in recognized.items():
+            scan_cache.set(region_key(region, 'cascade' if region == primary else winning_pass), outcome)
+        results.update(recognized)
+
+    ocr = {'pass': results[primary]['pass'], 'confidence': results[primary]['confidence']}
+    regions = {region: results[region]['text'] for region in crops}
+    if collector is not None:
+        # Keep the unresolved strip text for diagnostics
+        regions.setdefault('collector', collector['text'])
+    card = resolve_card(regions) if any(text.strip() for text in regions.values()) else None
+    return regions, ocr, card
+
+def recognize_card_regions(gray, session=None, priority='interactive', mode=CARD_IDENTIFY_MODE):
+    """Localize the most prominent card and OCR only its configured regions.
+
+    Falls back to OCR of the whole image when no card outline is found.
+    Returns a dict of region name to recognized text, whether a card was
+    detected, the winning pass with its confidence, and the resolved card.
+    """
+    quads = find_card_quads(gray)
+    quad = quads[0] if quads else None
+    regions, ocr, card = recognize_card(gray, quad, session=session, priority=priority, mode=mode)
+    return regions, quad is not None, ocr, card
+
+_card_executor = None
+_card_executor_pid = None
+_card_executor_lock = threading.Lock()
+
+def get_card_executor():
+    """Threads that drive per-card recognition for multi-card scans, created lazily in each worker process"""
+    global _card_executor, _card_executor_pid
+    with _card_executor_lock:
+        if _card_executor is None or _card_executor_pid != os.getpid():
+            _card_executor = ThreadPoolExecutor(
+                max_workers=max(SCAN_MULTI_MAX_CARDS, OCR_POOL_SIZE * 2),
+                thread_name_prefix='card'
+            )
+            _card_executor_pid = os.getpid()
+        return _card_executor
+
+def recognize_cards(gray, session=None, priority='interactive', mode=CARD_IDENTIFY_MODE):
+    """Detect every card in the image and recognize them concurrently.
+
+    Returns (quad, regions, ocr, card) per card in reading order. The fan-out is
+    admitted by the OCR scheduler as a single request.
+    """
+    quads = sort_reading_order(find_card_quads(gray, max_cards=SCAN_MULTI_MAX_CARDS))
+    if not quads:
+        return []
+    with ocr_scheduler.reserve(session, len(quads), priority=priority):
+        executor = get_card_executor()
+        futures = [
+            submit_in_context(executor, recognize_card, gray, quad, session=session, priority=priority, mode=mode)
+            for quad in quads
+        ]
+        return [(quad,) + future.result() for quad, future in zip(quads, futures)]
+
+def regions_to_text(regions):
+    return '\n'.join(text for text in regions.values() if text)
+
+def normalize_card_name(text):
+    """Lowercase, strip accents and punctuation, and collapse whitespace"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char)).lower().replace('æ', 'ae')
+    text = ''.join(char if char.isascii() and char.isalnum() else ' ' for char in text)
+    return ' '.join(text.split())
+
+def printing_key_hash(key):
+    """Stable 64-bit hash of a "set:collector_number" printing key"""
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+def name_trigrams(normalized):
+    """Encode the padded trigrams of a normalized name as sorted unique integers"""
+    padded = f'  {normalized} '.encode('ascii')
+    if len(padded) < 4:
+        return np.empty(0, dtype=np.uint32)
+    codes = np.frombuffer(padded, dtype=np.uint8).astype(np.uint32)
+    return np.unique((codes[:-2] << 16) | (codes[1:-1] << 8) | codes[2:])
+
+class CardNameIndex:
+    """Trigram index over card names stored as memory-mapped NumPy arrays.
+
+    The index is built once from a Scryfall bulk-data file and opened with
+    mmap_mode='r', so every gunicorn worker on a host shares the same pages.
+    """
+
+    ARRAYS = ('keys', 'names', 'ids', 'gram_counts', 'gram_keys', 'gram_offsets', 'postings')
+    # Exact (set code, collector number) table: sorted 64-bit key hashes with the
+    # printing key, id and name row at the same position
+    PRINTING_ARRAYS = ('printing_hashes', 'printing_keys', 'printing_ids', 'printing_rows')
+
+    def __init__(self, index_dir):
+        self.index_dir = index_dir
+        # np.asarray drops the memmap subclass (and its per-operation overhead)
+        # while still reading from the shared mapping
+        arrays = {
+            name: np.asarray(np.load(os.path.join(index_dir, f'{name}.npy'), mmap_mode='r'))
+            for name in self.ARRAYS
+        }
+        self.keys = arrays['keys']
+        self.names = arrays['names']
+        self.ids = arrays['ids']
+        self.gram_counts = arrays['gram_counts']
+        self.gram_keys = arrays['gram_keys']
+        self.gram_offsets = arrays['gram_offsets']
+        self.postings = arrays['postings']
+
+        # Indexes built before the printings table existed simply have none
+        for name in self.PRINTING_ARRAYS:
+            path = os.path.join(index_dir, f'{name}.npy')
+            array = np.asarray(np.load(path, mmap_mode='r')) if os.path.exists(path) else np.empty(0)
+            setattr(self, name, array)
+
+    @property
+    def has_printings(self):
+        return len(self.printing_hashes) > 0
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def build(cls, catalog_path, index_dir):
+        """Build the index files for a Scryfall bulk-data JSON file"""
+        with open(catalog_path, 'rb') as f:
+            cards = json.load(f)
+
+        # One entry per searchable name; double-faced cards are also searchable by face
+        entries = {}
+        printings = {}
+        for card in cards:
+            name = card.get('name')
+            if not name or not card.get('id'):
+                continue
+            face_names = [face.get('name') for face in card.get('card_faces') or []]
+            # Names made only of punctuation (Unhinged's "_____") normalize to nothing and are not searchable
+            searchable_keys = [key for key in map(normalize_card_name, [name] + face_names) if key]
+            for key in searchable_keys:
+                if key not in entries:
+                    entries[key] = (name, card['id'])
+            if searchable_keys and card.get('set') and card.get('collector_number'):
+                printing_key = f"{card['set']}:{card['collector_number']}".lower()
+                printings.setdefault(printing_key, (card['id'], searchable_keys[0]))
+
+        keys = sorted(entries)
+        rows = {key: row for row, key in enumerate(keys)}
+        printing_order = sorted(printings, key=printing_key_hash)
+        postings = {}
+        gram_counts = np.zeros(len(keys), dtype=np.uint16)
+        for row, key in enumerate(keys):
+            grams = name_trigrams(key)
+            gram_counts[row] = len(grams)
+            for gram in grams.tolist():
+                postings.setdefault(gram, []).append(row)
+
+        gram_keys = np.array(sorted(postings), dtype=np.uint32)
+        lengths = np.array([len(postings[gram]) for gram in gram_keys.tolist()], dtype=np.uint32)
+        gram_offsets = np.zeros(len(gram_keys) + 1, dtype=np.uint32)
+        np.cumsum(lengths, out=gram_offsets[1:])
+        flat_postings = np.fromiter(
+            (row for gram in gram_keys.tolist() for row in postings[gram]),
+            dtype=np.uint32,
+            count=int(gram_offsets[-1])
+        )
+
+        # Write into a scratch directory and rename so readers never see a partial index
+        tmp_dir = f'{index_dir}.tmp{os.getpid()}'
+        os.makedirs(tmp_dir, exist_ok=True)
+        arrays = {
+            'keys': np.array([key.encode('ascii') for key in keys], dtype=np.bytes_),
+            'names': np.array([entries[key][0].encode('utf-8') for key in keys], dtype=np.bytes_),
+            'ids': np.array([entries[key][1].encode('ascii') for key in keys], dtype=np.bytes_),
+            'gram_counts': gram_counts,
+            'gram_keys': gram_keys,
+            'gram_offsets': gram_offsets,
+            'postings': flat_postings,
+            'printing_hashes': np.array([printing_key_hash(key) for key in printing_order], dtype=np.uint64),
+            'printing_keys': np.array([key.encode('utf-8') for key in printing_order], dtype=np.bytes_),
+            'printing_ids': np.array([printings[key][0].encode('ascii') for key in printing_order], dtype=np.bytes_),
+            'printing_rows': np.array([rows[printings[key][1]] for key in printing_order], dtype=np.uint32),
+        }
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_dir, f'{name}.npy'), array)
+        try:
+            os.rename(tmp_dir, index_dir)
+        except OSError:
+            # Another worker finished the same build first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return cls(index_dir)
+
+    def lookup(self, text, limit=1, shortlist=4):
+        """Return up to `limit` (id, name, score) matches for OCR text, best first.
+
+        Candidates are shortlisted by trigram Dice overlap and scored by edit similarity.
+        """
+        query = normalize_card_name(text)
+        grams = name_trigrams(query)
+        if not len(grams) or not len(self.gram_keys):
+            return []
+
+        positions = np.searchsorted(self.gram_keys, grams)
+        positions = np.minimum(positions, len(self.gram_keys) - 1)
+        positions = positions[self.gram_keys[positions] == grams]
+        if not len(positions):
+            return []
+
+        hits = np.concatenate([
+            self.postings[self.gram_offsets[pos]:self.gram_offsets[pos + 1]] for pos in positions
+        ])
+        rows, common = np.unique(hits, return_counts=True)
+        dice = 2.0 * common / (len(grams) + self.gram_counts[rows])
+        count = min(shortlist, len(rows))
+        candidates = rows[np.argpartition(dice, -count)[-count:]]
+
+        matches = []
+        for row in candidates.tolist():
+            score = difflib.SequenceMatcher(None, query, self.keys[row].decode('ascii')).ratio()
+            matches.append((
+                self.ids[row].decode('ascii'),
+                self.names[row].decode('utf-8'),
+                round(score, 3)
+            ))
+        matches.sort(key=lambda match: match[2], reverse=True)
+        return matches[:limit]
+
+    def lookup_printing(self, set_code, collector_number):
+        """Return (id, name) of the exact printing, or None"""
+        key = f'{set_code}:{collector_number}'.lower()
+        digest = np.uint64(printing_key_hash(key))
+        pos = int(np.searchsorted(self.printing_hashes, digest))
+        if pos >= len(self.printing_hashes) or self.printing_hashes[pos] != digest:
+            return None
+        if self.printing_keys[pos].decode('utf-8') != key:
+            return None
+        return self.printing_ids[pos].decode('ascii'), self.names[self.printing_rows[pos]].decode('utf-8')
+
+_card_index = None
+_card_index_lock = threading.Lock()
+
+def card_index_dir():
+    """Index location for the configured catalog; keyed on its mtime so edits trigger a rebuild"""
+    if CARD_INDEX_DIR:
+        return CARD_INDEX_DIR
+    return f'{CARD_CATALOG_PATH}.{int(os.path.getmtime(CARD_CATALOG_PATH))}.index'
+
+def get_card_index():
+    """Load (building if needed) the card name index, or None when no catalog is configured"""
+    global _card_index
+    if _card_index is not None or not (CARD_CATALOG_PATH or CARD_INDEX_DIR):
+        return _card_index
+
+    with _card_index_lock:
+        if _card_index is None:
+            try:
+                index_dir = card_index_dir()
+                if os.path.isdir(index_dir):
+                    _card_index = CardNameIndex(index_dir)
+                else:
+                    start = time.time()
+                    _card_index = CardNameIndex.build(CARD_CATALOG_PATH, index_dir)
+                    logger.info("card_index_built", entries=len(_card_index),
+                                index_dir=index_dir, duration=time.time() - start)
+            except Exception as e:
+                logger.error("card_index_load_error", error=str(e), traceback=traceback.format_exc())
+                SCAN_ERRORS.labels(error_type='card_index').inc()
+                return None
+    return _card_index
+
+def resolve_printing(index, text):
+    """Resolve collector strip text to an exact printing, or None"""
+    printing = parse_collector_strip(text)
+    if printing is None:
+        COLLECTOR_LOOKUPS.labels(result='unreadable').inc()
+        return None
+    match = index.lookup_printing(*printing)
+    if match is None:
+        COLLECTOR_LOOKUPS.labels(result='unmatched').inc()
+        return None
+    COLLECTOR_LOOKUPS.labels(result='matched').inc()
+    set_code, collector_number = printing
+    return {'id': match[0], 'name': match[1], 'score': 1.0, 'set': set_code, 'collectorNumber': collector_number}
+
+@scan_stage('postprocess')
+def resolve_card(regions):
+    """Resolve OCR region text to the best matching catalog card, or None.
+
+    An exact printing from the collector strip wins over fuzzy name matching.
+    """
+    index = get_card_index()
+    if index is None:
+        return None
+
+    if regions.get('collector') and index.has_printings:
+        printing = resolve_printing(index, regions['collector'])
+        if printing is not None:
+            return printing
+        if not (regions.get('name') or regions.get('full')):
+            return None
+
+    # The name region holds a single line; for whole-image OCR try the leading lines
+    text = regions.get('name') or regions.get('full') or ''
+    lines = [line for line in text.splitlines() if line.strip()][:5]
+    best = None
+    for line in lines:
+        for card_id, name, score in index.lookup(line):
+            if best is None or score > best['score']:
+                best = {'id': card_id, 'name': name, 'score': score}
+
+    if best is None or best['score'] < CARD_MATCH_MIN_SCORE:
+        CARD_LOOKUPS.labels(result='unmatched').inc()
+        return None
+    CARD_LOOKUPS.labels(result='matched').inc()
+    return best
+
+# Parts of the canonical card described by the visual embedding: region
+# fractions, the size each is reduced to, and how many low DCT frequencies are kept.
+# Both are inset so a loosely fitted card outline (e.g. the inner frame) still lines up.
+VISUAL_EMBEDDING_PARTS = (
+    ((0.12, 0.15, 0.88, 0.50), (16, 12), 8),  # art box
+    ((0.05, 0.05, 0.95, 0.95), (12, 16), 6),  # card face
+)
+
+def card_embedding(card):
+    """Compact appearance descriptor of a canonical card image, L2-normalized float32.
+
+    Each part is contrast-normalized and reduced to its lowest DCT frequencies
+    (without the DC term), which tolerates blur, exposure and small misalignment.
+    """
+    parts = []
+    for (x0, y0, x1, y1), size, keep in VISUAL_EMBEDDING_PARTS:
+        crop = card[int(y0 * CARD_HEIGHT):int(y1 * CARD_HEIGHT), int(x0 * CARD_WIDTH):int(x1 * CARD_WIDTH)]
+        small = cv2.resize(crop, size, interpolation=cv2.INTER_AREA).astype(np.float32)
+        small = (small - small.mean()) / (small.std() + 1e-6)
+        parts.append(cv2.dct(small)[:keep, :keep].ravel()[1:])
+    vector = np.concatenate(parts)
+    return (vector / (np.linalg.norm(vector) + 1e-6)).astype(np.float32)
+
+def reference_embedding(path):
+    """Embedding of a reference card image file (a scan cropped to the card, as Scryfall serves them)"""
+    gray = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        return None
+    return card_embedding(cv2.resize(gray, (CARD_WIDTH, CARD_HEIGHT), interpolation=cv2.INTER_AREA))
+
+class VisualCardIndex:
+    """Reference card embeddings stored as memory-mapped NumPy arrays.
+
+    Matching is a single matrix-vector product over all references, so it is
+    vectorized and every gunicorn worker shares the same pages.
+    """
+
+    ARRAYS = ('vectors', 'ids', 'names')
+    IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+    def __init__(self, index_dir):
+        self.index_dir = index_dir
+        arrays = {
+            name: np.asarray(np.load(os.path.join(index_dir, f'{name}.npy'), mmap_mode='r'))
+            for name in self.ARRAYS
+        }
+        self.vectors = arrays['vectors']
+        self.ids = arrays['ids']
+        self.names = arrays['names']
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, images_dir, index_dir, names=None):
+        """Embed every reference image in images_dir; files are named after the card id.
+
+        `names` maps card ids to names (e.g. from the card catalog); otherwise the
+        file name is used.
+        """
+        paths = sorted(
+            os.path.join(images_dir, name) for name in os.listdir(images_dir)
+            if name.lower().endswith(cls.IMAGE_EXTENSIONS)
+        )
+        with ProcessPoolExecutor() as pool:
+            vectors = list(pool.map(reference_embedding, paths, chunksize=64))
+
+        rows = [(path, vector) for path, vector in zip(paths, vectors) if vector is not None]
+        ids = [os.path.splitext(os.path.basename(path))[0] for path, _ in rows]
+        arrays = {
+            'vectors': np.stack([vector for _, vector in rows]) if rows else np.empty((0, 0), dtype=np.float32),
+            'ids': np.array([card_id.encode('utf-8') for card_id in ids], dtype=np.bytes_),
+            'names': np.array([(names or {}).get(card_id, card_id).encode('utf-8') for card_id in ids], dtype=np.bytes_),
+        }
+
+        # Write into a scratch directory and rename so readers never see a partial index
+        tmp_dir = f'{index_dir}.tmp{os.getpid()}'
+        os.makedirs(tmp_dir, exist_ok=True)
+        try:
+            for name, array in arrays.items():
+                np.save(os.path.join(tmp_dir, f'{name}.npy'), array)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        try:
+            os.rename(tmp_dir, index_dir)
+        except OSError:
+            # Another worker finished the same build first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return cls(index_dir)
+
+    @scan_stage('postprocess')
+    def match(self, card, candidates=8):
+        """Return (card, score) for a canonical card image; card is None unless the match is confident.
+
+        The card is also tried upside down. A match needs a cosine similarity of
+        VISUAL_MATCH_MIN_SCORE and a margin of VISUAL_MATCH_MIN_MARGIN over the
+        best reference with a different name (reprints share art, so they do not
+        count against each other).
+        """
+        if not len(self.ids):
+            return None, 0.0
+        queries = np.stack([card_embedding(card), card_embedding(cv2.rotate(card, cv2.ROTATE_180))])
+        scores = (self.vectors @ queries.T).max(axis=1)
+        count = min(candidates, len(scores))
+        top = np.argpartition(scores, -count)[-count:]
+        top = top[np.argsort(scores[top])[::-1]]
+
+        best = int(top[0])
+        best_score = float(scores[best])
+        best_name = self.names[best]
+        runner_up = next((float(scores[row]) for row in top[1:] if self.names[row] != best_name), 0.0)
+        if best_score < VISUAL_MATCH_MIN_SCORE or best_score - runner_up < VISUAL_MATCH_MIN_MARGIN:
+            VISUAL_MATCHES.labels(result='unmatched').inc()
+            return None, best_score
+        VISUAL_MATCHES.labels(result='matched').inc()
+        return {
+            'id': self.ids[best].decode('utf-8'),
+            'name': best_name.decode('utf-8'),
+            'score': round(best_score, 3)
+        }, best_score
+
+_visual_index = None
+_visual_index_lock = threading.Lock()
+
+def get_visual_index():
+    """Load the visual reference index, or None when VISUAL_INDEX_DIR is not configured"""
+    global _visual_index
+    if _visual_index is not None or not VISUAL_INDEX_DIR:
+        return _visual_index
+
+    with _visual_index_lock:
+        if _visual_index is None:
+            try:
+                _visual_index = VisualCardIndex(VISUAL_INDEX_DIR)
+            except Exception as e:
+                logger.error("visual_index_load_error", error=str(e), traceback=traceback.format_exc())
+                SCAN_ERRORS.labels(error_type='visual_index').inc()
+                return None
+    return _visual_index
+
+class FrameStabilityGate:
+    """Decide which live frames are worth running OCR on.
+
+    A frame is only passed through once the scene has changed since the last
+    recognized card and has then been still and sharp for a few frames. The
+    analyze thread feeds frames in while the OCR thread reports recognitions,
+    so the state is kept under a lock.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.previous = None
+        self.reference = None  # downscaled frame at the last recognition
+        self.still_frames = 0
+
+    def _downscale(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        height, width = gray.shape[:2]
+        size = (LIVE_GATE_WIDTH, max(1, int(height * LIVE_GATE_WIDTH / float(width))))
+        return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+
+    def _decide(self, frame):
+        small = self._downscale(frame)
+        previous, self.previous = self.previous, small
+        if previous is None or previous.shape != small.shape:
+            self.still_frames = 0
+            return 'motion'
+
+        motion = cv2.absdiff(small, previous).mean()
+        if motion > LIVE_GATE_STILL_THRESHOLD:
+            if motion > LIVE_GATE_CHANGE_THRESHOLD:
+                # Large movement (e.g. swapping cards) re-arms the gate
+                self.reference = None
+            self.still_frames = 0
+            return 'motion'
+        self.still_frames += 1
+
+        # Hold off until something other than the last recognized card is in view
+        if self.reference is not None and cv2.absdiff(small, self.reference).mean() <= LIVE_GATE_CHANGE_THRESHOLD:
+            return 'suppressed'
+        if self.still_frames < LIVE_GATE_STILL_FRAMES:
+            return 'settling'
+        if cv2.Laplacian(small, cv2.CV_64F).var() < LIVE_GATE_MIN_SHARPNESS:
+            return 'blurry'
+
+        # Require the scene to settle again before the next attempt
+        self.still_frames = 0
+        return 'process'
+
+    def should_process(self, frame):
+        """The gate's view of the frame if it should be OCRed (for mark_recognized), else None"""
+        with self.lock:
+            decision = self._decide(frame)
+            small = self.previous
+        LIVE_GATE_DECISIONS.labels(decision=decision).inc()
+        return small if decision == 'process' else None
+
+    def mark_recognized(self, small):
+        """Suppress further OCR until the scene changes away from the frame that was recognized.
+
+        `small` is what should_process returned for that frame; frames seen
+        since, e.g. a card swapped in during OCR, do not become the reference.
+        """
+        with self.lock:
+            self.reference = small
+
+class KeyframeSelector:
+    """Split a frame stream into segments, one per card shown, keeping each segment's sharpest frame.
+
+    A segment ends at the first frame that differs from the segment's first
+    usable frame by more than LIVE_GATE_CHANGE_THRESHOLD. Frames are scored by
+    the variance of their Laplacian, discounted by motion since the previous
+    frame; frames that are blurry (below LIVE_GATE_MIN_SHARPNESS) or moved by
+    more than LIVE_GATE_CHANGE_THRESHOLD are never selected.
+    """
+
+    def __init__(self):
+        self.previous = None
+        self.anchor = None  # downscaled first usable frame of the current segment
+        self.best = None
+
+    def _downscale(self, gray):
+        height, width = gray.shape[:2]
+        size = (LIVE_GATE_WIDTH, max(1, int(height * LIVE_GATE_WIDTH / float(width))))
+        return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+
+    def push(self, index, seconds, gray):
+        """Add a frame; returns the previous segment's keyframe when this frame starts a new one"""
+        small = self._downscale(gray)
+        previous, self.previous = self.previous, small
+        motion = 0.0
+        if previous is not None and previous.shape == small.shape:
+            motion = float(cv2.absdiff(small, previous).mean())
+
+        finished = None
+        if self.anchor is not None and (
+                self.anchor.shape != small.shape
+                or cv2.absdiff(small, self.anchor).mean() > LIVE_GATE_CHANGE_THRESHOLD):
+            finished = self.finish()
+
+        sharpness = float(cv2.Laplacian(small, cv2.CV_64F).var())
+        if sharpness >= LIVE_GATE_MIN_SHARPNESS and motion <= LIVE_GATE_CHANGE_THRESHOLD:
+            score = sharpness / (1.0 + motion / LIVE_GATE_STILL_THRESHOLD)
+            if self.anchor is None:
+                self.anchor = small
+            if self.best is None or score > self.best['score']:
+                self.best = {'score': score, 'frame': index, 'time': seconds, 'gray': gray,
+                             'sharpness': round(sharpness, 1)}
+        return finished
+
+    def finish(self):
+        """Close the current segment and return its keyframe, or None if it had no usable frame"""
+        best, self.best, self.anchor = self.best, None, None
+        return best
+
+class StageQueue:
+    """Bounded hand-off queue between live pipeline stages.
+
+    When full, the oldest item is dropped so a slow stage always works on fresh input.
+    """
+
+    def __init__(self, stage, maxsize):
+        self.stage = stage
+        self.queue = queue.Queue(maxsize)
+
+    def put(self, item):
+        while True:
+            try:
+                self.queue.put_nowait((time.time(), item))
+                LIVE_QUEUE_DEPTH.labels(stage=self.stage).inc()
+                return
+            except queue.Full:
+                if self._discard():
+                    LIVE_QUEUE_DROPS.labels(stage=self.stage).inc()
+
+    def get(self, timeout):
+        try:
+            queued_at, item = self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        LIVE_QUEUE_DEPTH.labels(stage=self.stage).dec()
+        LIVE_QUEUE_WAIT.labels(stage=self.stage).observe(time.time() - queued_at)
+        return item
+
+    def _discard(self):
+        try:
+            self.queue.get_nowait()
+        except queue.Empty:
+            return False
+        LIVE_QUEUE_DEPTH.labels(stage=self.stage).dec()
+        return True
+
+    def clear(self):
+        while self._discard():
+            pass
+
+class FrameSource(abc.ABC):
+    """Where a live session's frames come from.
+
+    read() returns the next BGR frame, or None when none is ready within the
+    timeout. `encoded` holds the compressed bytes of the last frame when the
+    source has them (so recordings need not re-encode), `timestamp` its time
+    in the source's own timeline when it has one, and `finished` is set once
+    a source has nothing more to give.
+    """
+
+    name = 'source'
+
+    def __init__(self):
+        self.encoded = None
+        self.timestamp = None
+        self.finished = False
+
+    def open(self):
+        return True
+
+    @abc.abstractmethod
+    def read(self, timeout=0.5):
+        """Return the next frame, or None if none arrives within `timeout` seconds"""
+
+    def close(self):
+        pass
+
+class DeviceFrameSource(FrameSource):
+    """A camera (device index) or stream URL opened with cv2.VideoCapture"""
+
+    name = 'device'
+
+    def __init__(self, device=0):
+        super().__init__()
+        self.device = device
+        self.cap = None
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.device)
+        return self.cap.isOpened()
+
+    def read(self, timeout=0.5):
+        if not self.cap or not self.cap.isOpened():
+            logger.error("camera_closed", device=str(self.device))
+            self.finished = True
+            return None
+        ret, frame = self.cap.read()
+        if not ret:
+            # Try to reinitialize the camera on failure
+            self.reopen()
+            return None
+        return frame
+
+    def reopen(self):
+        """Attempt to reinitialize the camera after a failure"""
+        logger.info("reinitializing_camera", device=str(self.device))
+        try:
             if self.cap:
                 self.cap.release()
+            time.sleep(1)  # Give the camera time to reset
+            if not self.open():
+                logger.error("camera_reinit_failed", device=str(self.device))
+                SCAN_ERRORS.labels(error_type='camera_reinit').inc()
+                return False
+            return True
+        except Exception as e:
+            logger.error("camera_reinit_error", device=str(self.device), error=str(e))
+            SCAN_ERRORS.labels(error_type='camera_reinit').inc()
+            return False
+
+    def close(self):
+        if self.cap:
+            try:
+                self.cap.release()
+            except Exception as e:
+                logger.error("camera_release_error", device=str(self.device), error=str(e))
+            finally:
                 self.cap = None
 
-    def _reinitialize_camera(self):
-        """Attempt to reinitialize the camera after a failure"""
-        logger.info("reinitializing_camera", user_id=self.user_id)
-        try:
-            if self.cap:
-                self.cap.release()
-                
-            time.sleep(1)  # Give the camera time to reset
-            self.cap = cv2.VideoCapture(0)
-            if not self.cap.isOpened():
-                logger.error("camera_reinit_failed", user_id=self.user_id)
-                SCAN_ERRORS.labels(error_type='camera_reinit').inc()
-                self.error_count += 1
-                return False
-            return True
-        except Exception as e:
-            logger.error("camera_reinit_error", user_id=self.user_id, error=str(e))
-            SCAN_ERRORS.labels(error_type='camera_reinit').inc()
-            self.error_count += 1
-            return False
+class PushFrameSource(FrameSource):
+    """Encoded frames pushed by the client; a frame not yet picked up is superseded by the next"""
+
+    name = 'push'
+
+    def __init__(self):
+        super().__init__()
+        self.pending_frame = None
+        self.push_lock = threading.Lock()
+        self.frame_ready = threading.Event()
+
+    def push(self, data):
+        with self.push_lock:
+            if self.pending_frame is not None:
+                LIVE_PUSHED_FRAMES.labels(result='dropped').inc()
+            self.pending_frame = data
+            self.frame_ready.set()
+        LIVE_PUSHED_FRAMES.labels(result='accepted').inc()
+
+    def read(self, timeout=0.5):
+        """Wait for the most recent pushed frame and decode it, or return None"""
+        if not self.frame_ready.wait(timeout):
+            return None
+        with self.push_lock:
+            data, self.pending_frame = self.pending_frame, None
+            self.frame_ready.clear()
+        if data is None:
+            return None
+
+        with scan_stage('decode'):
+            frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            LIVE_PUSHED_FRAMES.labels(result='rejected').inc()
+            SCAN_ERRORS.labels(error_type='frame_decode').inc()
+            return None
+        self.encoded = data
+        return frame
+
+class TimedFrameSource(FrameSource):
+    """A finite sequence of timestamped frames, replayed at `speed` times its original pace.
+
+    With speed 0 every frame is delivered as soon as it is read. When paced,
+    frames whose successor is already due are skipped, as a camera drops the
+    frames nobody reads in time. Subclasses provide _time(i) (seconds, or None
+    past the end) and _load(i) (frame and encoded bytes, or None), called with
+    increasing i.
+    """
+
+    def __init__(self, speed=LIVE_SOURCE_SPEED, loop=LIVE_SOURCE_LOOP):
+        super().__init__()
+        self.speed = speed
+        self.loop = loop
+        self.index = 0
+        self.skipped = 0
+        self._start = None
+
+    @abc.abstractmethod
+    def _time(self, index):
+        """Seconds from the start of the sequence to frame `index`, or None past the end"""
+
+    @abc.abstractmethod
+    def _load(self, index):
+        """Frame `index` and its encoded bytes, or None if it cannot be read"""
+
+    def _rewind(self):
+        return True
+
+    def _due(self, index):
+        return self._start + self._time(index) / self.speed
+
+    def read(self, timeout=0.5):
+        if self.finished:
+            time.sleep(timeout)
+            return None
+        index = self.index
+        if self._time(index) is None:
+            return self._end_of_frames()
+
+        if self.speed > 0:
+            now = time.monotonic()
+            if self._start is None:
+                self._start = now - self._time(index) / self.speed
+            wait = self._due(index) - now
+            if wait > timeout:
+                time.sleep(timeout)
+                return None
+            if wait > 0:
+                time.sleep(wait)
+            else:
+                # Fell behind: jump to the newest frame that is already due
+                while self._time(index + 1) is not None and self._due(index + 1) <= now:
+                    index += 1
+                    self.skipped += 1
+                    LIVE_QUEUE_DROPS.labels(stage='capture').inc()
+
+        loaded = self._load(index)
+        if loaded is None:
+            return self._end_of_frames()
+        self.index = index + 1
+        self.timestamp = self._time(index)
+        frame, self.encoded = loaded
+        return frame
+
+    def _end_of_frames(self):
+        if self.loop and self.index > 0 and self._rewind():
+            self.index = 0
+            self._start = None
+        else:
+            self.finished = True
+        return None
+
+class VideoFileFrameSource(TimedFrameSource):
+    """Frames of a video file, at the file's frame rate"""
+
+    name = 'video'
+
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.cap = None
+        self.fps = 30.0
+        self.position = 0
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.path)
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        if fps and fps == fps:  # missing or NaN
+            self.fps = fps
+        self.position = 0
+        return self.cap.isOpened()
+
+    def _time(self, index):
+        return index / self.fps
+
+    def _load(self, index):
+        # Skipped frames are only grabbed, not decoded
+        while self.position < index:
+            if not self.cap.grab():
+                return None
+            self.position += 1
+        ok, frame = self.cap.read()
+        if not ok:
+            return None
+        self.position += 1
+        return frame, None
+
+    def _rewind(self):
+        self.cap.release()
+        return self.open()
+
+    def close(self):
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+
+class ImageDirectoryFrameSource(TimedFrameSource):
+    """The images in a directory in name order, at `fps` frames per second"""
+
+    name = 'images'
+    extensions = ('.jpg', '.jpeg', '.png', '.webp', '.bmp')
+
+    def __init__(self, path, fps=LIVE_SOURCE_FPS, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.fps = fps
+        self.files = []
+
+    def open(self):
+        if not os.path.isdir(self.path):
+            return False
+        self.files = sorted(
+            os.path.join(self.path, name) for name in os.listdir(self.path)
+            if name.lower().endswith(self.extensions)
+        )
+        return bool(self.files)
+
+    def _time(self, index):
+        return index / self.fps if index < len(self.files) else None
+
+    def _load(self, index):
+        with open(self.files[index], 'rb') as f:
+            data = f.read()
+        frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            logger.warn("frame_source_unreadable", file=self.files[index])
+            return None
+        return frame, data
+
+# Frame recordings: magic, then per frame a (seconds since the first frame,
+# byte length) header followed by the encoded (JPEG) frame
+RECORDING_MAGIC = b'CSFRAMES1\n'
+RECORDING_FRAME = struct.Struct('<dI')
+
+class ReplayFrameSource(TimedFrameSource):
+    """A recording written by FrameRecorder, replayed with its original timing"""
+
+    name = 'replay'
+
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.file = None
+        self.frames = []  # (seconds, offset, length)
+
+    def open(self):
+        try:
+            self.file = open(self.path, 'rb')
+        except OSError as e:
+            logger.error("recording_open_error", path=self.path, error=str(e))
+            return False
+        if self.file.read(len(RECORDING_MAGIC)) != RECORDING_MAGIC:
+            logger.error("recording_format_error", path=self.path)
+            return False
+        # Index the frame headers up front; payloads are read on demand
+        self.frames = []
+        while True:
+            header = self.file.read(RECORDING_FRAME.size)
+            if len(header) < RECORDING_FRAME.size:
+                break
+            seconds, length = RECORDING_FRAME.unpack(header)
+            self.frames.append((seconds, self.file.tell(), length))
+            self.file.seek(length, os.SEEK_CUR)
+        return bool(self.frames)
+
+    def _time(self, index):
+        return self.frames[index][0] if index < len(self.frames) else None
+
+    def _load(self, index):
+        _, offset, length = self.frames[index]
+        self.file.seek(offset)
+        data = self.file.read(length)
+        frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            # A truncated last frame from an interrupted recording
+            return None
+        return frame, data
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+def create_frame_source(spec=LIVE_CAMERA_SOURCE, speed=LIVE_SOURCE_SPEED, loop=LIVE_SOURCE_LOOP):
+    """Build a frame source from a `kind:target` spec (see LIVE_CAMERA_SOURCE)"""
+    kind, _, target = spec.partition(':')
+    if kind == 'device':
+        return DeviceFrameSource(int(target) if target.isdigit() else target or 0)
+    sources = {'video': VideoFileFrameSource, 'images': ImageDirectoryFrameSource, 'replay': ReplayFrameSource}
+    if kind not in sources or not target:
+        raise ValueError(f'Unknown frame source: {spec}')
+    return sources[kind](target, speed=speed, loop=loop)
+
+class FrameRecorder:
+    """Appends frames and their capture times to a recording for ReplayFrameSource.
+
+    Frames that arrived encoded (pushed by the client, read from files) are
+    stored as-is; others are encoded as JPEG. Recording stops at max_bytes.
+    """
+
+    def __init__(self, path, quality=LIVE_RECORD_JPEG_QUALITY, max_bytes=LIVE_RECORD_MAX_BYTES):
+        self.path = path
+        self.quality = quality
+        self.max_bytes = max_bytes
+        self.file = open(path, 'wb')
+        self.file.write(RECORDING_MAGIC)
+        self.size = len(RECORDING_MAGIC)
+        self.frames = 0
+        self.started = None
+
+    def write(self, frame, encoded=None, seconds=None):
+        """Append a frame, timestamped now unless `seconds` (since the first frame) is given"""
+        if self.file is None:
+            return False
+        if seconds is None:
+            now = time.monotonic()
+            if self.started is None:
+                self.started = now
+            seconds = now - self.started
+        if encoded is None:
+            ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+            if not ok:
+                return False
+            encoded = buffer.tobytes()
+        if self.size + RECORDING_FRAME.size + len(encoded) > self.max_bytes:
+            logger.warn("recording_size_limit", path=self.path, frames=self.frames)
+            self.close()
+            return False
+        self.file.write(RECORDING_FRAME.pack(seconds, len(encoded)))
+        self.file.write(encoded)
+        self.size += RECORDING_FRAME.size + len(encoded)
+        self.frames += 1
+        return True
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+class LiveScannerSession:
+    """Live scanning session run as a pipeline of independent stages.
+
+    capture -> latest-frame slot -> analyze (stability gate) -> OCR queue -> OCR.
+    Each stage has its own thread, and the latest frame is published by swapping
+    a single (seq, frame) reference, so preview readers never wait on OCR.
+    """
+
+    def __init__(self, user_id, mode='camera', source=None):
+        self.user_id = user_id
+        self.mode = mode  # 'camera' (server-side capture) or 'push' (client-pushed frames)
+        # Defaults to LIVE_CAMERA_SOURCE in camera mode, created when the session starts
+        self.source = PushFrameSource() if source is None and mode == 'push' else source
+        self.recorder = None
+        self.active = True
+        self.last_scan_result = None
+        self.last_card = None
+        self.last_activity = time.time()
+        self.threads = []
+        self.scan_count = 0
+        self.error_count = 0
+        self.lock = threading.Lock()  # guards scan results only
+        self.consecutive_frames_processed = 0
+        self.gate = FrameStabilityGate()
+        self.ocr_queue = StageQueue('ocr', LIVE_OCR_QUEUE_SIZE)
+        # Per-session frame accounting: read from the source, superseded in the
+        # latest-frame slot before analysis, seen by the gate, and handed to OCR
+        self.frame_counts = {'captured': 0, 'superseded': 0, 'analyzed': 0, 'queued': 0}
+        self.analyzed_seq = 0
+        self.ocr_busy = False
+        # Latest-frame slot: capture swaps in a new (seq, frame) tuple and readers
+        # take whichever one is current without locking. The condition only wakes
+        # readers waiting for news; the preview JPEG is encoded once per frame.
+        self.latest = (0, None)
+        self.updates = threading.Condition()
+        self.result_seq = 0
+        self.latest_result = None
+        self.encode_lock = threading.Lock()
+        self.preview_seq = 0
+        self.preview_jpeg = None
+
+    @property
+    def frame_seq(self):
+        return self.latest[0]
+
+    @property
+    def last_frame(self):
+        return self.latest[1]
+
+    @property
+    def drained(self):
+        """True once a finite source is exhausted and every frame it gave has been processed"""
+        return (
+            self.source is not None and self.source.finished
+            and self.analyzed_seq == self.frame_seq
+            and self.ocr_queue.queue.empty() and not self.ocr_busy
+        )
+
+    def start(self):
+        try:
+            if self.source is None:
+                self.source = create_frame_source()
+            if not self.source.open():
+                logger.error("camera_error", user_id=self.user_id, source=self.source.name)
+                SCAN_ERRORS.labels(error_type='camera_init').inc()
+                return False
+            if LIVE_RECORD_DIR:
+                name = re.sub(r'[^A-Za-z0-9_.-]', '_', str(self.user_id))
+                path = os.path.join(LIVE_RECORD_DIR, f'{name}-{int(time.time())}.frames')
+                self.recorder = FrameRecorder(path)
+                logger.info("live_session_recording", user_id=self.user_id, path=path)
+
+            for stage in (self._capture_loop, self._analyze_loop, self._ocr_loop):
+                thread = threading.Thread(target=scan_context('live', CARD_IDENTIFY_MODE).run, args=(stage,))
+                thread.daemon = True
+                thread.start()
+                self.threads.append(thread)
+            return True
+        except Exception as e:
+            logger.error("session_start_error", user_id=self.user_id, error=str(e), traceback=traceback.format_exc())
+            SCAN_ERRORS.labels(error_type='session_start').inc()
+            return False
+
+    @SCAN_DURATION.labels(method='live').time()
+    def _process_frame(self, gray, gate_frame):
+        try:
+            # Localize the card and OCR only its name line
+            regions, _, _, card = recognize_card_regions(gray, session=f'live:{self.user_id}', priority='live')
+            text = regions.get('name') or regions.get('full') or regions.get('collector') or ''
+            if card is not None and not text.strip():
+                text = card['name']  # visual match, no OCR text
+
+            # With a catalog loaded, only text that resolves to a real card counts
+            resolved = card is not None or get_card_index() is None
+
+            if text and text.strip() and resolved:
+                result = card['name'] if card else text.strip()
+                with self.lock:
+                    self.last_scan_result = result
+                    self.last_card = card
+                self._publish_result(result, card)
+                self.scan_count += 1
+                self.error_count = 0  # Reset error count on success
+                self.consecutive_frames_processed += 1
+                self.gate.mark_recognized(gate_frame)
+
+                # Queue the card for the backend; the write-behind thread delivers it
+                card_details = {"name": result}
+                if card:
+                    card_details["id"] = card['id']
+                if collection_writer.enqueue(self.user_id, card_details):
+                    logger.info(
+                        "card_queued_for_collection",
+                        user_id=self.user_id,
+                        card_name=result
+                    )
+
+                logger.info(
+                    "live_scan_success",
+                    user_id=self.user_id,
+                    scan_count=self.scan_count,
+                    consecutive_frames=self.consecutive_frames_processed,
+                    text_preview=text[:30]
+                )
+            else:
+                self.consecutive_frames_processed = 0
+        except SchedulerOverloaded:
+            # Shed under load; the next settled frame gets another chance
+            LIVE_QUEUE_DROPS.labels(stage='ocr').inc()
+        except Exception as e:
+            self.error_count += 1
+            self.consecutive_frames_processed = 0
+            logger.error(
+                "frame_processing_error", 
+                user_id=self.user_id, 
+                error=str(e),
+                traceback=traceback.format_exc(),
+                error_count=self.error_count
+            )
+            SCAN_ERRORS.labels(error_type='frame_processing').inc()
+
+            if self.error_count > 10:  # Stop session if too many errors
+                self.stop()
+
+    def _capture_loop(self):
+        """Capture stage: read frames from the frame source into the latest-frame slot"""
+        while self.active:
+            try:
+                started = time.time()
+                frame = self.source.read()
+                if frame is None:
+                    if self.source.finished:
+                        logger.info("frame_source_finished", user_id=self.user_id, source=self.source.name)
+                        break
+                    continue
+                self.last_activity = time.time()
+                self.frame_counts['captured'] += 1
+                if self.recorder is not None:
+                    self.recorder.write(frame, self.source.encoded)
+
+                LIVE_STAGE_DURATION.labels(stage='capture').observe(time.time() - started)
+                self._set_frame(frame)
+            except Exception as e:
+                logger.error("scan_loop_error", user_id=self.user_id, error=str(e), traceback=traceback.format_exc())
+                SCAN_ERRORS.labels(error_type='scan_loop').inc()
+                time.sleep(1)  # Wait before retrying
+
+        # Cleanup
+        self.source.close()
+
+    def _analyze_loop(self):
+        """Analyze stage: pass frames through the stability gate and queue them for OCR"""
+        seq = 0
+        last_queued = 0.0
+        while self.active:
+            if not self.wait_for(lambda: self.frame_seq != seq, timeout=0.5):
+                continue
+            previous = seq
+            seq, frame = self.latest
+            if seq - previous > 1:
+                # Capture outpaced analysis and replaced frames nobody looked at
+                self.frame_counts['superseded'] += seq - previous - 1
+                LIVE_QUEUE_DROPS.labels(stage='analyze').inc(seq - previous - 1)
+            started = time.time()
+            if frame is None or started - last_queued < LIVE_OCR_INTERVAL:
+                self.analyzed_seq = seq
+                continue
+            try:
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                gate_frame = self.gate.should_process(gray)
+                LIVE_STAGE_DURATION.labels(stage='analyze').observe(time.time() - started)
+                self.frame_counts['analyzed'] += 1
+                if gate_frame is not None:
+                    self.ocr_queue.put((gray, gate_frame))
+                    self.frame_counts['queued'] += 1
+                    last_queued = started
+            except Exception as e:
+                logger.error("analyze_loop_error", user_id=self.user_id, error=str(e), traceback=traceback.format_exc())
+                SCAN_ERRORS.labels(error_type='analyze_loop').inc()
+            self.analyzed_seq = seq
+
+    def _ocr_loop(self):
+        """OCR stage: localize, recognize and publish queued frames"""
+        while self.active:
+            job = self.ocr_queue.get(timeout=0.5)
+            if job is None:
+                continue
+            started = time.time()
+            self.ocr_busy = True
+            try:
+                self._process_frame(*job)
+            finally:
+                self.ocr_busy = False
+            LIVE_STAGE_DURATION.labels(stage='ocr').observe(time.time() - started)
+
+    def _set_frame(self, frame):
+        self.latest = (self.latest[0] + 1, frame)
+        with self.updates:
+            self.updates.notify_all()
+
+    def _publish_result(self, result, card):
+        with self.updates:
+            self.result_seq += 1
+            self.latest_result = {'result': result, 'card': card}
+            self.updates.notify_all()
+
+    def wait_for(self, predicate, timeout):
+        """Block until predicate() holds or the session stops; False on timeout"""
+        with self.updates:
+            return self.updates.wait_for(lambda: not self.active or predicate(), timeout)
+
+    def push_frame(self, data):
+        """Offer an encoded frame from the client; a frame not yet picked up is dropped"""
+        self.source.push(data)
+        self.last_activity = time.time()
 
     def stop(self):
         self.active = False
         logger.info("stopping_session", user_id=self.user_id)
-        
-        with self.lock:
-            if self.cap:
-                try:
-                    self.cap.release()
-                except Exception as e:
-                    logger.error("camera_release_error", user_id=self.user_id, error=str(e))
-                finally:
-                    self.cap = None
-            
-        if self.thread:
+        with self.updates:
+            self.updates.notify_all()
+
+        # Stop may be called from a stage thread (too many errors); don't join it
+        for thread in self.threads:
+            if thread is threading.current_thread():
+                continue
             try:
-                self.thread.join(timeout=2.0)
+                thread.join(timeout=2.0)
             except Exception as e:
                 logger.error("thread_join_error", user_id=self.user_id, error=str(e))
+
+        if self.source is not None:
+            self.source.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        self.ocr_queue.clear()
             
-    def get_current_frame_base64(self):
-        with self.lock:
-            if self.last_frame is not None:
+    def get_preview_jpeg(self):
+        """Return (frame seq, JPEG bytes) of the latest frame at preview size.
+
+        Each frame is encoded at most once, by whichever reader asks first.
+        """
+        with self.encode_lock:
+            seq, frame = self.latest
+            if frame is None:
+                return seq, None
+            if self.preview_seq != seq or self.preview_jpeg is None:
+                started = time.time()
                 try:
-                    _, buffer = cv2.imencode('.jpg', self.last_frame)
-                    return base64.b64encode(buffer).decode('utf-8')
+                    height, width = frame.shape[:2]
+                    if width > LIVE_PREVIEW_MAX_WIDTH:
+                        size = (LIVE_PREVIEW_MAX_WIDTH, int(height * LIVE_PREVIEW_MAX_WIDTH / float(width)))
+                        frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+                    with scan_stage('encode', endpoint='live'):
+                        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, LIVE_PREVIEW_JPEG_QUALITY])
+                    self.preview_jpeg = buffer.tobytes()
+                    self.preview_seq = seq
+                    LIVE_STAGE_DURATION.labels(stage='encode').observe(time.time() - started)
                 except Exception as e:
                     logger.error("frame_encoding_error", user_id=self.user_id, error=str(e))
-        return None
+                    return seq, None
+            return self.preview_seq, self.preview_jpeg
+
+    def get_current_frame_base64(self):
+        _, jpeg = self.get_preview_jpeg()
+        if jpeg is None:
+            return None
+        return base64.b64encode(jpeg).decode('utf-8')
         
     def get_scan_result(self):
+        return self.get_scan_update()[0]
+
+    def get_scan_update(self):
+        """Return and clear the latest (result text, matched card)"""
         with self.lock:
-            result = self.last_scan_result
+            result, card = self.last_scan_result, self.last_card
             self.last_scan_result = None
-            return result
+            self.last_card = None
+            return result, card
 
 # Retry decorator using backoff package
 def with_retry(max_tries=MAX_RETRIES, operation_name="unknown"):
@@ -393,6 +3238,411 @@ def with_retry(max_tries=MAX_RETRIES, operation_name="unknown"):
         return wrapper
     return decorator
 
+class CollectionWriter:
+    """Write-behind queue for adding scanned cards to user collections.
+
+    Adds are coalesced per user and card within COLLECTION_DEDUPE_WINDOW and
+    appended to a SQLite WAL journal, so they survive backend outages and
+    restarts. A background thread claims journal rows in order and flushes
+    them in batches to the bulk endpoint over a keep-alive HTTP session.
+    """
+
+    def __init__(self, journal_path=COLLECTION_JOURNAL_PATH):
+        self.journal_path = journal_path
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.recent = {}
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.local = threading.local()
+        self.thread = None
+        self.http = None
+        self._pid = None
+
+    @property
+    def enabled(self):
+        return bool(BACKEND_URL)
+
+    def _connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None or getattr(self.local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.journal_path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS pending_adds ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                'user_id TEXT NOT NULL, '
+                'card TEXT NOT NULL, '
+                'created_at REAL NOT NULL, '
+                'claimed_by TEXT, '
+                'claimed_at REAL)'
+            )
+            self.local.conn = conn
+            self.local.pid = os.getpid()
+        return conn
+
+    def start(self):
+        """Start the flush thread for this process (again after a fork)"""
+        with self.lock:
+            if self._pid == os.getpid() and self.thread and self.thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self.worker_id = f'{socket.gethostname()}:{self._pid}'
+            self.http = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=2)
+            self.http.mount('http://', adapter)
+            self.http.mount('https://', adapter)
+            self.thread = threading.Thread(target=self._flush_loop, daemon=True)
+            self.thread.start()
+
+    def enqueue(self, user_id, card):
+        """Journal a collection add; returns False if it was coalesced with a recent one"""
+        if not self.enabled:
+            logger.warn("collection_backend_not_configured", user_id=user_id, card_name=card.get('name'))
+            return False
+
+        key = (user_id, card.get('id') or card.get('name', '').lower())
+        now = time.time()
+        with self.lock:
+            last = self.recent.get(key)
+            if last is not None and now - last < COLLECTION_DEDUPE_WINDOW:
+                COLLECTION_ADDS.labels(result='coalesced').inc()
+                return False
+            self.recent[key] = now
+            if len(self.recent) > 10000:
+                self.recent = {k: t for k, t in self.recent.items() if now - t < COLLECTION_DEDUPE_WINDOW}
+
+        self._connection().execute(
+            'INSERT INTO pending_adds (user_id, card, created_at) VALUES (?, ?, ?)',
+            (user_id, json.dumps(card), now)
+        )
+        COLLECTION_ADDS.labels(result='queued').inc()
+        self.start()
+        return True
+
+    def _flush_loop(self):
+        while True:
+            self.wakeup.wait(COLLECTION_FLUSH_INTERVAL)
+            self.wakeup.clear()
+            try:
+                while self._flush_batch():
+                    pass
+            except Exception as e:
+                # Rows stay claimed by this worker and are retried on the next pass
+                logger.error("collection_flush_error", error=str(e), traceback=traceback.format_exc())
+                SCAN_ERRORS.labels(error_type='collection_flush').inc()
+                time.sleep(RETRY_MAX_DELAY)
+
+    def _claim_batch(self):
+        conn = self._connection()
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = conn.execute(
+                'SELECT id, user_id, card FROM pending_adds '
+                'WHERE claimed_by IS NULL OR claimed_by = ? OR claimed_at < ? '
+                'ORDER BY id LIMIT ?',
+                (self.worker_id, now - COLLECTION_CLAIM_LEASE, COLLECTION_BATCH_SIZE)
+            ).fetchall()
+            if rows:
+                conn.executemany(
+                    'UPDATE pending_adds SET claimed_by = ?, claimed_at = ? WHERE id = ?',
+                    [(self.worker_id, now, row[0]) for row in rows]
+                )
+            depth = conn.execute('SELECT COUNT(*) FROM pending_adds').fetchone()[0]
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        COLLECTION_QUEUE_DEPTH.set(depth)
+        return rows
+
+    def _flush_batch(self):
+        """Flush one batch in journal order; returns True if more rows may be waiting"""
+        rows = self._claim_batch()
+        if not rows:
+            return False
+
+        items = [{'userId': user_id, 'card': json.loads(card)} for _, user_id, card in rows]
+        try:
+            response = self._post(COLLECTION_BULK_PATH, {'items': items})
+        except Exception:
+            COLLECTION_ADDS.labels(result='failed').inc(len(rows))
+            raise
+
+        if response.status_code < 400:
+            COLLECTION_ADDS.labels(result='flushed').inc(len(rows))
+            logger.info("cards_added_to_collection", count=len(rows))
+            self._delete(rows)
+        elif response.status_code in (404, 405) or len(rows) > 1:
+            # Backend without the bulk endpoint, or one bad item refusing the
+            # whole batch: add one card at a time and drop only the rejected ones
+            self._flush_items(rows, items)
+        else:
+            COLLECTION_ADDS.labels(result='rejected').inc()
+            self._log_rejected(items[0], response)
+            self._delete(rows)
+        return len(rows) == COLLECTION_BATCH_SIZE
+
+    def _flush_items(self, rows, items):
+        for index, (row, item) in enumerate(zip(rows, items)):
+            try:
+                response = self._post('/api/collection/add', item)
+            except Exception:
+                # Rows already answered are gone from the journal; the rest are retried
+                COLLECTION_ADDS.labels(result='failed').inc(len(rows) - index)
+                raise
+            if response.status_code < 400:
+                COLLECTION_ADDS.labels(result='flushed').inc()
+                logger.info("card_added_to_collection", user_id=item['userId'], card_name=item['card'].get('name'))
+            else:
+                COLLECTION_ADDS.labels(result='rejected').inc()
+                self._log_rejected(item, response)
+            self._delete([row])
+
+    def _log_rejected(self, item, response):
+        logger.error(
+            "failed_to_add_card",
+            user_id=item['userId'],
+            card_name=item['card'].get('name'),
+            status_code=response.status_code,
+            response=response.text[:200]
+        )
+
+    def _delete(self, rows):
+        self._connection().executemany('DELETE FROM pending_adds WHERE id = ?', [(row[0],) for row in rows])
+
+    @with_retry(operation_name='collection_add')
+    def _post(self, path, payload):
+        with scan_stage('backend', endpoint='collection'):
+            response = self.http.post(
+                f"{BACKEND_URL}{path}",
+                json=payload,
+                headers={"Authorization": f"Bearer {API_TOKEN}"},
+                timeout=COLLECTION_REQUEST_TIMEOUT
+            )
+        if response.status_code >= 500:
+            response.raise_for_status()
+        return response
+
+# Started per worker by warm_up() (or the first enqueue), never at import: a
+# preloading master must not fork a live flush thread
+collection_writer = CollectionWriter()
+
+class ImageRejected(Exception):
+    """An upload that is refused before or during decoding"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+# imdecode flags by reduction factor; libjpeg scales during the DCT so the
+# full-resolution image is never materialized
+REDUCED_GRAYSCALE_FLAGS = {
+    1: cv2.IMREAD_GRAYSCALE,
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
+# EXIF orientation tag value to the transform that makes the image upright
+EXIF_ORIENTATION_TRANSFORMS = {
+    2: lambda image: cv2.flip(image, 1),
+    3: lambda image: cv2.rotate(image, cv2.ROTATE_180),
+    4: lambda image: cv2.flip(image, 0),
+    5: lambda image: cv2.transpose(image),
+    6: lambda image: cv2.rotate(image, cv2.ROTATE_90_CLOCKWISE),
+    7: lambda image: cv2.flip(cv2.transpose(image), -1),
+    8: lambda image: cv2.rotate(image, cv2.ROTATE_90_COUNTERCLOCKWISE),
+}
+
+def read_upload(file):
+    """Read an uploaded file, stopping one byte past the size limit"""
+    return file.read(SCAN_MAX_UPLOAD_BYTES + 1)
+
+def probe_image(data):
+    """Read dimensions and EXIF orientation from the image header without decoding pixels"""
+    try:
+        with Image.open(io.BytesIO(data)) as header:
+            width, height = header.size
+            orientation = header.getexif().get(0x0112, 1)  # Orientation tag
+    except Image.DecompressionBombError:
+        raise ImageRejected('Image too large', 413)
+    except (Image.UnidentifiedImageError, OSError, SyntaxError):
+        raise ImageRejected('Unsupported image format')
+    return width, height, orientation
+
+@scan_stage('decode')
+def decode_scan_image(data):
+    """Decode upload bytes straight to an upright grayscale array at a reduced scale.
+
+    The reduction factor is the largest that keeps the long side at or above
+    SCAN_DECODE_MIN_SIDE. Oversized uploads are rejected before decoding.
+    Returns the array and the reduction factor.
+    """
+    if len(data) > SCAN_MAX_UPLOAD_BYTES:
+        raise ImageRejected('Image too large', 413)
+    width, height, orientation = probe_image(data)
+    if width * height > SCAN_MAX_PIXELS:
+        raise ImageRejected('Image too large', 413)
+
+    scale = 1
+    while scale < 8 and max(width, height) // (scale * 2) >= SCAN_DECODE_MIN_SIDE:
+        scale *= 2
+
+    started = time.time()
+    gray = cv2.imdecode(
+        np.frombuffer(data, dtype=np.uint8),
+        REDUCED_GRAYSCALE_FLAGS[scale] | cv2.IMREAD_IGNORE_ORIENTATION
+    )
+    if gray is None:
+        raise ImageRejected('Unsupported image format')
+    transform = EXIF_ORIENTATION_TRANSFORMS.get(orientation)
+    if transform is not None:
+        gray = transform(gray)
+    SCAN_DECODE_DURATION.labels(scale=str(scale)).observe(time.time() - started)
+    return gray, scale
+
+def scan_image_bytes(data, session=None, mode=CARD_IDENTIFY_MODE):
+    """Run the single-image scan pipeline on encoded image bytes.
+
+    Returns the /scan response fields (without userId).
+    """
+    gray, _ = decode_scan_image(data)
+
+    # Localize the card and OCR only the regions we need
+    regions, card_detected, ocr, card = recognize_card_regions(gray, session=session, mode=mode)
+    return {
+        'text': regions_to_text(regions),
+        'regions': regions,
+        'cardDetected': card_detected,
+        'ocr': ocr,
+        'card': card
+    }
+
+def scan_multi_image_bytes(data, session=None, mode=CARD_IDENTIFY_MODE):
+    """Run the multi-card scan pipeline on encoded image bytes.
+
+    Returns the /scan response fields (without userId), with one entry per
+    detected card in reading order. Boxes are in pixels of the uploaded image.
+    """
+    gray, scale = decode_scan_image(data)
+    cards = []
+    for quad, regions, ocr, card in recognize_cards(gray, session=session, mode=mode):
+        corners = quad * scale
+        x, y, width, height = cv2.boundingRect(corners)
+        cards.append({
+            'box': {'x': x, 'y': y, 'width': width, 'height': height},
+            'corners': corners.round().astype(int).tolist(),
+            'text': regions_to_text(regions),
+            'regions': regions,
+            'ocr': ocr,
+            'card': card
+        })
+    return {'cards': cards, 'cardDetected': bool(cards)}
+
+def iter_video_frames(capture):
+    """Yield (index, seconds, gray) for frames sampled at SCAN_VIDEO_SAMPLE_FPS, one decoded frame at a time"""
+    fps = capture.get(cv2.CAP_PROP_FPS)
+    if not fps or fps != fps:  # missing or NaN
+        fps = 30.0
+    step = max(1, int(round(fps / SCAN_VIDEO_SAMPLE_FPS)))
+    index = 0
+    try:
+        while index / fps <= SCAN_VIDEO_MAX_SECONDS:
+            if index % step:
+                # Advance without converting frames we do not analyze
+                with scan_stage('decode'):
+                    grabbed = capture.grab()
+                if not grabbed:
+                    break
+                VIDEO_FRAMES.labels(result='skipped').inc()
+            else:
+                with scan_stage('decode'):
+                    ok, frame = capture.read()
+                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if ok else None
+                if not ok:
+                    break
+                VIDEO_FRAMES.labels(result='sampled').inc()
+                yield index, round(index / fps, 3), gray
+            index += 1
+    finally:
+        capture.release()
+
+def iter_burst_frames(uploads):
+    """Yield (index, None, gray) for a burst of uploaded images, decoding each only when reached"""
+    for index, data in enumerate(uploads):
+        try:
+            gray, _ = decode_scan_image(data)
+        except ImageRejected as e:
+            logger.warn("burst_frame_rejected", index=index, reason=e.message)
+            continue
+        VIDEO_FRAMES.labels(result='sampled').inc()
+        yield index, None, gray
+
+def scan_keyframe(keyframe, session=None, mode=CARD_IDENTIFY_MODE):
+    """Recognize the card in a segment keyframe; returns None when no card outline is visible"""
+    quads = find_card_quads(keyframe['gray'])
+    if not quads:
+        return None
+    regions, ocr, card = recognize_card(keyframe['gray'], quads[0], session=session, mode=mode)
+    return {
+        'frame': keyframe['frame'],
+        'time': keyframe['time'],
+        'sharpness': keyframe['sharpness'],
+        'text': regions_to_text(regions),
+        'regions': regions,
+        'ocr': ocr,
+        'card': card
+    }
+
+def scan_batch_item(index, data, session=None, mode=CARD_IDENTIFY_MODE):
+    """Scan one /scan/batch image on a batch thread; errors are reported per item"""
+    try:
+        result = scan_image_bytes(data, session=session, mode=mode)
+    except ImageRejected as e:
+        return {'index': index, 'error': e.message}
+    except SchedulerOverloaded:
+        return {'index': index, 'error': 'Scanner is busy, retry later'}
+    except Exception as e:
+        logger.error("batch_item_error", index=index, error=str(e), traceback=traceback.format_exc())
+        return {'index': index, 'error': 'Failed to process image'}
+    result['index'] = index
+    return result
+
+_batch_executor = None
+_batch_executor_pid = None
+_batch_executor_lock = threading.Lock()
+
+def get_batch_executor():
+    """Threads that scan /scan/batch images, created lazily in each worker process.
+
+    The threads only decode and locate cards; OCR runs on the scheduler's
+    engines like every other scan.
+    """
+    global _batch_executor, _batch_executor_pid
+    with _batch_executor_lock:
+        if _batch_executor is None or _batch_executor_pid != os.getpid():
+            _batch_executor = ThreadPoolExecutor(max_workers=SCAN_BATCH_WORKERS, thread_name_prefix='batch')
+            _batch_executor_pid = os.getpid()
+        return _batch_executor
+
+def batch_image_count():
+    return max(1, len(request.files.getlist('images')))
+
+def limit_batch_size(f):
+    """Refuse oversized batches before the rate limiter charges them against the budget"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        if len(request.files.getlist('images')) > SCAN_BATCH_MAX_IMAGES:
+            return jsonify({'error': f'Too many images (maximum {SCAN_BATCH_MAX_IMAGES})'}), 400
+        return f(*args, **kwargs)
+    return decorated
+
+# Batches have their own budget, charged one unit per image, so any allowed batch fits in it
+batch_rate_limit = limiter.limit(f"{SCAN_BATCH_IMAGES_PER_MINUTE} per minute", cost=batch_image_count)
+
 @app.route('/scan', methods=['POST'])
 @require_auth
 @limiter.limit("30 per minute")
@@ -405,36 +3655,45 @@ def scan_card():
     if 'image' not in request.files:
         logger.warn("missing_image", user_id=request.user.get('id'))
         return jsonify({'error': 'No image provided'}), 400
+    mode = request.form.get('mode', CARD_IDENTIFY_MODE)
+    if mode not in CARD_IDENTIFY_MODES:
+        return jsonify({'error': 'Invalid mode'}), 400
+    multi = request.form.get('multi', 'false').lower() == 'true'
+    set_scan_labels('multi' if multi else 'single', mode)
 
-    with SCAN_DURATION.labels(method='single').time():
+    with SCAN_DURATION.labels(method='multi' if multi else 'single').time():
         try:
-            image_file = request.files['image']
-            image = Image.open(io.BytesIO(image_file.read()))
-            
-            # Apply image preprocessing for better OCR
-            image_np = np.array(image)
-            
-            # If image is color, convert to grayscale
-            if len(image_np.shape) > 2 and image_np.shape[2] == 3:
-                image_np = cv2.cvtColor(image_np, cv2.COLOR_RGB2GRAY)
-                
-            # Apply adaptive thresholding
-            _, thresh = cv2.threshold(image_np, 150, 255, cv2.THRESH_BINARY)
-            
-            # Apply OCR to preprocessed image
-            processed_image = Image.fromarray(thresh)
-            text = pytesseract.image_to_string(processed_image)
-
-            logger.info(
-                "card_scan_success",
-                user_id=request.user.get('id'),
-                text_preview=text[:30]
+            scan = scan_multi_image_bytes if multi else scan_image_bytes
+            result = scan(
+                read_upload(request.files['image']),
+                session=f"user:{request.user.get('id')}",
+                mode=mode
             )
 
-            return jsonify({
-                'text': text,
-                'userId': request.user.get('id')
-            })
+            if multi:
+                logger.info(
+                    "multi_card_scan_success",
+                    user_id=request.user.get('id'),
+                    cards=len(result['cards']),
+                    resolved=sum(1 for card in result['cards'] if card['card'])
+                )
+            else:
+                logger.info(
+                    "card_scan_success",
+                    user_id=request.user.get('id'),
+                    card_detected=result['cardDetected'],
+                    card_id=result['card']['id'] if result['card'] else None,
+                    text_preview=result['text'][:30]
+                )
+
+            result['userId'] = request.user.get('id')
+            return jsonify(result)
+        except ImageRejected as e:
+            logger.warn("image_rejected", user_id=request.user.get('id'), reason=e.message)
+            return jsonify({'error': e.message}), e.status
+        except SchedulerOverloaded as e:
+            logger.warn("scan_shed", user_id=request.user.get('id'), reason=e.reason, retry_after=e.retry_after)
+            return jsonify({'error': 'Scanner is busy, retry later'}), 503, {'Retry-After': str(e.retry_after)}
         except Exception as e:
             SCAN_ERRORS.labels(error_type='single_scan').inc()
             logger.error(
@@ -445,17 +3704,199 @@ def scan_card():
             )
             return jsonify({'error': 'Failed to process image'}), 500
 
+@app.route('/scan/batch', methods=['POST'])
+@require_auth
+@limit_batch_size
+@batch_rate_limit
+@metrics.counter(
+    'card_batch_scans_total',
+    'Number of batch scan requests',
+    labels={'status': lambda r: r.status_code}
+)
+def scan_batch():
+    images = request.files.getlist('images')
+    user_id = request.user.get('id')
+    if not images:
+        logger.warn("missing_image", user_id=user_id)
+        return jsonify({'error': 'No image provided'}), 400
+    mode = request.form.get('mode', CARD_IDENTIFY_MODE)
+    if mode not in CARD_IDENTIFY_MODES:
+        return jsonify({'error': 'Invalid mode'}), 400
+    set_scan_labels('batch', mode)
+    session = f'user:{user_id}'
+    uploads = [read_upload(image) for image in images]
+
+    # The batch is admitted as a whole; its images' OCR jobs then run on the
+    # scheduler's engines, sharing OCR capacity and fairness between sessions
+    # with every other scan
+    reservation = ocr_scheduler.reserve(session, len(uploads))
+    try:
+        reservation.acquire()
+    except SchedulerOverloaded as e:
+        logger.warn("scan_shed", user_id=user_id, reason=e.reason, retry_after=e.retry_after)
+        return jsonify({'error': 'Scanner is busy, retry later'}), 503, {'Retry-After': str(e.retry_after)}
+
+    # Submit everything up front so work starts before the first line is streamed
+    try:
+        executor = get_batch_executor()
+        futures = {
+            submit_in_context(executor, scan_batch_item, index, data, session=session, mode=mode): index
+            for index, data in enumerate(uploads)
+        }
+    except BaseException:
+        reservation.release()
+        raise
+    started = time.time()
+
+    def generate():
+        failed = 0
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error("batch_item_error", index=futures[future], error=str(e))
+                result = {'index': futures[future], 'error': 'Failed to process image'}
+            if 'error' in result:
+                failed += 1
+                SCAN_ERRORS.labels(error_type='batch_item').inc()
+            else:
+                result['userId'] = user_id
+            yield json.dumps(result) + '\n'
+
+        SCAN_DURATION.labels(method='batch').observe(time.time() - started)
+        logger.info("batch_scan_complete", user_id=user_id, images=len(futures), failed=failed)
+
+    def release():
+        # Queued images of a client that went away are not scanned
+        for future in futures:
+            future.cancel()
+        reservation.release()
+
+    response = Response(generate(), mimetype='application/x-ndjson')
+    response.call_on_close(release)
+    return response
+
+@app.route('/scan/video', methods=['POST'])
+@require_auth
+@limiter.limit("10 per minute")
+@metrics.counter(
+    'card_video_scans_total',
+    'Number of video and burst scan requests',
+    labels={'status': lambda r: r.status_code}
+)
+def scan_video():
+    user_id = request.user.get('id')
+    mode = request.form.get('mode', CARD_IDENTIFY_MODE)
+    if mode not in CARD_IDENTIFY_MODES:
+        return jsonify({'error': 'Invalid mode'}), 400
+
+    video_path = capture = None
+    if 'video' in request.files:
+        # OpenCV's FFmpeg backend needs a seekable file (MP4 indexes often sit at the end)
+        video = request.files['video']
+        suffix = os.path.splitext(video.filename or '')[1] or '.mp4'
+        fd, video_path = tempfile.mkstemp(prefix='scan_video_', suffix=suffix)
+        with os.fdopen(fd, 'wb') as f:
+            shutil.copyfileobj(video.stream, f)
+        capture = cv2.VideoCapture(video_path)
+        if not capture.isOpened():
+            os.remove(video_path)
+            return jsonify({'error': 'Unsupported video format'}), 400
+        frames = iter_video_frames(capture)
+    elif request.files.getlist('frames'):
+        uploads = request.files.getlist('frames')
+        if len(uploads) > SCAN_VIDEO_MAX_FRAMES:
+            return jsonify({'error': f'Too many frames (maximum {SCAN_VIDEO_MAX_FRAMES})'}), 400
+        frames = iter_burst_frames([read_upload(upload) for upload in uploads])
+    else:
+        logger.warn("missing_video", user_id=user_id)
+        return jsonify({'error': 'No video provided'}), 400
+
+    session = f'user:{user_id}'
+
+    def generate():
+        # Frames are decoded while the response streams
+        set_scan_labels('video', mode)
+        started = time.time()
+        selector = KeyframeSelector()
+        executor = get_card_executor()
+        pending = deque()  # (segment, future) in segment order
+        counts = {'frames': 0, 'segments': 0, 'cards': 0}
+
+        def result_line(segment, future):
+            try:
+                result = future.result()
+            except SchedulerOverloaded:
+                result = {'error': 'Scanner is busy, retry later'}
+            except Exception as e:
+                logger.error("video_segment_error", segment=segment, error=str(e), traceback=traceback.format_exc())
+                SCAN_ERRORS.labels(error_type='video_segment').inc()
+                result = {'error': 'Failed to process frame'}
+            if result is None:
+                return None
+            if 'error' not in result:
+                counts['cards'] += 1
+                result['userId'] = user_id
+            result['segment'] = segment
+            return json.dumps(result) + '\n'
+
+        def submit(keyframe):
+            VIDEO_FRAMES.labels(result='selected').inc()
+            pending.append((counts['segments'], submit_in_context(executor, scan_keyframe, keyframe, session=session, mode=mode)))
+            counts['segments'] += 1
+
+        for index, seconds, gray in frames:
+            counts['frames'] += 1
+            keyframe = selector.push(index, seconds, gray)
+            if keyframe is not None:
+                # Stay within the per-session in-flight limit instead of being shed
+                while len(pending) >= OCR_MAX_INFLIGHT_PER_SESSION:
+                    line = result_line(*pending.popleft())
+                    if line:
+                        yield line
+                submit(keyframe)
+            while pending and pending[0][1].done():
+                line = result_line(*pending.popleft())
+                if line:
+                    yield line
+
+        keyframe = selector.finish()
+        if keyframe is not None:
+            submit(keyframe)
+        while pending:
+            line = result_line(*pending.popleft())
+            if line:
+                yield line
+
+        SCAN_DURATION.labels(method='video').observe(time.time() - started)
+        logger.info("video_scan_complete", user_id=user_id, **counts)
+        yield json.dumps(dict(counts, done=True)) + '\n'
+
+    def cleanup():
+        # Runs even if the client disconnects before the stream starts
+        if capture is not None:
+            capture.release()
+        if video_path and os.path.exists(video_path):
+            os.remove(video_path)
+
+    response = Response(generate(), mimetype='application/x-ndjson')
+    response.call_on_close(cleanup)
+    return response
+
 @app.route('/scan/live/start', methods=['POST'])
 @require_auth
 @limiter.limit("5 per minute")
 @metrics.counter('live_scan_sessions_total', 'Number of live scanning sessions started')
 def start_live_scan():
     user_id = request.user.get('id')
+    mode = (request.get_json(silent=True) or {}).get('mode', 'camera')
+    if mode not in ('camera', 'push'):
+        return jsonify({'error': 'Invalid mode'}), 400
     
     # Clean up existing session if any
     session_manager.remove_session(user_id)
     
-    session = LiveScannerSession(user_id)
+    session = LiveScannerSession(user_id, mode=mode)
     if not session.start():
         return jsonify({'error': 'Failed to start camera'}), 500
         
@@ -464,12 +3905,14 @@ def start_live_scan():
     logger.info("live_session_started", user_id=user_id)
     return jsonify({
         'message': 'Live scanning session started',
+        'mode': mode,
         'userId': user_id
     })
 
 @app.route('/scan/live/frame', methods=['GET'])
 @require_auth
 @limiter.limit("60 per minute")
+@route_to_session_owner
 def get_live_frame():
     user_id = request.user.get('id')
     
@@ -487,6 +3930,146 @@ def get_live_frame():
         'result': session.get_scan_result()
     })
 
+@app.route('/scan/live/stream', methods=['GET'])
+@require_stream_auth
+@limiter.limit("10 per minute")
+@limit_live_streams('preview')
+@route_to_session_owner
+def stream_live_frames():
+    """MJPEG preview of the live session (multipart/x-mixed-replace)"""
+    session = session_manager.get_session(request.user.get('id'))
+    if not session:
+        return jsonify({'error': 'No active scanning session'}), 404
+
+    def generate():
+        frame_seq = -1
+        min_interval = 1.0 / LIVE_PREVIEW_MAX_FPS
+        while session.active:
+            if not session.wait_for(lambda: session.frame_seq != frame_seq, timeout=5.0):
+                continue
+            frame_seq, jpeg = session.get_preview_jpeg()
+            if jpeg is not None:
+                yield (
+                    b'--frame\r\nContent-Type: image/jpeg\r\nContent-Length: '
+                    + str(len(jpeg)).encode() + b'\r\n\r\n' + jpeg + b'\r\n'
+                )
+            time.sleep(min_interval)
+
+    return Response(
+        generate(),
+        mimetype='multipart/x-mixed-replace; boundary=frame',
+        headers={'Cache-Control': 'no-cache'}
+    )
+
+@app.route('/scan/live/events', methods=['GET'])
+@require_stream_auth
+@limiter.limit("10 per minute")
+@limit_live_streams('events')
+@route_to_session_owner
+def stream_live_results():
+    """Server-Sent Events stream of live scan results"""
+    session = session_manager.get_session(request.user.get('id'))
+    if not session:
+        return jsonify({'error': 'No active scanning session'}), 404
+
+    def generate():
+        result_seq = session.result_seq
+        yield 'retry: 2000\n\n'
+        while session.active:
+            if session.wait_for(lambda: session.result_seq != result_seq, timeout=15.0):
+                with session.updates:
+                    result_seq, update = session.result_seq, session.latest_result
+                if update is not None:
+                    yield f'event: result\ndata: {json.dumps(update)}\n\n'
+            else:
+                yield ': keepalive\n\n'
+        yield 'event: end\ndata: {}\n\n'
+
+    return Response(
+        generate(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def acquire_push_session(user_id):
+    """The user's push session, started here and taken over from whichever worker ran it if needed"""
+    session = session_manager.get_session(user_id)
+    if session is None or session.mode != 'push':
+        session_manager.remove_session(user_id)
+        session = LiveScannerSession(user_id, mode='push')
+        session.start()
+        session_manager.add_session(user_id, session)
+    return session
+
+def handle_socket_message(session, message):
+    """Apply one client WebSocket message to a push session.
+
+    Returns (keep going, reply to send or None); the client stops with {"type": "stop"}.
+    """
+    if isinstance(message, bytes):
+        if len(message) > LIVE_MAX_FRAME_BYTES:
+            LIVE_PUSHED_FRAMES.labels(result='rejected').inc()
+            return True, json.dumps({'type': 'error', 'error': 'Frame too large'})
+        session.push_frame(message)
+    elif message:
+        try:
+            control = json.loads(message)
+        except ValueError:
+            control = {}
+        if control.get('type') == 'stop':
+            return False, None
+    return True, None
+
+def socket_result_message(session):
+    """The result message for a new live scan result, or None"""
+    result, card = session.get_scan_update()
+    if not result:
+        return None
+    return json.dumps({'type': 'result', 'result': result, 'card': card})
+
+sock = Sock(app)
+
+@sock.route('/scan/live/ws')
+def live_scan_socket(ws):
+    """Live scanning over a WebSocket: binary frames in, JSON scan results out.
+
+    Browsers cannot set headers on WebSocket requests, so the JWT may also be
+    passed as a `token` query parameter. In ASGI mode AsgiBridge.live_socket
+    serves this route instead.
+    """
+    token = get_request_token(allow_query=True)
+    payload, error = authenticate_token(token) if token else (None, 'Missing authentication')
+    if payload is None:
+        ws.close(reason=1008, message=error)
+        return
+
+    if not live_streams.acquire('socket'):
+        ws.close(reason=1013, message='Too many live streams')
+        return
+
+    user_id = payload.get('id')
+    try:
+        session = acquire_push_session(user_id)
+        logger.info("live_socket_connected", user_id=user_id)
+        ws.send(json.dumps({'type': 'ready', 'userId': user_id}))
+
+        try:
+            while session.active:
+                keep_going, reply = handle_socket_message(session, ws.receive(timeout=LIVE_SOCKET_POLL_INTERVAL))
+                if reply:
+                    ws.send(reply)
+                if not keep_going:
+                    break
+                update = socket_result_message(session)
+                if update:
+                    ws.send(update)
+        finally:
+            if session_manager.get_session(user_id) is session:
+                session_manager.remove_session(user_id)
+            logger.info("live_socket_closed", user_id=user_id)
+    finally:
+        live_streams.release('socket')
+
 @app.route('/scan/live/stop', methods=['POST'])
 @require_auth
 def stop_live_scan():
@@ -499,6 +4082,162 @@ def stop_live_scan():
         'userId': user_id
     })
 
+@app.route('/internal/live/<user_id>/stop', methods=['POST'])
+def stop_owned_live_scan(user_id):
+    """Stop a session this worker owns; only reachable through the internal listener"""
+    if not is_forwarded_request():
+        return jsonify({'error': 'Not found'}), 404
+    session = session_manager.get_session(user_id)
+    if session is not None:
+        session_manager.remove_session(user_id)
+        logger.info("live_session_stopped", user_id=user_id, forwarded=True)
+    return jsonify({'stopped': session is not None})
+
+class WorkerStartup:
+    """Startup timings and readiness of this worker process.
+
+    With SERVER_PRELOAD the app is imported and preloaded once in the gunicorn
+    master; workers forked from it inherit that work and only run their own
+    warm-up scan before reporting ready.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.import_pid = os.getpid()
+        self.import_started = time.time() - (time.perf_counter() - IMPORT_STARTED)
+        self.import_seconds = None
+        self.preload_pid = None
+        self.preload_seconds = None
+        self._reset()
+
+    def _reset(self):
+        self.pid = os.getpid()
+        self.state = 'cold'  # then 'warming' and 'ready'
+        self.done = threading.Event()
+        self.warmup_seconds = None
+        self.warmup_error = None
+        self.time_to_ready = None
+
+    def begin(self):
+        """Claim this process' warm-up; False if it has already started"""
+        with self.lock:
+            if self.pid != os.getpid():
+                self._reset()
+            if self.state != 'cold':
+                return False
+            self.state = 'warming'
+            return True
+
+    def server_started(self):
+        """Wall-clock start of the process that imported the app (the master when preloaded)"""
+        try:
+            return psutil.Process(self.import_pid).create_time()
+        except psutil.Error:
+            return self.import_started
+
+    def phase_seconds(self):
+        """What each phase cost this process; work inherited from the master cost it nothing"""
+        pid = os.getpid()
+        return {
+            'import': self.import_seconds if self.import_pid == pid else 0.0,
+            'preload': self.preload_seconds if self.preload_pid == pid else 0.0,
+            'warmup': self.warmup_seconds,
+        }
+
+    def mark_ready(self, warmup_seconds, error=None):
+        with self.lock:
+            self.warmup_seconds = warmup_seconds
+            self.warmup_error = error
+            self.time_to_ready = time.time() - self.server_started()
+            self.state = 'ready'
+        for phase, seconds in self.phase_seconds().items():
+            WORKER_STARTUP_SECONDS.labels(phase=phase).set(seconds or 0.0)
+        WORKER_TIME_TO_READY.set(self.time_to_ready)
+        WORKER_READY.set(1)
+        self.done.set()
+        logger.info("worker_ready", time_to_ready=round(self.time_to_ready, 3), preloaded=self.preloaded,
+                    warmup_error=error, **{f'{phase}_seconds': seconds for phase, seconds in self.phase_seconds().items()})
+
+    @property
+    def preloaded(self):
+        return self.preload_pid is not None and self.preload_pid != os.getpid()
+
+    def status(self):
+        with self.lock:
+            state = self.state if self.pid == os.getpid() else 'cold'
+            return {
+                'ready': state == 'ready',
+                'state': state,
+                'worker': worker_id(),
+                'preloaded': self.preloaded,
+                'timeToReady': self.time_to_ready if state == 'ready' else None,
+                'startup': self.phase_seconds() if state == 'ready' else None,
+                'warmupError': self.warmup_error if state == 'ready' else None,
+            }
+
+startup = WorkerStartup()
+
+def synthetic_card_jpeg():
+    """A photo of a plain card with a name line, for warm-up scans"""
+    card = np.full((CARD_HEIGHT, CARD_WIDTH), 235, dtype=np.uint8)
+    cv2.rectangle(card, (0, 0), (CARD_WIDTH - 1, CARD_HEIGHT - 1), 20, 24)
+    x0, _, _, y1 = CARD_REGIONS['name']
+    cv2.putText(card, 'Warm Up', (int(x0 * CARD_WIDTH) + 8, int(y1 * CARD_HEIGHT) - 10),
+                cv2.FONT_HERSHEY_SIMPLEX, 1.1, 0, 2, cv2.LINE_AA)
+    photo = np.full((CARD_HEIGHT + 320, CARD_WIDTH + 270), 96, dtype=np.uint8)
+    photo[160:160 + CARD_HEIGHT, 135:135 + CARD_WIDTH] = card
+    return cv2.imencode('.jpg', photo, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes()
+
+def preload():
+    """Do the startup work workers can share, in a gunicorn master before it forks them.
+
+    Imports the lazily imported modules this configuration uses, maps the card
+    and visual indexes, and loads every OCR engine's language model. Workers
+    inherit all of it copy-on-write. No threads are started here.
+    """
+    started = time.perf_counter()
+    modules = [name for name in LAZY_MODULES if not (
+        (name == 'pytesseract' and tesserocr is not None) or (name == 'redis' and not REDIS_URL)
+    )]
+    for name in modules:
+        getattr(sys.modules[name], '__name__')  # forces the deferred import
+    get_card_index()
+    get_visual_index()
+    ocr_pool.preload()
+    startup.preload_pid = os.getpid()
+    startup.preload_seconds = time.perf_counter() - started
+    logger.info("preload_complete", modules=modules, ocr_engines=ocr_pool.size,
+                import_seconds=round(startup.import_seconds, 3), preload_seconds=round(startup.preload_seconds, 3))
+
+def run_warm_up():
+    """Scan a synthetic card through the real pipeline (scheduler, OCR, card lookup), then report ready"""
+    started = time.perf_counter()
+    error = None
+    if collection_writer.enabled:
+        # Replay anything left in the journal by a previous run
+        collection_writer.start()
+    if STARTUP_WARMUP:
+        context = scan_context('warmup', CARD_IDENTIFY_MODE)
+        context.run(scan_cache_bypass.set, True)
+        try:
+            context.run(scan_image_bytes, synthetic_card_jpeg(), session='warmup')
+        except Exception as e:
+            # A worker that cannot warm up still serves; the failure shows in /ready and /health
+            error = str(e)
+            SCAN_ERRORS.labels(error_type='warmup').inc()
+            logger.error("warmup_error", error=error, traceback=traceback.format_exc())
+    startup.mark_ready(time.perf_counter() - started, error)
+
+def warm_up(wait=True):
+    """Warm this worker up once; server hooks wait for it, /ready starts it in the background"""
+    if startup.begin():
+        if wait:
+            run_warm_up()
+        else:
+            threading.Thread(target=run_warm_up, name='warm-up', daemon=True).start()
+    elif wait:
+        startup.done.wait()
+
 @app.route('/metrics')
 def metrics():
     return Response(metrics.generate_metrics(), mimetype='text/plain')
@@ -519,8 +4258,10 @@ def health_check():
     health_status = {
         'status': 'healthy',
         'timestamp': time.time(),
-        'active_sessions': len(session_manager.sessions),
+        'active_sessions': session_manager.count(),
+        'local_sessions': len(session_manager.sessions),
         'tessdata_available': has_tessdata,
+        'ocr_engine': ocr_pool.engine_name,
         'system': system_info,
         'version': os.getenv('APP_VERSION', '1.0.0')
     }
@@ -538,6 +4279,42 @@ def health_check():
     
     return jsonify(health_status), status_code
 
+@app.route('/ready')
+@limiter.exempt
+def readiness_check():
+    """Readiness probe: 503 until this worker has run its warm-up scan"""
+    # Normally a server hook has already warmed the worker; otherwise start now
+    warm_up(wait=False)
+    status = startup.status()
+    return jsonify(status), 200 if status['ready'] else 503
+
+@app.route('/debug/profile', methods=['GET'])
+@require_auth
+@limiter.limit("2 per minute")
+def debug_profile():
+    """Profile this worker for ?seconds=N and return collapsed stacks for a flame graph"""
+    if not DEBUG_PROFILE_ENABLED:
+        return jsonify({'error': 'Not found'}), 404
+    try:
+        seconds = float(request.args.get('seconds', '10'))
+    except ValueError:
+        seconds = 0
+    if not 0 < seconds <= PROFILE_MAX_SECONDS:
+        return jsonify({'error': f'seconds must be greater than 0 and at most {PROFILE_MAX_SECONDS:g}'}), 400
+    if not _profile_lock.acquire(blocking=False):
+        return jsonify({'error': 'A profile is already running'}), 409
+    try:
+        stacks, rounds = sample_stacks(seconds)
+    finally:
+        _profile_lock.release()
+
+    logger.info("profile_collected", user_id=request.user.get('id'), seconds=seconds, rounds=rounds, stacks=len(stacks))
+    return Response(
+        ''.join(f'{stack} {count}\n' for stack, count in sorted(stacks.items())),
+        mimetype='text/plain',
+        headers={'X-Profile-Worker': worker_id(), 'X-Profile-Samples': str(rounds)}
+    )
+
 @app.errorhandler(429)
 def ratelimit_handler(e):
     logger.warn("rate_limit_exceeded", 
@@ -545,6 +4322,13 @@ def ratelimit_handler(e):
                endpoint=request.endpoint)
     return jsonify({'error': 'Rate limit exceeded'}), 429
 
+@app.errorhandler(413)
+def request_too_large_handler(e):
+    logger.warn("request_too_large",
+               endpoint=request.endpoint,
+               content_length=request.content_length)
+    return jsonify({'error': 'Request too large'}), 413
+
 @app.errorhandler(Exception)
 def handle_error(e):
     code = 500
@@ -565,16 +4349,314 @@ def handle_error(e):
         'detail': str(e) if app.debug else 'Internal server error'
     }), code
 
-@app.teardown_appcontext
-def cleanup(exception=None):
-    for user_id, session in list(session_manager.sessions.items()):
-        session.stop()
-    session_manager.sessions.clear()
+class AsgiBridge:
+    """Serves the Flask app over ASGI, e.g. `uvicorn app:asgi_app`.
+
+    Connections, request bodies and response writes live on the event loop,
+    so idle keep-alives, slow uploads and slow readers hold no thread. A
+    request reaches the Flask app (auth, limiter, decode) in a thread pool only
+    once its whole body has arrived, and its response is produced there one
+    chunk at a time. OCR stays on the OCR scheduler and batch scans on their
+    process pool. Health, readiness and metrics probes have their own pool so
+    they answer while every scan thread is busy, and the long-lived live
+    preview and event streams have theirs so they cannot starve uploads. The
+    live WebSocket is served natively on the loop.
+    """
+
+    PROBE_PATHS = ('/health', '/ready', '/metrics')
+    STREAM_PATHS = ('/scan/live/stream', '/scan/live/events')
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+        self._pools = None
+        self._pools_pid = None
+        self._lock = threading.Lock()
+
+    def pool(self, kind):
+        """Thread pools for 'request', 'stream' and 'probe' work, created lazily in each worker process"""
+        with self._lock:
+            if self._pools is None or self._pools_pid != os.getpid():
+                self._pools = {
+                    kind: ThreadPoolExecutor(max_workers=size, thread_name_prefix=f'asgi-{kind}')
+                    for kind, size in (
+                        ('request', ASGI_REQUEST_THREADS),
+                        ('stream', ASGI_STREAM_THREADS),
+                        ('probe', ASGI_PROBE_THREADS),
+                    )
+                }
+                self._pools_pid = os.getpid()
+            return self._pools[kind]
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            await self.http(scope, receive, send)
+        elif scope['type'] == 'websocket':
+            if scope['path'] == '/scan/live/ws':
+                await self.live_socket(scope, receive, send)
+            else:
+                await send({'type': 'websocket.close', 'code': 1008})
+        elif scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                # uvicorn accepts connections only once startup completes
+                await asyncio.get_running_loop().run_in_executor(self.pool('request'), warm_up)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await asyncio.get_running_loop().run_in_executor(self.pool('request'), session_manager.stop_all)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def read_body(self, scope, receive):
+        """Buffer the request body (spooling large ones to disk); None if the client went away.
+
+        Oversized bodies are not read: the app sees their length and answers 413 itself.
+        """
+        length = dict(scope['headers']).get(b'content-length')
+        length = int(length) if length and length.isdigit() else None
+        if length is not None and length > SCAN_MAX_REQUEST_BYTES:
+            return io.BytesIO(), length
+        body = tempfile.SpooledTemporaryFile(max_size=ASGI_SPOOL_BYTES)
+        size = 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                body.close()
+                return None
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > SCAN_MAX_REQUEST_BYTES:
+                body.close()
+                return io.BytesIO(), size
+            body.write(chunk)
+            if not message.get('more_body'):
+                break
+        body.seek(0)
+        return body, size
+
+    def environ(self, scope, body, length):
+        server = scope.get('server') or ('localhost', 80)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+            'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope['query_string'].decode('latin-1'),
+            'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1] or 80),
+            'REMOTE_ADDR': scope['client'][0] if scope.get('client') else '',
+            'CONTENT_LENGTH': str(length),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': body,
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+        }
+        for name, value in scope['headers']:
+            name = name.decode('latin-1').upper().replace('-', '_')
+            if name in ('CONTENT_LENGTH', 'TRANSFER_ENCODING'):
+                # The body is passed on whole, with the length it turned out to have
+                continue
+            key = name if name == 'CONTENT_TYPE' else f'HTTP_{name}'
+            value = value.decode('latin-1')
+            environ[key] = f'{environ[key]},{value}' if key in environ else value
+        return environ
+
+    async def http(self, scope, receive, send):
+        path = scope['path']
+        kind = 'probe' if path in self.PROBE_PATHS else 'stream' if path in self.STREAM_PATHS else 'request'
+        with ASGI_REQUESTS.labels(pool=kind, state='receiving').track_inprogress():
+            received = await self.read_body(scope, receive)
+        if received is None:
+            return
+        body, length = received
+
+        loop = asyncio.get_running_loop()
+        pool = self.pool(kind)
+        # Every call for this request runs in one context, so request-scoped
+        # contextvars (request id, scan labels) carry over into streamed chunks
+        context = contextvars.copy_context()
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started['status'] = int(status.split(' ', 1)[0])
+            started['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+
+        def call(fn, *args):
+            return loop.run_in_executor(pool, context.run, fn, *args)
+
+        disconnected = asyncio.ensure_future(self.wait_for_disconnect(receive))
+        end = object()
+        with ASGI_REQUESTS.labels(pool=kind, state='running').track_inprogress():
+            try:
+                chunks = await call(self.wsgi_app, self.environ(scope, body, length), start_response)
+                try:
+                    iterator = iter(chunks)
+                    sent_headers = False
+                    while not disconnected.done():
+                        chunk = await call(next, iterator, end)
+                        if chunk is end:
+                            break
+                        if not sent_headers:
+                            await send({'type': 'http.response.start', 'status': started['status'],
+                                        'headers': started['headers']})
+                            sent_headers = True
+                        if chunk:
+                            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+                    if not sent_headers:
+                        await send({'type': 'http.response.start', 'status': started['status'],
+                                    'headers': started['headers']})
+                    await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+                finally:
+                    # Stops streaming generators when the client went away
+                    if hasattr(chunks, 'close'):
+                        await call(chunks.close)
+            finally:
+                disconnected.cancel()
+                body.close()
+
+    async def wait_for_disconnect(self, receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    async def live_socket(self, scope, receive, send):
+        """The live WebSocket of live_scan_socket, with frames and results handled on the loop"""
+        if (await receive())['type'] != 'websocket.connect':
+            return
+        headers = dict(scope['headers'])
+        authorization = headers.get(b'authorization', b'').decode('latin-1')
+        token = authorization.split(' ')[1] if authorization.startswith('Bearer ') else None
+        if token is None:
+            query = dict(urllib.parse.parse_qsl(scope['query_string'].decode('latin-1')))
+            token = query.get('token')
+        payload, error = authenticate_token(token) if token else (None, 'Missing authentication')
+        await send({'type': 'websocket.accept'})
+        if payload is None:
+            await send({'type': 'websocket.close', 'code': 1008, 'reason': error})
+            return
+
+        if not live_streams.acquire('socket'):
+            await send({'type': 'websocket.close', 'code': 1013, 'reason': 'Too many live streams'})
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+            pool = self.pool('request')
+            user_id = payload.get('id')
+            with ASGI_REQUESTS.labels(pool='socket', state='running').track_inprogress():
+                session = await loop.run_in_executor(pool, acquire_push_session, user_id)
+                logger.info("live_socket_connected", user_id=user_id)
+                await send({'type': 'websocket.send', 'text': json.dumps({'type': 'ready', 'userId': user_id})})
+
+                pending = None
+                closed = False
+                try:
+                    while session.active:
+                        if pending is None:
+                            pending = asyncio.ensure_future(receive())
+                        done, _ = await asyncio.wait({pending}, timeout=LIVE_SOCKET_POLL_INTERVAL)
+                        message = None
+                        if done:
+                            event, pending = pending.result(), None
+                            if event['type'] == 'websocket.disconnect':
+                                closed = True
+                                break
+                            message = event.get('bytes') if event.get('bytes') is not None else event.get('text')
+                        keep_going, reply = handle_socket_message(session, message)
+                        if reply:
+                            await send({'type': 'websocket.send', 'text': reply})
+                        if not keep_going:
+                            break
+                        update = socket_result_message(session)
+                        if update:
+                            await send({'type': 'websocket.send', 'text': update})
+                finally:
+                    if pending is not None:
+                        pending.cancel()
+                    if not closed:
+                        await send({'type': 'websocket.close', 'code': 1000})
+                    if session_manager.get_session(user_id) is session:
+                        await loop.run_in_executor(pool, session_manager.remove_session, user_id)
+                    logger.info("live_socket_closed", user_id=user_id)
+        finally:
+            live_streams.release('socket')
+
+asgi_app = AsgiBridge(app)
+
+# Stop live sessions when the worker exits; an app-context teardown would
+# run after every request and kill sessions between calls
+@atexit.register
+def cleanup():
+    session_manager.stop_all()
+
+@app.cli.command('build-card-index')
+@click.argument('catalog_path')
+@click.argument('index_dir', required=False)
+def build_card_index_command(catalog_path, index_dir=None):
+    """Build the memory-mapped card name index from a Scryfall bulk-data file"""
+    index_dir = index_dir or CARD_INDEX_DIR or f'{catalog_path}.{int(os.path.getmtime(catalog_path))}.index'
+    if os.path.isdir(index_dir):
+        shutil.rmtree(index_dir)
+    index = CardNameIndex.build(catalog_path, index_dir)
+    click.echo(f'Indexed {len(index)} card names into {index_dir}')
+
+@app.cli.command('build-visual-index')
+@click.argument('images_dir')
+@click.argument('index_dir', required=False)
+@click.option('--catalog', default=CARD_CATALOG_PATH, help='Scryfall bulk-data file used to name the cards')
+def build_visual_index_command(images_dir, index_dir=None, catalog=None):
+    """Build the memory-mapped visual index from a directory of reference card images named <card id>.<ext>"""
+    index_dir = index_dir or VISUAL_INDEX_DIR or f'{images_dir.rstrip(os.sep)}.visual-index'
+    names = None
+    if catalog:
+        with open(catalog, 'rb') as f:
+            names = {card['id']: card['name'] for card in json.load(f) if card.get('id') and card.get('name')}
+    if os.path.isdir(index_dir):
+        shutil.rmtree(index_dir)
+    start = time.time()
+    index = VisualCardIndex.build(images_dir, index_dir, names=names)
+    click.echo(f'Indexed {len(index)} reference images into {index_dir} in {time.time() - start:.1f}s')
+
+@app.cli.command('record-frames')
+@click.argument('source')
+@click.argument('output')
+@click.option('--seconds', type=float, default=60.0, help='Stop after this many seconds of frames')
+def record_frames_command(source, output, seconds):
+    """Record frames from a source spec (device:0, video:clip.mp4, images:dir) for replay:<output>"""
+    # Files are read as fast as they decode; their own timestamps are recorded
+    try:
+        frames = create_frame_source(source, speed=0, loop=False)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    if not frames.open():
+        raise click.ClickException(f'Could not open {source}')
+    recorder = FrameRecorder(output)
+    started = time.monotonic()
+    try:
+        while not frames.finished:
+            frame = frames.read()
+            elapsed = frames.timestamp if frames.timestamp is not None else time.monotonic() - started
+            if elapsed >= seconds:
+                break
+            if frame is not None and not recorder.write(frame, frames.encoded, frames.timestamp):
+                break
+    finally:
+        frames.close()
+        recorder.close()
+    click.echo(f'Recorded {recorder.frames} frames ({recorder.size / 1e6:.1f} MB) into {output}')
+
+startup.import_seconds = time.perf_counter() - IMPORT_STARTED
 
 if __name__ == '__main__':
     try:
         # Test Tesseract availability
         pytesseract.get_tesseract_version()
+        warm_up()
         logger.info("starting_server", host="0.0.0.0", port=5000, debug=app.debug)
         app.run(host='0.0.0.0', port=5000)
     except Exception as e:
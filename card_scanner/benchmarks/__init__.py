@@ -0,0 +1 @@
+"""Synthetic-corpus benchmarks and load tests for the card scanner (see README.md)"""
@@ -0,0 +1,133 @@
+"""Shared helpers for the card scanner benchmarks"""
+
+import json
+import os
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+SCANNER_DIR = os.path.dirname(BENCHMARK_DIR)
+RESULT_FORMAT = 1
+
+
+def load_app(corpus_dir=None, cache=False):
+    """Import the scanner in-process, configured for benchmarking.
+
+    The OCR result cache is disabled unless `cache` is set (repeated corpus
+    images would otherwise be served from it), and the corpus catalog is used
+    to resolve cards unless CARD_CATALOG_PATH is already set. Must be called
+    before anything else imports app.
+    """
+    os.environ.setdefault('JWT_SECRET', 'benchmark-secret-' + 'x' * 32)
+    if not cache:
+        os.environ['SCAN_CACHE_SIZE'] = '0'
+        os.environ['SCAN_CACHE_REDIS'] = 'false'
+    if corpus_dir and not os.getenv('CARD_CATALOG_PATH'):
+        catalog = os.path.join(corpus_dir, 'catalog.json')
+        if os.path.exists(catalog):
+            os.environ['CARD_CATALOG_PATH'] = catalog
+            os.environ.setdefault('CARD_INDEX_DIR', os.path.join(corpus_dir, 'catalog.index'))
+    if SCANNER_DIR not in sys.path:
+        sys.path.insert(0, SCANNER_DIR)
+
+    import app
+    app.limiter.enabled = False
+    return app
+
+
+def load_corpus(corpus_dir):
+    with open(os.path.join(corpus_dir, 'ground_truth.json')) as f:
+        truth = json.load(f)
+    for entry in truth['images']:
+        with open(os.path.join(corpus_dir, entry['file']), 'rb') as f:
+            entry['data'] = f.read()
+    return truth
+
+
+def percentile(values, q):
+    """Linear-interpolated percentile of a list (q in 0-100); None when empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def latency_summary(seconds):
+    """p50/p95/p99/mean/max of a list of durations, in milliseconds"""
+    if not seconds:
+        return None
+    return {
+        'p50': round(percentile(seconds, 50) * 1000, 3),
+        'p95': round(percentile(seconds, 95) * 1000, 3),
+        'p99': round(percentile(seconds, 99) * 1000, 3),
+        'mean': round(sum(seconds) / len(seconds) * 1000, 3),
+        'max': round(max(seconds) * 1000, 3),
+    }
+
+
+def cpu_count():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF):
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def cpu_seconds():
+    """User + system CPU time of this process and its waited-for children"""
+    usage = [resource.getrusage(who) for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+    return sum(u.ru_utime + u.ru_stime for u in usage)
+
+
+def git_revision():
+    def git(*args):
+        return subprocess.run(
+            ['git', *args], cwd=SCANNER_DIR, capture_output=True, text=True, timeout=10
+        ).stdout.strip()
+    try:
+        return {'commit': git('rev-parse', 'HEAD') or None, 'dirty': bool(git('status', '--porcelain', '--', '.'))}
+    except (OSError, subprocess.SubprocessError):
+        return {'commit': None, 'dirty': None}
+
+
+def environment_meta(app, benchmark, config):
+    import cv2
+    import numpy as np
+
+    return {
+        'format': RESULT_FORMAT,
+        'benchmark': benchmark,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        **git_revision(),
+        'host': socket.gethostname(),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'opencv': cv2.__version__,
+        'numpy': np.__version__,
+        'cpus': cpu_count(),
+        'ocrEngine': app.ocr_pool.engine_name,
+        'ocrPoolSize': app.OCR_POOL_SIZE,
+        'config': config,
+    }
+
+
+def write_results(path, meta, results):
+    """Print the results and, with a path, write them as JSON for benchmarks.compare"""
+    document = {'meta': meta, 'results': results}
+    text = json.dumps(document, indent=2, sort_keys=True)
+    if path:
+        with open(path, 'w') as f:
+            f.write(text + '\n')
+    print(text)
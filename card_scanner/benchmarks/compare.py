@@ -0,0 +1,107 @@
+"""Compare two benchmark result files and flag regressions.
+
+    python -m benchmarks.compare <baseline.json> <candidate.json> [--threshold 10]
+
+Every numeric result is flattened to a dotted key (e.g. latencyMs.p95,
+stages.ocr.otsu.p50). Latencies, CPU time, memory and error counts are better
+when lower; throughput and accuracy are better when higher; anything else is
+shown for information. Exits with status 1 when any metric got worse by more
+than the threshold (percent), so it can gate CI.
+"""
+
+import argparse
+import json
+import sys
+
+# (key fragment, direction): the first fragment found in a key decides it
+DIRECTIONS = (
+    ('accuracy.rate', 'higher'),
+    ('PerSecond', 'higher'),
+    ('latencyMs', 'lower'),
+    ('cpuSeconds', 'lower'),
+    ('peakRssMb', 'lower'),
+    ('errors', 'lower'),
+    ('DropRate', 'lower'),
+    ('lagSeconds', 'lower'),
+    ('undetected', 'lower'),
+    ('stages.', 'lower'),
+)
+
+
+def flatten(value, prefix=''):
+    if isinstance(value, dict):
+        flat = {}
+        for key, item in value.items():
+            flat.update(flatten(item, f'{prefix}{key}.'))
+        return flat
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {prefix.rstrip('.'): value}
+    return {}
+
+
+def direction(key):
+    for fragment, better in DIRECTIONS:
+        if fragment in key:
+            return better
+    return None
+
+
+def compare(baseline, candidate, threshold):
+    """Rows of (key, baseline, candidate, change %, verdict) for keys present in both"""
+    old, new = flatten(baseline['results']), flatten(candidate['results'])
+    rows = []
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key], new[key]
+        better = direction(key)
+        if before == after:
+            change = 0.0
+        elif before == 0:
+            change = float('inf') if after > 0 else float('-inf')
+        else:
+            change = (after - before) / abs(before) * 100
+        verdict = ''
+        if better is not None and abs(change) > threshold:
+            worse = change > 0 if better == 'lower' else change < 0
+            verdict = 'REGRESSION' if worse else 'improved'
+        rows.append((key, before, after, change, verdict))
+    return rows
+
+
+def describe(meta):
+    commit = (meta.get('commit') or 'unknown')[:10] + ('+dirty' if meta.get('dirty') else '')
+    return f"{meta.get('benchmark')} @ {commit} on {meta.get('host')} ({meta.get('cpus')} cpus, {meta.get('ocrEngine')})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=10.0, help='percent change that counts as a regression')
+    parser.add_argument('--all', action='store_true', help='also list metrics that did not move past the threshold')
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    print(f"baseline:  {describe(baseline['meta'])}")
+    print(f"candidate: {describe(candidate['meta'])}")
+    if baseline['meta'].get('benchmark') != candidate['meta'].get('benchmark'):
+        print('warning: the files are from different benchmarks', file=sys.stderr)
+    if baseline['meta'].get('config') != candidate['meta'].get('config'):
+        print('warning: the benchmark configuration differs', file=sys.stderr)
+
+    rows = compare(baseline, candidate, args.threshold)
+    width = max((len(row[0]) for row in rows), default=10)
+    for key, before, after, change, verdict in rows:
+        if verdict or args.all:
+            print(f'{key:<{width}}  {before:>12g}  {after:>12g}  {change:>+8.1f}%  {verdict}')
+
+    regressions = [row for row in rows if row[4] == 'REGRESSION']
+    print(f'{len(regressions)} regression(s) beyond {args.threshold:g}%')
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+"""Render a synthetic, reproducible corpus of card photos with ground truth.
+
+    python -m benchmarks.corpus <out_dir> [--count 200] [--seed 1]
+
+Cards are drawn with PIL in the layout the scanner expects (title bar, art box,
+type line, collector strip), named from card_names.txt, then photographed onto
+a background with perspective, scale and one of the VARIANTS applied. The
+output directory holds:
+
+    images/           single-card photos and binder-page spreads (JPEG)
+    references/       clean card renders named <card id>.png, for build-visual-index
+    catalog.json      Scryfall-style catalog of every printing (id, name, set, collector_number)
+    ground_truth.json what each image shows
+"""
+
+import argparse
+import json
+import os
+import zlib
+
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from .common import BENCHMARK_DIR
+
+CORPUS_FORMAT = 1
+CARD_SIZE = (630, 880)  # the scanner's canonical card size
+PHOTO_SIZE = (1200, 1600)
+VARIANTS = ('clean', 'noise', 'blur', 'rotation', 'glare')
+SET_CODES = ('BNC', 'SYN', 'GEN', 'TST', 'MOK', 'QRX')
+FRAME_COLORS = (
+    (214, 208, 196),  # white
+    (96, 140, 200),   # blue
+    (60, 58, 62),     # black
+    (196, 88, 64),    # red
+    (92, 150, 96),    # green
+    (206, 172, 92),   # gold
+    (150, 150, 160),  # artifact
+)
+TYPE_LINES = (
+    'Instant', 'Sorcery', 'Creature — Human Wizard', 'Creature — Elf Druid',
+    'Legendary Planeswalker', 'Artifact', 'Enchantment', 'Land',
+)
+RARITIES = 'CURM'
+FONT_CANDIDATES = (
+    '/usr/share/fonts/truetype/dejavu/DejaVuSerif-Bold.ttf',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+    '/Library/Fonts/Arial Bold.ttf',
+)
+
+
+def load_names(path=None):
+    with open(path or os.path.join(BENCHMARK_DIR, 'card_names.txt'), encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def font(size, path=None):
+    for candidate in ((path,) if path else FONT_CANDIDATES):
+        if candidate and os.path.exists(candidate):
+            return ImageFont.truetype(candidate, size)
+    return ImageFont.load_default(size)
+
+
+def fitted_font(draw, text, max_width, size, font_path=None):
+    """Largest font up to `size` that fits text into max_width"""
+    while size > 10:
+        face = font(size, font_path)
+        if draw.textlength(text, font=face) <= max_width:
+            return face
+        size -= 1
+    return font(size, font_path)
+
+
+def build_printings(names, rng):
+    """One to three printings per name, each with a set code and collector number"""
+    printings = []
+    for name in names:
+        for set_code in rng.choice(SET_CODES, size=int(rng.integers(1, 4)), replace=False):
+            number = int(rng.integers(1, 400))
+            printings.append({
+                'id': f'{set_code.lower()}-{number:04d}',
+                'name': name,
+                'set': set_code.lower(),
+                'collector_number': str(number),
+                'rarity': str(rng.choice(list(RARITIES))),
+            })
+    # Collector numbers collide now and then; keep the first printing of each id
+    unique = {}
+    for printing in printings:
+        unique.setdefault(printing['id'], printing)
+    return list(unique.values())
+
+
+def render_card(printing, font_path=None):
+    """Draw a card face for a printing; the art is seeded by the card id so reprints differ"""
+    width, height = CARD_SIZE
+    rng = np.random.default_rng(zlib.crc32(printing['id'].encode('utf-8')))
+    frame = FRAME_COLORS[int(rng.integers(len(FRAME_COLORS)))]
+
+    card = Image.new('RGB', CARD_SIZE, (12, 12, 14))
+    draw = ImageDraw.Draw(card)
+    draw.rounded_rectangle((20, 20, width - 21, height - 38), radius=14, fill=frame)
+
+    def box(x0, y0, x1, y1, fill):
+        draw.rectangle((int(x0 * width), int(y0 * height), int(x1 * width), int(y1 * height)), fill=fill)
+
+    # Title bar, in the scanner's 'name' region
+    box(0.04, 0.035, 0.96, 0.095, (236, 232, 222))
+    name_font = fitted_font(draw, printing['name'], 0.72 * width, 34, font_path)
+    draw.text((0.055 * width, 0.065 * height), printing['name'], font=name_font, fill=(16, 16, 16), anchor='lm')
+    for index in range(int(rng.integers(1, 4))):
+        draw.ellipse((width * (0.88 - index * 0.05) - 11, 0.065 * height - 11,
+                      width * (0.88 - index * 0.05) + 11, 0.065 * height + 11), fill=(180, 170, 150))
+
+    # Art: a smooth random field with a few shapes
+    art_box = (int(0.08 * width), int(0.11 * height), int(0.92 * width), int(0.55 * height))
+    art_size = (art_box[2] - art_box[0], art_box[3] - art_box[1])
+    field = cv2.resize(rng.integers(0, 255, (5, 7, 3)).astype(np.uint8), art_size, interpolation=cv2.INTER_CUBIC)
+    art = Image.fromarray(field)
+    art_draw = ImageDraw.Draw(art)
+    for _ in range(int(rng.integers(3, 8))):
+        x, y = int(rng.integers(0, art_size[0])), int(rng.integers(0, art_size[1]))
+        r = int(rng.integers(15, 90))
+        art_draw.ellipse((x - r, y - r, x + r, y + r), fill=tuple(int(c) for c in rng.integers(0, 255, 3)))
+    card.paste(art, art_box[:2])
+
+    # Type line, rules text box and collector strip
+    box(0.04, 0.555, 0.96, 0.612, (236, 232, 222))
+    type_line = TYPE_LINES[int(rng.integers(len(TYPE_LINES)))]
+    draw.text((0.055 * width, 0.584 * height), type_line, font=font(24, font_path), fill=(16, 16, 16), anchor='lm')
+    box(0.06, 0.625, 0.94, 0.9, (242, 238, 228))
+    text_font = font(18, font_path)
+    for line in range(int(rng.integers(2, 6))):
+        words = int(rng.integers(4, 9))
+        draw.text((0.08 * width, (0.65 + line * 0.045) * height), ' '.join(['lorem'] * words),
+                  font=text_font, fill=(40, 40, 40))
+
+    strip_font = font(15, font_path)
+    number = f"{int(printing['collector_number']):04d}/400 {printing['rarity']}"
+    draw.text((0.04 * width, 0.937 * height), number, font=strip_font, fill=(236, 236, 236))
+    draw.text((0.04 * width, 0.957 * height), f"{printing['set'].upper()} • EN", font=strip_font, fill=(236, 236, 236))
+    return cv2.cvtColor(np.asarray(card), cv2.COLOR_RGB2BGR)
+
+
+def background(rng, size):
+    """A table-like background: a color gradient with coarse texture"""
+    width, height = size
+    base = rng.integers(40, 200, 3).astype(np.float32)
+    gradient = np.linspace(0.8, 1.2, height, dtype=np.float32)[:, None, None]
+    texture = cv2.resize(rng.normal(0, 12, (height // 16, width // 16, 3)).astype(np.float32), size)
+    return np.clip(base * gradient + texture, 0, 255).astype(np.uint8)
+
+
+def place_card(scene, card, corners):
+    """Warp a card image onto the scene at the given corners (TL, TR, BR, BL)"""
+    height, width = card.shape[:2]
+    source = np.float32([[0, 0], [width - 1, 0], [width - 1, height - 1], [0, height - 1]])
+    matrix = cv2.getPerspectiveTransform(source, np.float32(corners))
+    cv2.warpPerspective(card, matrix, scene.shape[1::-1], dst=scene, borderMode=cv2.BORDER_TRANSPARENT)
+
+
+def card_corners(rng, center, card_height, angle, jitter):
+    """Corners of a card of the given height rotated by angle, with perspective jitter"""
+    half_h = card_height / 2
+    half_w = half_h * CARD_SIZE[0] / CARD_SIZE[1]
+    corners = np.float32([[-half_w, -half_h], [half_w, -half_h], [half_w, half_h], [-half_w, half_h]])
+    theta = np.deg2rad(angle)
+    rotation = np.float32([[np.cos(theta), -np.sin(theta)], [np.sin(theta), np.cos(theta)]])
+    corners = corners @ rotation.T + np.float32(center)
+    return corners + rng.normal(0, jitter, corners.shape).astype(np.float32)
+
+
+def apply_variant(scene, variant, rng, region):
+    """Return the photo degraded by variant; region is the card's (x0, y0, x1, y1)"""
+    if variant == 'noise':
+        scene = np.clip(scene + rng.normal(0, 14, scene.shape), 0, 255).astype(np.uint8)
+    elif variant == 'blur':
+        scene = cv2.GaussianBlur(scene, (0, 0), float(rng.uniform(1.8, 3.0)))
+    elif variant == 'glare':
+        x0, y0, x1, y1 = region
+        mask = np.zeros(scene.shape[:2], np.float32)
+        center = (int(rng.uniform(x0, x1)), int(rng.uniform(y0, (y0 + y1) / 2)))
+        axes = (int((x1 - x0) * rng.uniform(0.2, 0.4)), int((y1 - y0) * rng.uniform(0.08, 0.18)))
+        cv2.ellipse(mask, center, axes, float(rng.uniform(0, 180)), 0, 360, 1.0, -1)
+        mask = cv2.GaussianBlur(mask, (0, 0), max(axes) / 3.0)[..., None] * rng.uniform(0.6, 0.9)
+        scene = (scene * (1 - mask) + 255 * mask).astype(np.uint8)
+    return scene
+
+
+def photograph(card, variant, rng):
+    """A single-card photo of a rendered card under a variant"""
+    width, height = PHOTO_SIZE
+    scene = background(rng, PHOTO_SIZE)
+    card_height = height * rng.uniform(0.6, 0.78)
+    angle = rng.uniform(8, 25) * rng.choice([-1, 1]) if variant == 'rotation' else rng.normal(0, 2)
+    jitter = card_height * (0.025 if variant == 'rotation' else 0.01)
+    center = (width / 2 + rng.normal(0, width * 0.03), height / 2 + rng.normal(0, height * 0.03))
+    corners = card_corners(rng, center, card_height, angle, jitter)
+    place_card(scene, card, corners)
+    x0, y0 = corners.min(axis=0)
+    x1, y1 = corners.max(axis=0)
+    scene = apply_variant(scene, variant, rng, (x0, y0, x1, y1))
+    # Mild sensor noise and exposure shift on every photo
+    scene = np.clip(scene.astype(np.float32) * rng.uniform(0.85, 1.1) + rng.normal(0, 3, scene.shape), 0, 255)
+    return scene.astype(np.uint8)
+
+
+def spread(cards, rng):
+    """A 3x3 binder page of cards (row-major, as the scanner orders them)"""
+    width, height = 2400, 3000
+    scene = background(rng, (width, height))
+    page = (int(width * 0.05), int(height * 0.05), int(width * 0.95), int(height * 0.95))
+    cv2.rectangle(scene, page[:2], page[2:], (30, 30, 36), -1)
+    cell_w, cell_h = (page[2] - page[0]) / 3, (page[3] - page[1]) / 3
+    for index, card in enumerate(cards):
+        row, col = divmod(index, 3)
+        center = (page[0] + (col + 0.5) * cell_w, page[1] + (row + 0.5) * cell_h)
+        place_card(scene, card, card_corners(rng, center, cell_h * 0.86, rng.normal(0, 1.5), 3))
+    return scene
+
+
+def generate(out_dir, count=200, seed=1, spreads=None, names_path=None, font_path=None, quality=88):
+    """Write `count` single-card photos (cycling through VARIANTS) and `spreads` binder pages"""
+    rng = np.random.default_rng(seed)
+    names = load_names(names_path)
+    printings = build_printings(names, rng)
+    spreads = count // 20 if spreads is None else spreads
+
+    for sub_dir in ('images', 'references'):
+        os.makedirs(os.path.join(out_dir, sub_dir), exist_ok=True)
+    rendered = {}
+
+    def render(printing):
+        if printing['id'] not in rendered:
+            rendered[printing['id']] = render_card(printing, font_path)
+            cv2.imwrite(os.path.join(out_dir, 'references', f"{printing['id']}.png"), rendered[printing['id']])
+        return rendered[printing['id']]
+
+    def truth(printing):
+        return {key: printing[key] for key in ('id', 'name', 'set')} | {'collectorNumber': printing['collector_number']}
+
+    images = []
+    encode = [cv2.IMWRITE_JPEG_QUALITY, quality]
+    for index in range(count):
+        printing = printings[int(rng.integers(len(printings)))]
+        variant = VARIANTS[index % len(VARIANTS)]
+        file = f'images/{index:04d}-{variant}.jpg'
+        cv2.imwrite(os.path.join(out_dir, file), photograph(render(printing), variant, rng), encode)
+        images.append({'file': file, 'kind': 'single', 'variant': variant, 'cards': [truth(printing)]})
+    for index in range(spreads):
+        page = [printings[int(i)] for i in rng.choice(len(printings), size=9, replace=False)]
+        file = f'images/spread-{index:03d}.jpg'
+        cv2.imwrite(os.path.join(out_dir, file), spread([render(p) for p in page], rng), encode)
+        images.append({'file': file, 'kind': 'spread', 'variant': 'binder', 'cards': [truth(p) for p in page]})
+
+    with open(os.path.join(out_dir, 'catalog.json'), 'w') as f:
+        json.dump(printings, f)
+    with open(os.path.join(out_dir, 'ground_truth.json'), 'w') as f:
+        json.dump({'format': CORPUS_FORMAT, 'seed': seed, 'images': images}, f, indent=1)
+    return images
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('out_dir')
+    parser.add_argument('--count', type=int, default=200, help='single-card photos')
+    parser.add_argument('--spreads', type=int, help='binder-page spreads (default count / 20)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--names', help='card name list (default benchmarks/card_names.txt)')
+    parser.add_argument('--font', help='TrueType font for card text')
+    args = parser.parse_args()
+    images = generate(args.out_dir, args.count, args.seed, args.spreads, args.names, args.font)
+    print(f'Wrote {len(images)} images to {args.out_dir}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+"""In-process load driver for the scan endpoints.
+
+    python -m benchmarks.load <corpus_dir> [--mode single] [--concurrency 4]
+                              [--requests 200] [--output load.json]
+
+Requests go through the real Flask stack (auth, routing, multipart parsing,
+JSON encoding) via one test client per thread, so the numbers cover everything
+but the network and gunicorn. Modes:
+
+    single  POST /scan with one single-card photo per request
+    multi   POST /scan multi=true with one binder-page spread per request
+    batch   POST /scan/batch with --batch-size photos per request
+    live    one push-mode live session per thread; each card's photo is pushed
+            at --fps until the session publishes a result (latency is from the
+            first push to the result)
+
+Accuracy compares the resolved card name with the ground truth, after the
+scanner's own name normalization. Rate limiting is disabled.
+"""
+
+import argparse
+import io
+import itertools
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from collections import Counter
+
+import jwt
+
+from .common import (
+    cpu_count, cpu_seconds, environment_meta, latency_summary, load_app, load_corpus, peak_rss_mb, write_results,
+)
+
+MODES = ('single', 'multi', 'batch', 'live')
+
+
+class LoadDriver:
+    """Runs the requests of one mode across threads and tallies the outcomes"""
+
+    def __init__(self, app, entries, mode, identify=None, batch_size=8, fps=15.0, live_timeout=10.0):
+        self.app = app
+        self.entries = entries
+        self.mode = mode
+        self.identify = identify
+        self.batch_size = batch_size
+        self.fps = fps
+        self.live_timeout = live_timeout
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.latencies = []
+        self.scans = 0
+        self.errors = Counter()
+        self.correct = 0
+        self.expected = 0
+
+    def token(self, worker):
+        return jwt.encode({'id': f'benchmark-{worker}'}, self.app.JWT_SECRET, algorithm='HS256')
+
+    def record(self, seconds, scans=0, errors=(), predicted=(), truth=()):
+        # Names are compared as multisets, so reading order does not matter for spreads
+        matched = Counter(self.app.normalize_card_name(name) for name in predicted if name)
+        matched &= Counter(self.app.normalize_card_name(name) for name in truth)
+        with self.lock:
+            self.latencies.append(seconds)
+            self.scans += scans
+            self.errors.update(errors)
+            self.correct += sum(matched.values())
+            self.expected += len(truth)
+
+    def form(self, **fields):
+        if self.identify:
+            fields['mode'] = self.identify
+        return fields
+
+    def request(self, client, headers, index):
+        entries = [self.entries[index % len(self.entries)]]
+        if self.mode == 'batch':
+            entries = [self.entries[(index * self.batch_size + i) % len(self.entries)] for i in range(self.batch_size)]
+            data = self.form(images=[(io.BytesIO(entry['data']), entry['file']) for entry in entries])
+            path = '/scan/batch'
+        else:
+            data = self.form(image=(io.BytesIO(entries[0]['data']), entries[0]['file']))
+            if self.mode == 'multi':
+                data['multi'] = 'true'
+            path = '/scan'
+        truth = [card['name'] for entry in entries for card in entry['cards']]
+
+        started = time.perf_counter()
+        response = client.post(path, headers=headers, data=data, content_type='multipart/form-data')
+        body = response.get_data()
+        seconds = time.perf_counter() - started
+        if response.status_code != 200:
+            self.record(seconds, errors=[f'http_{response.status_code}'], truth=truth)
+            return
+
+        if self.mode == 'batch':
+            items = [json.loads(line) for line in body.splitlines() if line.strip()]
+        elif self.mode == 'multi':
+            items = json.loads(body)['cards']
+        else:
+            items = [json.loads(body)]
+        errors = ['item' for item in items if 'error' in item]
+        predicted = [item['card']['name'] for item in items if item.get('card')]
+        self.record(seconds, scans=len(items) - len(errors), errors=errors, predicted=predicted, truth=truth)
+
+    def run_worker(self, worker, indexes):
+        client = self.app.app.test_client()
+        headers = {'Authorization': f'Bearer {self.token(worker)}'}
+        if self.mode == 'live':
+            self.run_live(client, headers, worker, indexes)
+            return
+        for index in indexes:
+            self.request(client, headers, index)
+
+    def run_live(self, client, headers, worker, indexes):
+        response = client.post('/scan/live/start', headers=headers, json={'mode': 'push'})
+        if response.status_code != 200:
+            self.record(0.0, errors=[f'http_{response.status_code}'])
+            return
+        session = self.app.session_manager.get_session(f'benchmark-{worker}')
+        interval = 1.0 / self.fps
+        try:
+            for index in indexes:
+                entry = self.entries[index % len(self.entries)]
+                truth = [card['name'] for card in entry['cards']]
+                seq = session.result_seq
+                started = time.perf_counter()
+                deadline = started + self.live_timeout
+                # Keep the card "in view" until it is recognized, like a camera would
+                while session.result_seq == seq and time.perf_counter() < deadline and session.active:
+                    session.push_frame(entry['data'])
+                    session.wait_for(lambda: session.result_seq != seq, timeout=interval)
+                seconds = time.perf_counter() - started
+                with session.updates:
+                    update = session.latest_result if session.result_seq != seq else None
+                if update is None:
+                    self.record(seconds, errors=['timeout'], truth=truth)
+                    continue
+                card = update['card']
+                self.record(seconds, scans=1, predicted=[card['name'] if card else update['result']], truth=truth)
+        finally:
+            client.post('/scan/live/stop', headers=headers)
+
+    def run(self, requests, concurrency):
+        """Run `requests` requests (or live cards) spread over `concurrency` threads; returns wall seconds"""
+        self._reset()
+        counter = itertools.count()
+        next_index = threading.Lock()
+
+        def indexes():
+            while True:
+                with next_index:
+                    index = next(counter)
+                if index >= requests:
+                    return
+                yield index
+
+        threads = [
+            threading.Thread(target=self.run_worker, args=(worker, indexes()), name=f'load-{worker}')
+            for worker in range(concurrency)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus', help='corpus directory written by benchmarks.corpus')
+    parser.add_argument('--mode', choices=MODES, default='single')
+    parser.add_argument('--concurrency', type=int, default=4, help='client threads (live sessions in live mode)')
+    parser.add_argument('--requests', type=int, default=200, help='requests to send (cards to show in live mode)')
+    parser.add_argument('--warmup', type=int, default=4, help='untimed requests sent first')
+    parser.add_argument('--batch-size', type=int, default=8, help='images per /scan/batch request')
+    parser.add_argument('--identify', choices=('name', 'collector', 'visual'),
+                        help='card identification mode (default: CARD_IDENTIFY_MODE)')
+    parser.add_argument('--fps', type=float, default=15.0, help='frames pushed per second in live mode')
+    parser.add_argument('--live-timeout', type=float, default=10.0, help='seconds to wait for a live result')
+    parser.add_argument('--cache', action='store_true', help='keep the OCR result cache enabled')
+    parser.add_argument('--output', help='write results as JSON to this path')
+    args = parser.parse_args()
+
+    if args.identify:
+        # Live sessions identify cards with the configured mode
+        os.environ['CARD_IDENTIFY_MODE'] = args.identify
+    app = load_app(args.corpus, cache=args.cache)
+    kind = 'spread' if args.mode == 'multi' else 'single'
+    entries = [entry for entry in load_corpus(args.corpus)['images'] if entry['kind'] == kind]
+    if not entries:
+        sys.exit(f'No {kind} images in {args.corpus}')
+
+    driver = LoadDriver(app, entries, args.mode, identify=args.identify, batch_size=args.batch_size,
+                        fps=args.fps, live_timeout=args.live_timeout)
+    if args.warmup:
+        driver.run(args.warmup, min(args.concurrency, args.warmup))
+
+    cpu_before = cpu_seconds()
+    wall = driver.run(args.requests, args.concurrency)
+    cpu = cpu_seconds() - cpu_before
+
+    scans = driver.scans
+    results = {
+        'requests': len(driver.latencies),
+        'scans': scans,
+        'errors': sum(driver.errors.values()),
+        'errorTypes': dict(driver.errors),
+        'wallSeconds': round(wall, 3),
+        'latencyMs': latency_summary(driver.latencies),
+        'scansPerSecond': round(scans / wall, 3) if wall else None,
+        'scansPerSecondPerCore': round(scans / wall / cpu_count(), 3) if wall else None,
+        'cpuSecondsPerScan': round(cpu / scans, 4) if scans else None,
+        'peakRssMb': {'self': peak_rss_mb(), 'children': peak_rss_mb(resource.RUSAGE_CHILDREN)},
+        'accuracy': {
+            'correct': driver.correct,
+            'expected': driver.expected,
+            'rate': round(driver.correct / driver.expected, 4) if driver.expected else None,
+        },
+    }
+    meta = environment_meta(app, f'load.{args.mode}', {
+        'mode': args.mode,
+        'concurrency': args.concurrency,
+        'requests': args.requests,
+        'warmup': args.warmup,
+        'batchSize': args.batch_size if args.mode == 'batch' else None,
+        'identify': args.identify or app.CARD_IDENTIFY_MODE,
+        'fps': args.fps if args.mode == 'live' else None,
+        'cache': args.cache,
+    })
+    write_results(args.output, meta, results)
+
+
+if __name__ == '__main__':
+    main()
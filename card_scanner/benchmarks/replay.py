@@ -0,0 +1,155 @@
+"""Replay a recorded live session through many concurrent live pipelines.
+
+    python -m benchmarks.replay <recording> [--sessions 8] [--speed 1] [--output replay.json]
+    python -m benchmarks.replay <recording> --from-corpus <corpus_dir> [--hold 1.5] [--fps 15]
+
+Each session runs the real capture -> analyze -> OCR pipeline on a
+ReplayFrameSource, so the frames and their timing are the same in every run.
+Recordings come from LIVE_RECORD_DIR or `flask --app app record-frames`; with
+--from-corpus one is first synthesized from the corpus photos, each card held
+in view for --hold seconds. Reports frame throughput, the share of frames
+dropped at capture (the source fell behind its pace) and before analysis
+(superseded in the latest-frame slot), OCR runs and recognitions. Accuracy is
+reported when the recording has a ground truth sidecar (<recording>.truth.json).
+"""
+
+import argparse
+import json
+import os
+import resource
+import threading
+import time
+
+from .common import cpu_count, cpu_seconds, environment_meta, load_app, load_corpus, peak_rss_mb, write_results
+
+
+def synthesize(app, corpus_dir, path, hold=1.5, fps=15.0):
+    """Write a recording that shows each single-card corpus photo for `hold` seconds, plus its truth sidecar"""
+    entries = [entry for entry in load_corpus(corpus_dir)['images'] if entry['kind'] == 'single']
+    recorder = app.FrameRecorder(path, max_bytes=2 ** 40)
+    per_card = max(1, int(round(hold * fps)))
+    for position, entry in enumerate(entries):
+        for frame in range(per_card):
+            recorder.write(None, encoded=entry['data'], seconds=(position * per_card + frame) / fps)
+    recorder.close()
+    with open(f'{path}.truth.json', 'w') as f:
+        json.dump({'names': [entry['cards'][0]['name'] for entry in entries]}, f)
+    return recorder.frames
+
+
+def collect_results(session, results):
+    publish = session._publish_result
+
+    def record(result, card):
+        results.append(card['name'] if card else result)
+        publish(result, card)
+    session._publish_result = record
+
+
+def accuracy(app, predicted, truth):
+    """Recognized names matched against the expected ones, in order, each used once"""
+    expected = [app.normalize_card_name(name) for name in truth]
+    correct = 0
+    position = 0
+    for name in predicted:
+        name = app.normalize_card_name(name)
+        if name in expected[position:]:
+            position = expected.index(name, position) + 1
+            correct += 1
+    return correct
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('recording', help='frame recording (written first with --from-corpus)')
+    parser.add_argument('--sessions', type=int, default=8, help='concurrent live sessions replaying the recording')
+    parser.add_argument('--speed', type=float, default=1.0, help='replay pace (0 = as fast as frames are read)')
+    parser.add_argument('--corpus', help='corpus directory whose catalog resolves cards')
+    parser.add_argument('--from-corpus', help='synthesize the recording from this corpus first')
+    parser.add_argument('--hold', type=float, default=1.5, help='seconds each card stays in view (--from-corpus)')
+    parser.add_argument('--fps', type=float, default=15.0, help='frame rate of the synthesized recording')
+    parser.add_argument('--timeout', type=float, help='give up after this many seconds (default: 3x the replay time + 30)')
+    parser.add_argument('--output', help='write results as JSON to this path')
+    args = parser.parse_args()
+
+    app = load_app(args.corpus or args.from_corpus)
+    if args.from_corpus:
+        frames = synthesize(app, args.from_corpus, args.recording, hold=args.hold, fps=args.fps)
+        print(f'Synthesized {frames} frames into {args.recording}')
+    truth = None
+    if os.path.exists(f'{args.recording}.truth.json'):
+        with open(f'{args.recording}.truth.json') as f:
+            truth = json.load(f)['names']
+
+    probe = app.ReplayFrameSource(args.recording)
+    if not probe.open():
+        raise SystemExit(f'Not a frame recording: {args.recording}')
+    frames, duration = len(probe.frames), probe.frames[-1][0]
+    probe.close()
+    replay_seconds = duration / args.speed if args.speed > 0 else 0.0
+    timeout = args.timeout or replay_seconds * 3 + 30
+
+    sessions = []
+    results = {}
+    for number in range(args.sessions):
+        source = app.ReplayFrameSource(args.recording, speed=args.speed, loop=False)
+        session = app.LiveScannerSession(f'replay-{number}', mode='camera', source=source)
+        results[session.user_id] = []
+        collect_results(session, results[session.user_id])
+        sessions.append(session)
+
+    cpu_before = cpu_seconds()
+    started = time.perf_counter()
+    for session in sessions:
+        if not session.start():
+            raise SystemExit(f'Could not start a session on {args.recording}')
+    # Drained twice in a row, so a frame in flight between stages is not missed
+    settled = 0
+    while settled < 2 and time.perf_counter() - started < timeout:
+        time.sleep(0.05)
+        settled = settled + 1 if all(session.drained for session in sessions) else 0
+    wall = time.perf_counter() - started
+    timed_out = settled < 2
+    stoppers = [threading.Thread(target=session.stop) for session in sessions]
+    for stopper in stoppers:
+        stopper.start()
+    for stopper in stoppers:
+        stopper.join()
+    cpu = cpu_seconds() - cpu_before
+
+    totals = {key: sum(session.frame_counts[key] for session in sessions) for key in sessions[0].frame_counts}
+    skipped = sum(session.source.skipped for session in sessions)
+    recognized = sum(len(names) for names in results.values())
+    offered = totals['captured'] + skipped
+    report = {
+        'sessions': args.sessions,
+        'recordingFrames': frames,
+        'recordingSeconds': round(duration, 3),
+        'timedOut': timed_out,
+        'wallSeconds': round(wall, 3),
+        'lagSeconds': round(wall - replay_seconds, 3) if args.speed > 0 else None,
+        'frames': {**totals, 'skipped': skipped, 'recognized': recognized},
+        'framesPerSecond': round(totals['captured'] / wall, 3),
+        'framesPerSecondPerCore': round(totals['captured'] / wall / cpu_count(), 3),
+        'captureDropRate': round(skipped / offered, 4) if offered else None,
+        'analyzeDropRate': round(totals['superseded'] / totals['captured'], 4) if totals['captured'] else None,
+        'recognitionsPerSecond': round(recognized / wall, 3),
+        'cpuSecondsPerFrame': round(cpu / totals['captured'], 5) if totals['captured'] else None,
+        'peakRssMb': {'self': peak_rss_mb(), 'children': peak_rss_mb(resource.RUSAGE_CHILDREN)},
+    }
+    if truth:
+        correct = sum(accuracy(app, names, truth) for names in results.values())
+        expected = len(truth) * args.sessions
+        report['accuracy'] = {'correct': correct, 'expected': expected, 'rate': round(correct / expected, 4)}
+    meta = environment_meta(app, 'replay', {
+        'recording': os.path.basename(args.recording),
+        'sessions': args.sessions,
+        'speed': args.speed,
+        'identify': app.CARD_IDENTIFY_MODE,
+        'ocrInterval': app.LIVE_OCR_INTERVAL,
+    })
+    write_results(args.output, meta, report)
+
+
+if __name__ == '__main__':
+    main()
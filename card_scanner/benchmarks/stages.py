@@ -0,0 +1,114 @@
+"""Micro-benchmarks for each stage of the scan pipeline.
+
+    python -m benchmarks.stages <corpus_dir> [--repeat 3] [--output stages.json]
+
+Every single-card image in the corpus is run through the pipeline one stage at
+a time (decode, detect, warp, each OCR preprocessing pass, the OCR engine,
+the collector strip, catalog resolution, the visual embedding and match, the
+perceptual hash and the live preview encode), timing each call separately.
+Stages whose dependency is missing (no Tesseract, no visual index) are skipped.
+"""
+
+import argparse
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from .common import environment_meta, latency_summary, load_app, load_corpus, write_results
+
+
+def timed(samples, stage, fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    samples.setdefault(stage, []).append(time.perf_counter() - started)
+    return result
+
+
+def ocr_available(app):
+    try:
+        with app.ocr_pool.checkout() as engine:
+            engine.image_to_data(np.full((32, 128), 255, dtype=np.uint8), psm=7)
+        return True
+    except Exception as e:
+        print(f'OCR engine unavailable, skipping OCR stages: {e}', file=sys.stderr)
+        return False
+
+
+def run_stages(app, entry, samples, ocr=True, visual_index=None, preview=None):
+    gray, _ = timed(samples, 'decode', app.decode_scan_image, entry['data'])
+    quads = timed(samples, 'detect', app.find_card_quads, gray)
+    if not quads:
+        samples.setdefault('undetected', []).append(0.0)
+        return
+    quad = quads[0]
+    card = timed(samples, 'warp', app.warp_card, gray, quad)
+    name_crop = app.crop_card_regions(card, ['name'])['name']
+
+    for name, preprocess in app.OCR_PASS_FUNCTIONS.items():
+        prepared = timed(samples, f'preprocess.{name}', preprocess, name_crop)
+        if ocr:
+            with app.ocr_pool.checkout() as engine:
+                timed(samples, f'ocr.{name}', engine.image_to_data, prepared, psm=app.REGION_PSM['name'])
+
+    strip = timed(samples, 'warp.collector', app.warp_card_region, gray, quad, 'collector', app.COLLECTOR_STRIP_SCALE)
+    if ocr:
+        with app.ocr_pool.checkout() as engine:
+            timed(samples, 'ocr.collector', app.read_collector_strip, engine, strip)
+
+    truth = entry['cards'][0]
+    timed(samples, 'resolve.name', app.resolve_card, {'name': truth['name']})
+    timed(samples, 'resolve.collector', app.resolve_card, {
+        'collector': f"{truth['collectorNumber']}/400 C\n{truth['set'].upper()} • EN"
+    })
+    timed(samples, 'embedding', app.card_embedding, card)
+    if visual_index is not None:
+        timed(samples, 'visual.match', visual_index.match, card)
+    timed(samples, 'phash', app.perceptual_hash, name_crop)
+
+    # The real preview path: a new frame in the session slot, encoded once
+    preview._set_frame(cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR))
+    timed(samples, 'encode.preview', preview.get_preview_jpeg)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus', help='corpus directory written by benchmarks.corpus')
+    parser.add_argument('--repeat', type=int, default=3, help='passes over the corpus')
+    parser.add_argument('--output', help='write results as JSON to this path')
+    args = parser.parse_args()
+
+    app = load_app(args.corpus)
+    truth = load_corpus(args.corpus)
+    entries = [entry for entry in truth['images'] if entry['kind'] == 'single']
+    ocr = ocr_available(app)
+    # Build (or load) the catalog index before timing lookups against it
+    app.get_card_index()
+    visual_index = app.get_visual_index()
+    preview = app.LiveScannerSession('benchmark', mode='push')
+
+    # One untimed pass warms caches, lazy indexes and OpenCV's thread pool
+    run_stages(app, entries[0], {}, ocr=ocr, visual_index=visual_index, preview=preview)
+    samples = {}
+    for _ in range(args.repeat):
+        for entry in entries:
+            run_stages(app, entry, samples, ocr=ocr, visual_index=visual_index, preview=preview)
+
+    undetected = len(samples.pop('undetected', []))
+    results = {
+        'images': len(entries) * args.repeat,
+        'undetected': undetected,
+        'stages': {stage: latency_summary(seconds) for stage, seconds in samples.items()},
+    }
+    meta = environment_meta(app, 'stages', {
+        'repeat': args.repeat,
+        'ocr': ocr,
+        'visualIndex': visual_index is not None,
+        'ocrPasses': app.OCR_PASSES,
+    })
+    write_results(args.output, meta, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,24 @@
+# Gunicorn settings, read from the working directory; the Dockerfile CMD sets
+# bind, workers, threads and timeout
+
+import os
+
+# Workers adopt OCR engines loaded before the fork, and OpenMP threads do not
+# survive one; Tesseract recommends a single thread per process anyway
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+# Import the app, map its indexes and load the OCR models once in the master,
+# then fork workers that share them copy-on-write
+preload_app = os.getenv('SERVER_PRELOAD', 'true').lower() == 'true'
+
+
+def when_ready(server):
+    if preload_app:
+        import app
+        app.preload()
+
+
+def post_worker_init(worker):
+    # Runs before the worker accepts connections, so no request meets a cold worker
+    import app
+    app.warm_up()
@@ -0,0 +1,39 @@
+"""Shared fixtures for the card scanner tests"""
+
+import os
+import sys
+from contextlib import contextmanager
+
+import pytest
+
+SCANNER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# app reads its configuration at import
+os.environ.setdefault('JWT_SECRET', 'test-secret-' + 'x' * 32)
+os.environ['SCAN_CACHE_REDIS'] = 'false'
+os.environ['MAX_RETRIES'] = '1'  # failed backend calls raise at once instead of backing off
+if SCANNER_DIR not in sys.path:
+    sys.path.insert(0, SCANNER_DIR)
+
+
+@pytest.fixture(scope='session')
+def app():
+    import app
+    return app
+
+
+@pytest.fixture
+def fake_engines(app, monkeypatch):
+    """Hand scheduler jobs a placeholder engine instead of a Tesseract handle"""
+    @contextmanager
+    def checkout():
+        yield object()
+    monkeypatch.setattr(app.ocr_pool, 'checkout', checkout)
+
+
+@pytest.fixture
+def auth_headers(app):
+    """Authorization header for a test user, signed with the app's JWT secret"""
+    import jwt
+    token = jwt.encode({'id': 'user-1'}, app.JWT_SECRET, algorithm='HS256')
+    return {'Authorization': f'Bearer {token}'}
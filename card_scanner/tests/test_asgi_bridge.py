@@ -0,0 +1,155 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+
+class FakeSession:
+    """A live session whose events stream sends a keepalive every few milliseconds"""
+    mode = 'camera'
+    active = True
+    last_activity = float('inf')
+    result_seq = 0
+    latest_result = None
+
+    def __init__(self):
+        self.updates = threading.Condition()
+
+    def wait_for(self, predicate, timeout):
+        time.sleep(0.005)
+        return predicate()
+
+    def stop(self):
+        self.active = False
+
+
+def http_scope(method, path, headers=None, query_string=b''):
+    return {
+        'type': 'http',
+        'http_version': '1.1',
+        'method': method,
+        'path': path,
+        'root_path': '',
+        'scheme': 'http',
+        'query_string': query_string,
+        'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in (headers or {}).items()],
+        'client': ('127.0.0.1', 50000),
+        'server': ('testserver', 80),
+    }
+
+
+def run(app, scope, chunks=(b'',), disconnect_after=None):
+    """Drive one request through the bridge; returns (status, headers, body chunks).
+
+    The body is sent as `chunks`. The client disconnects once it has read
+    `disconnect_after` body chunks, and otherwise stays connected.
+    """
+    async def main():
+        incoming = [{'type': 'http.request', 'body': chunk, 'more_body': i < len(chunks) - 1}
+                    for i, chunk in enumerate(chunks)]
+        gone = asyncio.Event()
+        start, body = {}, []
+
+        async def receive():
+            if incoming:
+                return incoming.pop(0)
+            await gone.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                start.update(status=message['status'], headers=dict(message['headers']))
+            elif message.get('body'):
+                body.append(message['body'])
+                if disconnect_after is not None and len(body) >= disconnect_after:
+                    gone.set()
+
+        await asyncio.wait_for(app.asgi_app(scope, receive, send), timeout=10)
+        return start.get('status'), start.get('headers', {}), body
+
+    return asyncio.run(main())
+
+
+@pytest.fixture(autouse=True)
+def no_rate_limits(app, monkeypatch):
+    monkeypatch.setattr(app.limiter, 'enabled', False)
+
+
+def test_json_request_body_reaches_the_route(app, auth_headers):
+    headers = dict(auth_headers, **{'Content-Type': 'application/json', 'X-Request-ID': 'asgi-test-1'})
+    status, response_headers, body = run(app, http_scope('POST', '/scan/live/start', headers),
+                                         chunks=[b'{"mode": ', b'"sideways"}'])
+    assert status == 400
+    assert response_headers[b'content-type'] == b'application/json'
+    assert response_headers[b'x-request-id'] == b'asgi-test-1'
+    assert json.loads(b''.join(body)) == {'error': 'Invalid mode'}
+
+
+def test_oversized_body_is_refused_without_reading_it(app, auth_headers, monkeypatch):
+    monkeypatch.setattr(app, 'SCAN_MAX_REQUEST_BYTES', 1000)
+    monkeypatch.setitem(app.app.config, 'MAX_CONTENT_LENGTH', 1000)
+    headers = dict(auth_headers, **{'Content-Type': 'application/octet-stream', 'Content-Length': '5000'})
+    status, _, body = run(app, http_scope('POST', '/scan', headers), chunks=[b'x' * 5000])
+    assert status == 413
+    assert json.loads(b''.join(body)) == {'error': 'Request too large'}
+
+
+def test_streamed_response_is_sent_chunk_by_chunk(app, auth_headers, monkeypatch):
+    session = FakeSession()
+    monkeypatch.setitem(app.session_manager.sessions, 'user-1', session)
+    _, token = auth_headers['Authorization'].split(' ')
+    scope = http_scope('GET', '/scan/live/events', query_string=f'token={token}'.encode())
+
+    def end_after_keepalives():
+        time.sleep(0.05)
+        session.active = False
+    threading.Thread(target=end_after_keepalives).start()
+
+    status, headers, body = run(app, scope)
+    assert status == 200
+    assert headers[b'content-type'].startswith(b'text/event-stream')
+    assert body[0] == b'retry: 2000\n\n'
+    assert set(body[1:-1]) == {b': keepalive\n\n'}
+    assert body[-1] == b'event: end\ndata: {}\n\n'
+
+
+def test_client_disconnect_stops_the_stream_and_releases_its_slot(app, auth_headers, monkeypatch):
+    session = FakeSession()
+    monkeypatch.setitem(app.session_manager.sessions, 'user-1', session)
+    closed = threading.Event()
+    real_release = app.live_streams.release
+
+    def release(kind):
+        real_release(kind)
+        closed.set()
+    monkeypatch.setattr(app.live_streams, 'release', release)
+
+    scope = http_scope('GET', '/scan/live/events', auth_headers)
+    status, _, body = run(app, scope, disconnect_after=3)
+    assert status == 200
+    assert 3 <= len(body) < 10
+    # The generator was closed (and its slot given back) although the session is still running
+    assert closed.wait(timeout=1)
+    assert session.active
+    assert app.live_streams.open == 0
+    assert REGISTRY.get_sample_value('asgi_requests_in_progress', {'pool': 'stream', 'state': 'running'}) == 0
+
+
+def test_client_gone_before_the_body_arrives_runs_nothing(app, monkeypatch):
+    called = []
+    monkeypatch.setattr(app.asgi_app, 'wsgi_app', lambda environ, start_response: called.append(environ))
+
+    async def main():
+        async def receive():
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            raise AssertionError(f'nothing should be sent: {message}')
+
+        await app.asgi_app(http_scope('POST', '/scan', {'Content-Length': '10'}), receive, send)
+
+    asyncio.run(main())
+    assert called == []
@@ -0,0 +1,54 @@
+import cv2
+import numpy as np
+import pytest
+
+CARD_W, CARD_H = 210, 290
+
+
+def draw_card(canvas, x, y, clip=0):
+    """A light card with a dark art box and a text box; `clip` cuts off its top-left corner"""
+    outline = np.array(
+        [(x + clip, y), (x + CARD_W, y), (x + CARD_W, y + CARD_H), (x, y + CARD_H), (x, y + clip)], np.int32
+    )
+    cv2.fillPoly(canvas, [outline], 220)
+    cv2.rectangle(canvas, (x + 20, y + 36), (x + CARD_W - 20, y + 100), 90, -1)
+    cv2.rectangle(canvas, (x + 20, y + 175), (x + CARD_W - 20, y + CARD_H - 30), 150, 2)
+
+
+def binder_page(clipped):
+    """A dark 3x3 pocket page; cards whose index is in `clipped` have a chipped corner"""
+    canvas = np.full((1000, 760), 30, np.uint8)
+    for index in range(9):
+        row, col = divmod(index, 3)
+        draw_card(canvas, 30 + col * 240, 30 + row * 320, clip=30 if index in clipped else 0)
+    return canvas
+
+
+def assert_card_sized(quad):
+    _, (width, height), _ = cv2.minAreaRect(quad)
+    assert sorted((width, height)) == pytest.approx(sorted((CARD_W, CARD_H)), abs=12)
+
+
+@pytest.mark.parametrize('clipped', [set(), {1, 4, 7}, set(range(9))])
+def test_binder_page_gives_nine_outlines(app, clipped):
+    quads = app.find_card_quads(binder_page(clipped), max_cards=9)
+    assert len(quads) == 9
+    for quad in quads:
+        assert_card_sized(quad)
+    cells = sorted((int((y - 30) // 320), int((x - 30) // 240)) for x, y in (quad.mean(axis=0) for quad in quads))
+    assert cells == [(row, col) for row in range(3) for col in range(3)]
+
+
+def test_single_card_with_a_chipped_corner(app):
+    canvas = np.full((600, 480), 30, np.uint8)
+    draw_card(canvas, 130, 150, clip=30)
+    quads = app.find_card_quads(canvas)
+    assert len(quads) == 1
+    assert_card_sized(quads[0])
+
+
+def test_shapes_that_are_not_cards_are_ignored(app):
+    canvas = np.full((600, 480), 30, np.uint8)
+    cv2.circle(canvas, (240, 300), 180, 220, -1)
+    cv2.rectangle(canvas, (20, 20), (460, 120), 220, -1)
+    assert app.find_card_quads(canvas) == []
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+CATALOG = [
+    {'id': 'bolt-1', 'name': 'Lightning Bolt', 'set': 'LEA', 'collector_number': '161'},
+    {'id': 'bolt-2', 'name': 'Lightning Bolt', 'set': 'M10', 'collector_number': '146'},
+    {'id': 'fire-ice', 'name': 'Fire // Ice', 'set': 'apc', 'collector_number': '128',
+     'card_faces': [{'name': 'Fire'}, {'name': 'Ice'}]},
+    {'id': 'vault', 'name': "Lim-Dûl's Vault", 'set': 'all', 'collector_number': '186'},
+    {'id': 'vial', 'name': 'Æther Vial', 'set': 'dst', 'collector_number': '91'},
+    # Unhinged's "_____" normalizes to nothing
+    {'id': 'blank', 'name': '_____', 'set': 'unh', 'collector_number': '23'},
+    {'id': 'no-name', 'set': 'xxx', 'collector_number': '1'},
+    {'name': 'No Id'},
+]
+
+
+@pytest.fixture
+def index(app, tmp_path):
+    catalog = tmp_path / 'catalog.json'
+    catalog.write_text(json.dumps(CATALOG), encoding='utf-8')
+    return app.CardNameIndex.build(str(catalog), str(tmp_path / 'catalog.index'))
+
+
+def test_normalize_card_name(app):
+    assert app.normalize_card_name("Lim-Dûl's  Vault") == 'lim dul s vault'
+    assert app.normalize_card_name('Æther Vial') == 'aether vial'
+    assert app.normalize_card_name('_____') == ''
+    assert app.normalize_card_name(None) == ''
+
+
+def test_build_skips_unsearchable_and_incomplete_cards(index):
+    keys = [key.decode('ascii') for key in index.keys]
+    assert keys == sorted(['lightning bolt', 'fire ice', 'fire', 'ice', 'lim dul s vault', 'aether vial'])
+    assert index.lookup_printing('unh', '23') is None
+    assert index.lookup_printing('xxx', '1') is None
+
+
+def test_lookup_exact_and_misread_names(index):
+    assert index.lookup('Lightning Bolt') == [('bolt-1', 'Lightning Bolt', 1.0)]
+    card_id, name, score = index.lookup('Lightnmg Bo1t')[0]
+    assert (card_id, name) == ('bolt-1', 'Lightning Bolt')
+    assert 0.6 < score < 1.0
+    assert index.lookup('LIM-DUL’S VAULT')[0][:2] == ('vault', "Lim-Dûl's Vault")
+    assert index.lookup('Aether Vial')[0][:2] == ('vial', 'Æther Vial')
+
+
+def test_lookup_by_face_name_returns_the_whole_card(index):
+    assert index.lookup('Ice')[0] == ('fire-ice', 'Fire // Ice', 1.0)
+    assert index.lookup('Fire // Ice')[0] == ('fire-ice', 'Fire // Ice', 1.0)
+
+
+def test_lookup_of_unreadable_text_returns_nothing(index):
+    assert index.lookup('') == []
+    assert index.lookup('_____') == []
+    assert index.lookup('qqqqzzzz') == []
+
+
+def test_lookup_limit_orders_matches_best_first(index):
+    matches = index.lookup('Fire', limit=3)
+    assert matches[0] == ('fire-ice', 'Fire // Ice', 1.0)
+    assert [score for _, _, score in matches] == sorted((score for _, _, score in matches), reverse=True)
+
+
+def test_lookup_printing(index):
+    assert index.lookup_printing('lea', '161') == ('bolt-1', 'Lightning Bolt')
+    assert index.lookup_printing('M10', '146') == ('bolt-2', 'Lightning Bolt')
+    assert index.lookup_printing('APC', '128') == ('fire-ice', 'Fire // Ice')
+    assert index.lookup_printing('lea', '162') is None
+
+
+def test_reopening_a_built_index(app, index):
+    reopened = app.CardNameIndex(index.index_dir)
+    assert len(reopened) == len(index)
+    assert reopened.has_printings
+    assert reopened.lookup('Lightning Bolt') == index.lookup('Lightning Bolt')
@@ -0,0 +1,134 @@
+import pytest
+import requests
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.text = f'status {status_code}'
+
+    def raise_for_status(self):
+        raise requests.HTTPError(self.text)
+
+
+class FakeBackend:
+    """Records collection posts and answers them from `respond(path, payload)`"""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.calls = []
+
+    def post(self, url, json, headers, timeout):
+        path = url.split('://backend', 1)[1]
+        self.calls.append((path, json))
+        return FakeResponse(self.respond(path, json))
+
+    def names(self, path):
+        return [
+            item['card']['name']
+            for call_path, payload in self.calls if call_path == path
+            for item in payload.get('items', [payload])
+        ]
+
+
+@pytest.fixture
+def writer(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(app, 'BACKEND_URL', 'http://backend')
+    writer = app.CollectionWriter(str(tmp_path / 'journal.db'))
+    # Flushes are driven by the tests, not a background thread
+    monkeypatch.setattr(writer, 'start', lambda: None)
+    return writer
+
+
+def journal(writer):
+    return [row[0] for row in writer._connection().execute('SELECT card FROM pending_adds ORDER BY id')]
+
+
+def enqueue(writer, *names):
+    for name in names:
+        writer.enqueue('user-1', {'name': name, 'id': f'id-{name}'})
+
+
+BULK = '/api/collection/add/bulk'
+SINGLE = '/api/collection/add'
+
+
+def test_enqueue_coalesces_repeated_adds(writer):
+    assert writer.enqueue('user-1', {'name': 'Opt', 'id': 'opt'})
+    assert not writer.enqueue('user-1', {'name': 'Opt', 'id': 'opt'})
+    assert writer.enqueue('user-2', {'name': 'Opt', 'id': 'opt'})
+    assert len(journal(writer)) == 2
+
+
+def test_batch_is_flushed_in_order_and_removed(writer):
+    writer.http = FakeBackend(lambda path, payload: 200)
+    enqueue(writer, 'a', 'b', 'c')
+    assert not writer._flush_batch()
+    assert writer.http.names(BULK) == ['a', 'b', 'c']
+    assert journal(writer) == []
+
+
+def test_server_errors_keep_the_batch_for_retry(writer):
+    statuses = iter([503, 200])
+    writer.http = FakeBackend(lambda path, payload: next(statuses))
+    enqueue(writer, 'a', 'b')
+    with pytest.raises(requests.HTTPError):
+        writer._flush_batch()
+    assert len(journal(writer)) == 2
+
+    writer._flush_batch()
+    assert writer.http.names(BULK) == ['a', 'b', 'a', 'b']
+    assert journal(writer) == []
+
+
+def test_rejected_batch_drops_only_the_rejected_cards(writer):
+    def respond(path, payload):
+        if path == BULK:
+            return 422
+        return 422 if payload['card']['name'] == 'bad' else 201
+    writer.http = FakeBackend(respond)
+    enqueue(writer, 'a', 'bad', 'c')
+    writer._flush_batch()
+    assert writer.http.names(SINGLE) == ['a', 'bad', 'c']
+    assert journal(writer) == []
+
+
+def test_rejected_single_card_is_dropped_without_a_second_post(writer):
+    writer.http = FakeBackend(lambda path, payload: 400)
+    enqueue(writer, 'bad')
+    writer._flush_batch()
+    assert [path for path, _ in writer.http.calls] == [BULK]
+    assert journal(writer) == []
+
+
+def test_server_error_partway_through_keeps_only_the_unsent_cards(writer):
+    statuses = {BULK: iter([422]), SINGLE: iter([201, 503, 201, 201])}
+    writer.http = FakeBackend(lambda path, payload: next(statuses[path]))
+    enqueue(writer, 'a', 'b', 'c')
+    with pytest.raises(requests.HTTPError):
+        writer._flush_batch()
+    assert len(journal(writer)) == 2
+
+    statuses[BULK] = iter([422])
+    writer._flush_batch()
+    assert writer.http.names(SINGLE) == ['a', 'b', 'b', 'c']
+    assert journal(writer) == []
+
+
+def test_backend_without_bulk_endpoint_gets_one_post_per_card(writer):
+    writer.http = FakeBackend(lambda path, payload: 404 if path == BULK else 200)
+    enqueue(writer, 'a', 'b')
+    writer._flush_batch()
+    assert writer.http.names(SINGLE) == ['a', 'b']
+    assert journal(writer) == []
+
+
+def test_rows_claimed_by_another_worker_are_left_alone(app, writer):
+    enqueue(writer, 'a')
+    writer._connection().execute(
+        'UPDATE pending_adds SET claimed_by = ?, claimed_at = ?', ('other-host:1', app.time.time())
+    )
+    writer.http = FakeBackend(lambda path, payload: 200)
+    assert not writer._flush_batch()
+    assert writer.http.calls == []
+    assert len(journal(writer)) == 1
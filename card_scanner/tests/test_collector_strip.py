@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+CATALOG = [
+    {'id': 'bolt-lea', 'name': 'Lightning Bolt', 'set': 'lea', 'collector_number': '161'},
+    {'id': 'bolt-m10', 'name': 'Lightning Bolt', 'set': 'm10', 'collector_number': '146'},
+    {'id': 'ragavan', 'name': 'Ragavan, Nimble Pilferer', 'set': 'mh2', 'collector_number': '138'},
+]
+
+
+@pytest.fixture
+def index(app, tmp_path, monkeypatch):
+    catalog = tmp_path / 'catalog.json'
+    catalog.write_text(json.dumps(CATALOG), encoding='utf-8')
+    index = app.CardNameIndex.build(str(catalog), str(tmp_path / 'catalog.index'))
+    monkeypatch.setattr(app, 'get_card_index', lambda: index)
+    return index
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('0161/295 C\nLEA • EN', ('lea', '161')),
+    ('R 0138\nMH2 EN', ('mh2', '138')),
+    ('146/249 U\nm10 • en', ('m10', '146')),
+    ('0000/280\nLEA', ('lea', '0')),
+    ('  \n0161 C\n\nLEA • EN\n', ('lea', '161')),  # blank lines around the strip
+])
+def test_parse_collector_strip(app, text, expected):
+    assert app.parse_collector_strip(text) == expected
+
+
+@pytest.mark.parametrize('text', [
+    None,
+    '',
+    '0161/295 C',  # set line missing
+    'C\nLEA • EN',  # no collector number
+    '0161/295 C\n• EN',  # no set code
+    '~~ ,,\n.. --',
+])
+def test_parse_collector_strip_rejects_missing_or_garbled_strips(app, text):
+    assert app.parse_collector_strip(text) is None
+
+
+def test_collector_strip_resolves_the_exact_printing(index, app):
+    card = app.resolve_card({'collector': '0146/249 C\nM10 • EN', 'name': 'Lightning Bolt'})
+    assert card == {'id': 'bolt-m10', 'name': 'Lightning Bolt', 'score': 1.0, 'set': 'm10', 'collectorNumber': '146'}
+
+
+@pytest.mark.parametrize('collector', [
+    '0999/249 C\nM10 • EN',  # no such printing
+    'garbled',
+])
+def test_unresolved_strip_falls_back_to_the_name(index, app, collector):
+    card = app.resolve_card({'collector': collector, 'name': 'Ragavan, Nimble Pilfere'})
+    assert (card['id'], card['name']) == ('ragavan', 'Ragavan, Nimble Pilferer')
+    assert 'set' not in card
+
+
+def test_unresolved_strip_without_a_name_resolves_nothing(index, app):
+    assert app.resolve_card({'collector': '0999/249 C\nM10 • EN'}) is None
@@ -0,0 +1,64 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image, ImageOps
+
+
+def asymmetric_image(width, height):
+    """A grayscale gradient with a bright block in one corner, so every flip and turn looks different"""
+    pixels = np.tile(np.linspace(40, 160, width, dtype=np.uint8), (height, 1))
+    pixels[:height // 3, :width // 4] = 250
+    return Image.fromarray(pixels)
+
+
+def encode(image, orientation=1):
+    exif = Image.Exif()
+    exif[0x0112] = orientation
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=95, exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize('orientation', range(1, 9))
+def test_exif_orientation_matches_pil(app, orientation):
+    data = encode(asymmetric_image(120, 80), orientation)
+    gray, scale = app.decode_scan_image(data)
+    expected = np.asarray(ImageOps.exif_transpose(Image.open(io.BytesIO(data))).convert('L'))
+    assert scale == 1
+    assert gray.shape == expected.shape
+    assert np.abs(gray.astype(int) - expected.astype(int)).mean() < 2
+
+
+def test_large_image_is_decoded_at_a_reduced_scale(app):
+    data = encode(asymmetric_image(3300, 2000), orientation=6)
+    gray, scale = app.decode_scan_image(data)
+    assert scale == 2
+    # Rotated a quarter turn after the reduced decode
+    assert gray.shape == (1650, 1000)
+
+
+def test_upload_over_the_byte_limit_is_rejected_before_decoding(app, monkeypatch):
+    data = encode(asymmetric_image(120, 80))
+    monkeypatch.setattr(app, 'SCAN_MAX_UPLOAD_BYTES', len(data) - 1)
+    with pytest.raises(app.ImageRejected) as rejected:
+        app.decode_scan_image(data)
+    assert (rejected.value.status, rejected.value.message) == (413, 'Image too large')
+
+
+def test_image_over_the_pixel_limit_is_rejected(app, monkeypatch):
+    monkeypatch.setattr(app, 'SCAN_MAX_PIXELS', 120 * 80 - 1)
+    with pytest.raises(app.ImageRejected) as rejected:
+        app.decode_scan_image(encode(asymmetric_image(120, 80)))
+    assert (rejected.value.status, rejected.value.message) == (413, 'Image too large')
+
+
+@pytest.mark.parametrize('data', [
+    b'',
+    b'not an image at all',
+    encode(asymmetric_image(120, 80))[:200],  # header only
+])
+def test_garbage_upload_is_rejected(app, data):
+    with pytest.raises(app.ImageRejected) as rejected:
+        app.decode_scan_image(data)
+    assert (rejected.value.status, rejected.value.message) == (400, 'Unsupported image format')
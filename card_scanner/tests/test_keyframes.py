@@ -0,0 +1,61 @@
+import cv2
+import numpy as np
+import pytest
+
+
+def card(seed):
+    """A blocky high-contrast frame; different seeds look like different cards"""
+    blocks = np.random.default_rng(seed).integers(0, 256, (15, 20), dtype=np.uint8)
+    return cv2.resize(blocks, (320, 240), interpolation=cv2.INTER_NEAREST)
+
+
+def blurred(frame):
+    return cv2.GaussianBlur(frame, (9, 9), 0)
+
+
+FLAT = np.full((240, 320), 128, dtype=np.uint8)
+
+
+@pytest.fixture
+def selector(app):
+    return app.KeyframeSelector()
+
+
+def push_all(selector, frames):
+    """Push frames at 10 fps; returns the keyframes emitted, including the last segment's"""
+    emitted = [selector.push(index, index / 10, frame) for index, frame in enumerate(frames)]
+    return [keyframe for keyframe in emitted if keyframe is not None] + [selector.finish()]
+
+
+def test_sharpest_frame_of_each_card_is_kept(selector):
+    a, b = card(1), card(2)
+    keyframes = push_all(selector, [blurred(a), a, blurred(a), blurred(b), b, blurred(b)])
+    assert [(keyframe['frame'], keyframe['time']) for keyframe in keyframes] == [(1, 0.1), (4, 0.4)]
+    assert keyframes[0]['gray'] is not None
+    assert keyframes[0]['sharpness'] > 0
+
+
+def test_frames_moving_into_view_are_not_selected(selector):
+    # The first frame of C differs from the flat frame before it by more than the change threshold
+    c = card(3)
+    keyframes = push_all(selector, [FLAT, c, c])
+    assert [keyframe['frame'] for keyframe in keyframes] == [2]
+
+
+def test_blurry_stretches_produce_no_keyframe(selector):
+    a = card(1)
+    keyframes = push_all(selector, [a, FLAT, FLAT, FLAT])
+    # A's segment ends at the first flat frame, and the flat frames never start one
+    assert [keyframe['frame'] for keyframe in keyframes[:-1]] == [0]
+    assert keyframes[-1] is None
+
+
+def test_segment_ends_when_the_card_changes(selector):
+    a, b = card(1), card(2)
+    assert selector.push(0, 0.0, a) is None
+    assert selector.push(1, 0.1, a) is None
+    # Equal scores keep the earlier frame
+    assert selector.push(2, 0.2, b)['frame'] == 0
+    assert selector.push(3, 0.3, b) is None
+    assert selector.finish()['frame'] == 3
+    assert selector.finish() is None
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import threading
+
+import pytest
+
+
+class FakeSession:
+    """Just enough of a live session for the preview and events streams"""
+    mode = 'camera'
+    active = True
+    last_activity = float('inf')
+    frame_seq = 0
+    result_seq = 0
+    latest_result = None
+
+    def __init__(self):
+        self.updates = threading.Condition()
+
+    def wait_for(self, predicate, timeout):
+        return predicate()
+
+    def get_preview_jpeg(self):
+        return self.frame_seq, b'jpeg'
+
+    def stop(self):
+        self.active = False
+
+
+@pytest.fixture
+def client(app, monkeypatch):
+    monkeypatch.setattr(app.limiter, 'enabled', False)
+    monkeypatch.setattr(app.live_streams, 'limit', 1)
+    return app.app.test_client()
+
+
+@pytest.fixture
+def session(app, monkeypatch):
+    session = FakeSession()
+    monkeypatch.setitem(app.session_manager.sessions, 'user-1', session)
+    return session
+
+
+def test_streams_over_the_limit_are_refused(app, client, session, auth_headers):
+    events = client.get('/scan/live/events', headers=auth_headers, buffered=False)
+    assert events.status_code == 200
+    assert next(events.response) == b'retry: 2000\n\n'
+
+    refused = client.get('/scan/live/stream', headers=auth_headers)
+    assert refused.status_code == 503
+    assert refused.headers['Retry-After'] == '5'
+    assert refused.get_json() == {'error': 'Too many live streams, retry later'}
+
+    events.close()
+    assert app.live_streams.open == 0
+    preview = client.get('/scan/live/stream', headers=auth_headers, buffered=False)
+    assert preview.status_code == 200
+    assert next(preview.response).startswith(b'--frame\r\nContent-Type: image/jpeg')
+    preview.close()
+    assert app.live_streams.open == 0
+
+
+def test_stream_without_a_session_gives_its_slot_back(app, client, auth_headers):
+    assert client.get('/scan/live/events', headers=auth_headers).status_code == 404
+    assert app.live_streams.open == 0
+
+
+def test_socket_over_the_limit_is_closed_with_try_again_later(app, auth_headers, monkeypatch):
+    monkeypatch.setattr(app.live_streams, 'limit', 0)
+    scope = {
+        'type': 'websocket',
+        'path': '/scan/live/ws',
+        'query_string': b'',
+        'headers': [(b'authorization', auth_headers['Authorization'].encode('latin-1'))],
+    }
+    sent = []
+
+    async def receive():
+        return {'type': 'websocket.connect'}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app.asgi_app(scope, receive, send))
+    assert sent == [
+        {'type': 'websocket.accept'},
+        {'type': 'websocket.close', 'code': 1013, 'reason': 'Too many live streams'},
+    ]
+
+
+@pytest.mark.parametrize('logger_name, args', [
+    # uvicorn: client, method, path with query, HTTP version, status
+    ('uvicorn.access', ('127.0.0.1:5000', 'GET', '/scan/live/events?token=eyJ.abc.def&since=3', '1.1', 200)),
+    # uvicorn's WebSocket handshakes: client, path with query
+    ('uvicorn.error', ('127.0.0.1:5000', '/scan/live/events?token=eyJ.abc.def&since=3')),
+    # werkzeug (the internal listener): request line, status, size
+    ('werkzeug', ('GET /scan/live/events?token=eyJ.abc.def&since=3 HTTP/1.1', '200', '-')),
+])
+def test_token_is_redacted_from_access_logs(app, caplog, logger_name, args):
+    with caplog.at_level(logging.INFO, logger=logger_name):
+        logging.getLogger(logger_name).info(' '.join(['%s'] * len(args)), *args)
+    assert 'eyJ.abc.def' not in caplog.text
+    assert '/scan/live/events?token=[redacted]&since=3' in caplog.text
+
+
+def test_token_is_redacted_from_gunicorn_access_atoms(app, caplog):
+    with caplog.at_level(logging.INFO, logger='gunicorn.access'):
+        logging.getLogger('gunicorn.access').info('"%(r)s" %(q)s %(s)s', {
+            'r': 'GET /scan/live/stream?token=eyJ.abc.def HTTP/1.1',
+            'q': 'token=eyJ.abc.def',
+            's': '200',
+        })
+    assert caplog.records[-1].getMessage() == '"GET /scan/live/stream?token=[redacted] HTTP/1.1" token=[redacted] 200'
+
+
+def test_forwarded_stream_passes_the_token_as_a_header(app):
+    owner = {'worker': 'other-host:1', 'address': 'http://127.0.0.1:9'}
+    with app.app.test_request_context('/scan/live/events?token=eyJ.abc.def&since=3'):
+        assert app.forward_path() == '/scan/live/events?since=3'
+        assert app.forward_headers(owner)['Authorization'] == 'Bearer eyJ.abc.def'
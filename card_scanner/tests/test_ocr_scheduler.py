@@ -0,0 +1,124 @@
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def scheduler(app, fake_engines):
+    """A one-worker scheduler whose worker is busy until `scheduler.release()`"""
+    scheduler = app.OCRScheduler(workers=1, queue_limit=3, max_inflight_per_session=2)
+    busy = threading.Event()
+    scheduler.submit(lambda engine: busy.wait(5), session='blocker')
+    deadline = time.time() + 5
+    while scheduler.queued and time.time() < deadline:
+        time.sleep(0.01)
+    scheduler.release = busy.set
+    yield scheduler
+    busy.set()
+
+
+def record(order, label):
+    def job(engine):
+        order.append(label)
+        return label
+    return job
+
+
+def test_interactive_jobs_run_before_live_frames(scheduler):
+    order = []
+    live = scheduler.submit(record(order, 'live'), session='a', priority='live')
+    interactive = scheduler.submit(record(order, 'interactive'), session='b')
+    scheduler.release()
+    assert interactive.result(5) == 'interactive'
+    assert live.result(5) == 'live'
+    assert order == ['interactive', 'live']
+
+
+def test_sessions_are_served_round_robin(scheduler):
+    order = []
+    futures = [
+        scheduler.submit(record(order, 'a1'), session='a'),
+        scheduler.submit(record(order, 'a2'), session='a'),
+        scheduler.submit(record(order, 'b1'), session='b'),
+    ]
+    scheduler.release()
+    for future in futures:
+        future.result(5)
+    assert order == ['a1', 'b1', 'a2']
+
+
+def test_session_over_its_inflight_limit_is_rejected(app, scheduler):
+    scheduler.submit(lambda engine: None, session='a')
+    scheduler.submit(lambda engine: None, session='a')
+    with pytest.raises(app.SchedulerOverloaded) as rejected:
+        scheduler.submit(lambda engine: None, session='a')
+    assert rejected.value.reason == 'session_limit'
+    assert rejected.value.retry_after >= 1
+
+
+def test_full_queue_rejects_live_frames(app, scheduler):
+    for session in 'abc':
+        scheduler.submit(lambda engine: None, session=session, priority='live')
+    with pytest.raises(app.SchedulerOverloaded) as rejected:
+        scheduler.submit(lambda engine: None, session='d', priority='live')
+    assert rejected.value.reason == 'queue_full'
+
+
+def test_interactive_job_preempts_a_queued_live_frame(app, scheduler):
+    live = [scheduler.submit(lambda engine: 'live', session=session, priority='live') for session in 'abc']
+    interactive = scheduler.submit(lambda engine: 'interactive', session='d')
+
+    with pytest.raises(app.SchedulerOverloaded) as preempted:
+        live[0].result(0)
+    assert preempted.value.reason == 'preempted'
+    assert 'a' not in scheduler.inflight
+
+    scheduler.release()
+    assert interactive.result(5) == 'interactive'
+    assert [future.result(5) for future in live[1:]] == ['live', 'live']
+
+
+def test_full_queue_of_interactive_jobs_rejects_interactive(app, scheduler):
+    for session in 'abc':
+        scheduler.submit(lambda engine: None, session=session)
+    with pytest.raises(app.SchedulerOverloaded) as rejected:
+        scheduler.submit(lambda engine: None, session='d')
+    assert rejected.value.reason == 'queue_full'
+
+
+def test_reservation_admits_a_fan_out_past_the_session_limit(scheduler):
+    with scheduler.reserve('a', 3):
+        futures = [scheduler.submit(lambda engine, i=i: i, session='a') for i in range(3)]
+        scheduler.release()
+        assert [future.result(5) for future in futures] == [0, 1, 2]
+    assert 'a' not in scheduler.reserved
+
+
+def test_reservation_is_refused_while_the_session_is_at_its_limit(app, scheduler):
+    scheduler.submit(lambda engine: None, session='a')
+    scheduler.submit(lambda engine: None, session='a')
+    with pytest.raises(app.SchedulerOverloaded):
+        with scheduler.reserve('a', 2):
+            pass
+    assert 'a' not in scheduler.reserved
+
+
+def test_job_exceptions_reach_the_caller(scheduler):
+    def fail(engine):
+        raise ValueError('bad crop')
+    future = scheduler.submit(fail, session='a')
+    scheduler.release()
+    with pytest.raises(ValueError):
+        future.result(5)
+
+
+def test_reservation_acquired_by_hand_is_released_once(scheduler):
+    reservation = scheduler.reserve('a', 3).acquire()
+    other = scheduler.reserve('a', 2).acquire()
+    assert scheduler.reserved['a'] == 5
+    reservation.release()
+    reservation.release()
+    assert scheduler.reserved['a'] == 2
+    other.release()
+    assert 'a' not in scheduler.reserved
@@ -0,0 +1,72 @@
+import threading
+
+import pytest
+
+
+class StubEngine:
+    """Reads every image as the warm-up card's name, once `release` is set"""
+    name = 'stub'
+
+    def __init__(self, release, error=None):
+        self.release = release
+        self.error = error
+        self.calls = 0
+
+    def image_to_data(self, image, psm=3, whitelist=None):
+        self.release.wait(timeout=10)
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return 'Warm Up', 95.0
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def cold_worker(app, monkeypatch):
+    """A worker that has not warmed up yet, whose OCR engines come from a stub factory"""
+    release = threading.Event()
+    engines = []
+
+    def create_engine(error=None):
+        engines.append(StubEngine(release, error))
+        return engines[-1]
+
+    pool = app.OCREnginePool(size=1)
+    monkeypatch.setattr(pool, '_create_engine', create_engine)
+    monkeypatch.setattr(app, 'ocr_pool', pool)
+    monkeypatch.setattr(app, 'startup', app.WorkerStartup())
+    monkeypatch.setattr(app, 'STARTUP_WARMUP', True)
+    monkeypatch.setattr(app, 'BACKEND_URL', None)  # no journal to replay
+    return release, engines, pool
+
+
+def test_ready_once_warmed_up(app, cold_worker):
+    release, engines, _ = cold_worker
+    client = app.app.test_client()
+
+    response = client.get('/ready')
+    assert response.status_code == 503
+    assert response.get_json()['state'] == 'warming'
+    assert response.get_json()['ready'] is False
+
+    release.set()
+    assert app.startup.done.wait(timeout=10)
+    response = client.get('/ready')
+    assert response.status_code == 200
+    status = response.get_json()
+    assert (status['ready'], status['state'], status['warmupError']) == (True, 'ready', None)
+    assert status['startup']['warmup'] > 0
+    assert engines and engines[0].calls > 0
+
+
+def test_failed_warm_up_still_reports_ready(app, cold_worker, monkeypatch):
+    release, engines, pool = cold_worker
+    monkeypatch.setattr(pool, '_create_engine', lambda: StubEngine(release, RuntimeError('no language model')))
+    release.set()
+
+    app.warm_up()
+    response = app.app.test_client().get('/ready')
+    assert response.status_code == 200
+    assert 'no language model' in response.get_json()['warmupError']
@@ -0,0 +1,98 @@
+import cv2
+import numpy as np
+import pytest
+
+TIMES = [0.0, 0.1, 0.25, 0.7]
+
+
+def frames():
+    """Distinct BGR frames, one per recorded time"""
+    rng = np.random.default_rng(5)
+    return [cv2.resize(rng.integers(0, 256, (12, 16, 3), dtype=np.uint8), (160, 120), interpolation=cv2.INTER_NEAREST)
+            for _ in TIMES]
+
+
+def png(frame):
+    return cv2.imencode('.png', frame)[1].tobytes()
+
+
+def replay(app, path):
+    """Every (timestamp, frame, encoded bytes) of a recording, read as fast as the source allows"""
+    source = app.create_frame_source(f'replay:{path}', speed=0, loop=False)
+    assert isinstance(source, app.ReplayFrameSource)
+    assert source.open()
+    replayed = []
+    try:
+        while not source.finished:
+            frame = source.read(timeout=0)
+            if frame is not None:
+                replayed.append((source.timestamp, frame, source.encoded))
+    finally:
+        source.close()
+    return replayed
+
+
+def test_recorded_frames_replay_identically(app, tmp_path):
+    path = tmp_path / 'session.rec'
+    recorder = app.FrameRecorder(str(path))
+    originals = frames()
+    for seconds, frame in zip(TIMES, originals):
+        assert recorder.write(frame, encoded=png(frame), seconds=seconds)
+    recorder.close()
+
+    replayed = replay(app, path)
+    assert [seconds for seconds, _, _ in replayed] == TIMES
+    for (_, frame, encoded), original in zip(replayed, originals):
+        assert np.array_equal(frame, original)
+        assert encoded == png(original)
+
+
+def test_frames_without_encoded_bytes_are_stored_as_jpeg(app, tmp_path):
+    path = tmp_path / 'session.rec'
+    recorder = app.FrameRecorder(str(path), quality=95)
+    originals = frames()
+    for seconds, frame in zip(TIMES, originals):
+        recorder.write(frame, seconds=seconds)
+    recorder.close()
+
+    replayed = replay(app, path)
+    assert [seconds for seconds, _, _ in replayed] == TIMES
+    for (_, frame, encoded), original in zip(replayed, originals):
+        assert encoded[:2] == b'\xff\xd8'
+        assert np.array_equal(frame, cv2.imdecode(np.frombuffer(encoded, np.uint8), cv2.IMREAD_COLOR))
+        assert np.abs(frame.astype(int) - original.astype(int)).mean() < 8
+
+
+def test_interrupted_recording_replays_up_to_the_truncated_frame(app, tmp_path):
+    path = tmp_path / 'session.rec'
+    recorder = app.FrameRecorder(str(path))
+    for seconds, frame in zip(TIMES, frames()):
+        recorder.write(frame, encoded=png(frame), seconds=seconds)
+    recorder.close()
+    path.write_bytes(path.read_bytes()[:-100])
+
+    assert [seconds for seconds, _, _ in replay(app, path)] == TIMES[:-1]
+
+
+def test_recording_stops_at_its_size_limit(app, tmp_path):
+    path = tmp_path / 'session.rec'
+    encoded = [png(frame) for frame in frames()]
+    limit = len(app.RECORDING_MAGIC) + 2 * app.RECORDING_FRAME.size + len(encoded[0]) + len(encoded[1])
+    recorder = app.FrameRecorder(str(path), max_bytes=limit)
+    written = [recorder.write(None, encoded=data, seconds=seconds) for seconds, data in zip(TIMES, encoded)]
+    assert written == [True, True, False, False]
+    assert [seconds for seconds, _, _ in replay(app, path)] == TIMES[:2]
+
+
+def test_recording_with_the_wrong_header_does_not_open(app, tmp_path):
+    path = tmp_path / 'session.rec'
+    path.write_bytes(b'not a recording')
+    source = app.ReplayFrameSource(str(path))
+    assert not source.open()
+    source.close()
+
+
+@pytest.mark.parametrize('spec', ['replay:', 'tape:/tmp/session.rec'])
+def test_unknown_source_spec_is_rejected(app, spec):
+    with pytest.raises(ValueError):
+        app.create_frame_source(spec)
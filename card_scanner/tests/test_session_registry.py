@@ -0,0 +1,146 @@
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+from werkzeug.test import Client
+
+
+class FakeSession:
+    active = True
+    last_activity = float('inf')
+
+    def get_current_frame_base64(self):
+        return 'ZnJhbWU='
+
+    def get_scan_result(self):
+        return {'name': 'Lightning Bolt'}
+
+    def stop(self):
+        self.active = False
+
+
+@pytest.fixture
+def clock(app, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(app.time, 'time', lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def registry(app, monkeypatch):
+    registry = app.MemorySessionRegistry()
+    monkeypatch.setattr(app.session_manager, 'registry', registry)
+    return registry
+
+
+@pytest.fixture
+def listener(app):
+    """This worker's internal listener, on a loopback port"""
+    server = make_server('127.0.0.1', 0, app.ForwardedOnly(app.app), threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+
+
+def owner(worker, address='http://127.0.0.1:9'):
+    return {'worker': worker, 'address': address}
+
+
+def test_claimed_lease_belongs_to_its_owner(app, registry):
+    registry.claim('user-1', owner('a:1'), ttl=30)
+    assert registry.lookup('user-1') == owner('a:1')
+    assert registry.count() == 1
+    assert registry.renew('user-1', owner('a:1'), ttl=30)
+    assert not registry.renew('user-1', owner('b:2'), ttl=30)
+
+    registry.release('user-1', 'b:2')  # only the owner releases its lease
+    assert registry.lookup('user-1') == owner('a:1')
+    registry.release('user-1', 'a:1')
+    assert registry.lookup('user-1') is None
+    assert registry.count() == 0
+
+
+def test_expired_lease_is_taken_over(app, registry, clock):
+    registry.claim('user-1', owner('a:1'), ttl=30)
+    clock[0] += 29
+    assert registry.lookup('user-1') == owner('a:1')
+    clock[0] += 2
+    assert registry.lookup('user-1') is None
+    assert registry.count() == 0
+
+    # Another worker claims the session; the old owner's renewal now fails
+    assert registry.renew('user-1', owner('b:2'), ttl=30)
+    assert not registry.renew('user-1', owner('a:1'), ttl=30)
+    assert registry.lookup('user-1') == owner('b:2')
+
+
+def test_session_whose_lease_was_taken_over_is_stopped(app, registry, monkeypatch):
+    monkeypatch.setattr(app, 'get_forward_address', lambda: 'http://127.0.0.1:9')
+    session = FakeSession()
+    monkeypatch.setitem(app.session_manager.sessions, 'user-1', session)
+    registry.claim('user-1', owner('b:2'), ttl=30)
+
+    app.session_manager.renew_leases()
+    assert not session.active
+    assert app.session_manager.get_session('user-1') is None
+    assert registry.lookup('user-1') == owner('b:2')
+
+
+@pytest.mark.parametrize('headers', [
+    {},
+    {'X-Session-Forward': 'not-a-signature'},
+    {'X-Session-Forward': 'f' * 64},
+])
+def test_internal_listener_rejects_unsigned_requests(app, headers):
+    client = Client(app.ForwardedOnly(app.app))
+    response = client.post('/internal/live/user-1/stop', headers=headers)
+    assert response.status_code == 403
+
+
+def test_internal_listener_rejects_a_signature_for_another_worker(app):
+    client = Client(app.ForwardedOnly(app.app))
+    headers = {'X-Session-Forward': app.forward_token('other-host:1')}
+    assert client.post('/internal/live/user-1/stop', headers=headers).status_code == 403
+
+
+def test_internal_listener_accepts_this_workers_signature(app, registry):
+    client = Client(app.ForwardedOnly(app.app))
+    headers = {'X-Session-Forward': app.forward_token(app.worker_id())}
+    response = client.post('/internal/live/user-1/stop', headers=headers)
+    assert response.status_code == 200
+    assert response.get_json() == {'stopped': False}
+
+
+def test_internal_route_is_hidden_on_the_public_app(app):
+    response = app.app.test_client().post('/internal/live/user-1/stop')
+    assert response.status_code == 404
+
+
+def test_request_for_another_workers_session_is_forwarded(app, registry, auth_headers, monkeypatch):
+    forwarded = []
+    monkeypatch.setattr(app, 'forward_to_owner', lambda owner, user_id: forwarded.append((owner, user_id)) or ('', 204))
+    registry.claim('user-1', owner('other-host:1'), ttl=30)
+
+    response = app.app.test_client().get('/scan/live/frame', headers=auth_headers)
+    assert response.status_code == 204
+    assert forwarded == [(owner('other-host:1'), 'user-1')]
+
+
+def test_forwarded_request_is_answered_by_the_owner(app, registry, listener, auth_headers, monkeypatch):
+    monkeypatch.setitem(app.session_manager.sessions, 'user-1', FakeSession())
+    with app.app.test_request_context('/scan/live/frame', headers=auth_headers):
+        response = app.forward_to_owner(owner(app.worker_id(), listener), 'user-1')
+        body = b''.join(response.response)
+        response.close()
+    assert response.status_code == 200
+    assert response.content_type == 'application/json'
+    assert app.json.loads(body) == {'frame': 'ZnJhbWU=', 'result': {'name': 'Lightning Bolt'}}
+
+
+def test_unreachable_owner_loses_its_lease(app, registry, auth_headers):
+    registry.claim('user-1', owner('other-host:1'), ttl=30)
+    with app.app.test_request_context('/scan/live/frame', headers=auth_headers):
+        response, status = app.forward_to_owner(registry.lookup('user-1'), 'user-1')
+    assert status == 404
+    assert registry.lookup('user-1') is None
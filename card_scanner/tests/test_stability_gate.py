@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def gate(app):
+    return app.FrameStabilityGate()
+
+
+def card(seed):
+    """A sharp, high-contrast frame; different seeds look like different cards"""
+    return np.random.default_rng(seed).integers(0, 256, (240, 320), dtype=np.uint8)
+
+
+def settle(app, gate, frame):
+    """Show a frame until the gate passes it; returns the decisions and the gate's view"""
+    decisions = []
+    for _ in range(app.LIVE_GATE_STILL_FRAMES + 1):
+        small = gate.should_process(frame)
+        decisions.append(small is not None)
+        if small is not None:
+            return decisions, small
+    return decisions, None
+
+
+def test_frame_passes_once_it_has_been_still(app, gate):
+    decisions, small = settle(app, gate, card(1))
+    assert decisions == [False] * app.LIVE_GATE_STILL_FRAMES + [True]
+    assert small.shape[1] == app.LIVE_GATE_WIDTH
+
+
+def test_recognized_card_is_not_processed_again(app, gate):
+    _, small = settle(app, gate, card(1))
+    gate.mark_recognized(small)
+    assert settle(app, gate, card(1))[1] is None
+    assert gate.should_process(card(1)) is None
+
+
+def test_unrecognized_card_is_retried_after_settling_again(app, gate):
+    settle(app, gate, card(1))
+    decisions, small = settle(app, gate, card(1))
+    assert small is not None
+    assert decisions == [False] * (app.LIVE_GATE_STILL_FRAMES - 1) + [True]
+
+
+def test_new_card_is_processed_after_a_swap(app, gate):
+    _, small = settle(app, gate, card(1))
+    gate.mark_recognized(small)
+    assert settle(app, gate, card(2))[1] is not None
+
+
+def test_late_recognition_does_not_suppress_the_card_swapped_in(app, gate):
+    # Card A is handed to OCR, then B is swapped in and settles before A's result arrives
+    _, small_a = settle(app, gate, card(1))
+    gate.should_process(card(2))
+    gate.should_process(card(2))
+    gate.mark_recognized(small_a)
+    assert settle(app, gate, card(2))[1] is not None
+
+
+def test_blurry_frames_are_not_processed(app, gate):
+    flat = np.full((240, 320), 128, dtype=np.uint8)
+    assert settle(app, gate, flat)[1] is None
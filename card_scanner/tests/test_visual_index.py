@@ -0,0 +1,59 @@
+import cv2
+import numpy as np
+import pytest
+
+CARD_IDS = ('art-a', 'art-b', 'art-c')
+
+
+def reference(seed, app):
+    """A canonical-size card whose art is blocky noise; different seeds look like different cards"""
+    blocks = np.random.default_rng(seed).integers(0, 256, (22, 16), dtype=np.uint8)
+    return cv2.resize(blocks, (app.CARD_WIDTH, app.CARD_HEIGHT), interpolation=cv2.INTER_NEAREST)
+
+
+@pytest.fixture
+def references(app, tmp_path):
+    images_dir = tmp_path / 'references'
+    images_dir.mkdir()
+    for seed, card_id in enumerate(CARD_IDS):
+        cv2.imwrite(str(images_dir / f'{card_id}.png'), reference(seed, app))
+    (images_dir / 'notes.txt').write_text('not an image')
+    return images_dir
+
+
+def leftovers(tmp_path):
+    return [path.name for path in tmp_path.iterdir() if '.tmp' in path.name]
+
+
+def test_build_then_match(app, references, tmp_path):
+    index = app.VisualCardIndex.build(str(references), str(tmp_path / 'visual'), names={'art-b': 'Card B'})
+    assert len(index) == 3
+
+    photo = cv2.GaussianBlur(cv2.convertScaleAbs(reference(1, app), alpha=0.8, beta=20), (5, 5), 0)
+    match, score = index.match(photo)
+    assert match == {'id': 'art-b', 'name': 'Card B', 'score': pytest.approx(score, abs=1e-3)}
+    assert match['score'] >= app.VISUAL_MATCH_MIN_SCORE
+
+    match, _ = index.match(cv2.rotate(reference(2, app), cv2.ROTATE_180))
+    assert match['id'] == 'art-c'
+
+    match, score = index.match(reference(99, app))
+    assert match is None
+    assert score < app.VISUAL_MATCH_MIN_SCORE
+
+
+def test_build_after_another_worker_finished_reuses_its_index(app, references, tmp_path):
+    first = app.VisualCardIndex.build(str(references), str(tmp_path / 'visual'))
+    second = app.VisualCardIndex.build(str(references), str(tmp_path / 'visual'))
+    assert len(second) == len(first)
+    assert leftovers(tmp_path) == []
+
+
+def test_failed_build_leaves_no_scratch_directory(app, references, tmp_path, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OSError('disk full')
+    monkeypatch.setattr(app.np, 'save', fail)
+    with pytest.raises(OSError):
+        app.VisualCardIndex.build(str(references), str(tmp_path / 'visual'))
+    assert leftovers(tmp_path) == []
+    assert not (tmp_path / 'visual').exists()